@@ -0,0 +1,194 @@
+"""
+Surface Contamination detector from sliding-window statistics.
+
+Deposits on the fin field (dust films, oil, debris) shift the local
+brightness and fill the gaps between fins, flattening their texture. Each
+frame is
+
+    gray -> summed-area tables (window_stats.py), built once
+      -> for each window size: local mean, variance and texture energy
+         on a grid every ``stride`` pixels, O(1) per window
+      -> robust (median/MAD) z-scores against the windows in the fin field
+      -> brightness or texture-loss outliers -> connected regions (regions.py)
+      -> region boxes in frame pixels, merged across window sizes (boxes.py)
+
+The fin field is where the frame is textured, plus the flat patches it
+encloses; flat areas reaching the frame edge (background, header tanks) are
+not scored, nor are windows straddling them. Windows that are dark and flat
+are left to the cell detector's Blocked Section. Small windows find spots,
+large ones thin films that only stand out when averaged; both sizes come
+from the same tables. A 4K frame takes a fraction of a second on one core,
+most of it building the tables. Frames less than ``FIELD_CELL`` px high or
+wide have no fin-field grid and no detections.
+
+Usage:
+    python contamination.py --frames 10    # synthetic 1080p and 4K fin fields, per-frame time
+"""
+
+import numpy as np
+
+from boxes import merge_detections
+from detection import to_gray
+from detection_records import SEVERITY_CODES, TYPE_CODES, DetectionBatch
+from regions import find_regions, label
+from window_stats import WindowStats, integral
+
+WINDOWS = (24, 64)      # px
+STRIDE = 8              # px between window positions
+Z_THRESHOLD = 6.0
+MIN_AREA = 2            # grid windows
+MAX_DEFECTS = 20
+FIELD_CELL = 16         # px; the fin field is found on a grid this coarse
+FIELD_TEXTURE = 0.5     # of the 90th-percentile cell texture
+
+
+def _robust_z_of(values, inside):
+    # Median/MAD of the fin-field windows only
+    sample = values[inside]
+    median = np.median(sample)
+    mad = np.median(np.abs(sample - median)) * 1.4826
+    return (values - median) / max(mad, 1.0)
+
+
+def _severity(score, z_threshold):
+    return np.select(
+        [score >= 4 * z_threshold, score >= 2 * z_threshold],
+        [SEVERITY_CODES['High'], SEVERITY_CODES['Medium']],
+        SEVERITY_CODES['Low'],
+    )
+
+
+def fin_field(stats, cell=FIELD_CELL):
+    """
+    Boolean mask of the fin field on a grid of ``cell`` px cells: textured
+    cells plus the untextured patches they enclose (deposits), but not
+    untextured areas reaching the frame edge (background, header tanks).
+    """
+    texture = stats.texture(cell, cell)
+    textured = texture > FIELD_TEXTURE * np.percentile(texture, 90)
+    labels, _ = label(~textured, connectivity=4)
+    outside = np.unique(np.concatenate([labels[0], labels[-1], labels[:, 0], labels[:, -1]]))
+    return textured | ~np.isin(labels, outside[outside > 0])
+
+
+def _inside(field, cell, grid, window):
+    # Windows whose every cell is in the field, counted on the cell grid's
+    # own summed-area table; the partial cells past the last whole one are
+    # padded as outside
+    table = integral(np.pad(field, ((0, 1), (0, 1))))
+    rows, cols = (np.minimum(axis // cell, n) for axis, n in zip(grid, field.shape))
+    rows_end, cols_end = (np.minimum((axis + window - 1) // cell, n) + 1 for axis, n in zip(grid, field.shape))
+    count = (table[np.ix_(rows_end, cols_end)] - table[np.ix_(rows, cols_end)]
+             - table[np.ix_(rows_end, cols)] + table[np.ix_(rows, cols)])
+    return count == np.outer(rows_end - rows, cols_end - cols)
+
+
+def contamination_scores(stats, window, stride=STRIDE, z_threshold=Z_THRESHOLD, field=None, cell=FIELD_CELL):
+    """
+    Per-window contamination score on the ``stats.grid(window, stride)``
+    grid: the larger of the brightness and texture-loss z-scores against
+    the windows lying wholly in the fin ``field`` (a ``cell`` px grid mask,
+    default ``fin_field(stats, cell)``), zero outside it and where a window
+    looks like a blocked section (dark and flat).
+    """
+    if field is None:
+        field = fin_field(stats, cell)
+    inside = _inside(field, cell, stats.grid(window, stride), window)
+    if not inside.any():
+        return np.zeros(inside.shape, np.float32)
+    mean = stats.mean(window, stride)
+    texture = stats.texture(window, stride)
+    std = np.sqrt(stats.variance(window, stride))
+    z_mean, z_texture, z_std = (_robust_z_of(values, inside) for values in (mean, texture, std))
+    score = np.maximum(np.abs(z_mean), -z_texture)
+    blocked = (z_mean < -z_threshold) & (z_std < 0)
+    return np.where(inside & ~blocked, score, 0.0).astype(np.float32)
+
+
+def window_queries(shape, windows=WINDOWS, stride=STRIDE, cell=FIELD_CELL):
+    """
+    The ``(statistic, (h, w), stride)`` window grids ``detect_contamination``
+    reads for a frame of ``shape``, for computing them elsewhere
+    (``window_stats.WindowGrids``).
+    """
+    if min(shape) < cell:
+        return []
+    queries = [('texture', (cell, cell), cell)]
+    for window in windows:
+        if window <= min(shape):
+            queries += [(statistic, (window, window), stride) for statistic in ('mean', 'texture', 'variance')]
+    return queries
+
+
+def detect_contamination(frame, windows=WINDOWS, stride=STRIDE, z_threshold=Z_THRESHOLD,
+                         min_area=MIN_AREA, max_defects=MAX_DEFECTS, stats=None):
+    """
+    Surface Contamination regions of an RGB or grayscale frame as a
+    ``DetectionBatch``. Pass ``stats`` to reuse tables already built for
+    the frame, or its ``window_queries`` grids as a ``WindowGrids``.
+    """
+    if stats is None:
+        stats = WindowStats(to_gray(frame))
+    if min(stats.shape) < FIELD_CELL:
+        # Too thin for one fin-field cell
+        return DetectionBatch()
+    field = fin_field(stats)
+    batches = []
+    for window in windows:
+        if window > min(stats.shape):
+            continue
+        score = contamination_scores(stats, window, stride, z_threshold, field)
+        regions = find_regions(score > z_threshold, score, min_area=min_area)
+        # Grid cell (r, c) is the window starting at (r, c) * stride
+        boxes = np.stack([regions['x0'] * stride, regions['y0'] * stride,
+                          (regions['x1'] - 1) * stride + window, (regions['y1'] - 1) * stride + window], axis=1)
+        peak = regions['peak']
+        batches.append(DetectionBatch.from_boxes(
+            np.full(len(regions), TYPE_CODES['Surface Contamination'], np.uint8),
+            np.minimum(85.0 + 14.0 * (1 - z_threshold / peak), 99.5),
+            boxes,
+            _severity(peak, z_threshold),
+        ))
+    # The same deposit seen at several window sizes becomes one box: its
+    # boxes nest rather than match, so any overlap merges
+    return merge_detections(batches, iou_threshold=0.0).sorted()[:max_defects]
+
+
+def synthetic_fins(rng, shape=(1080, 1920), spots=()):
+    """
+    8-bit grayscale fin field (vertical fins every 6 px plus sensor noise).
+    ``spots`` are ``(x, y, radius, level)`` deposits blending the fins
+    towards a flat ``level``.
+    """
+    h, w = shape
+    x = np.arange(w, dtype=np.float32)
+    frame = np.broadcast_to(128 + 45 * np.sin(2 * np.pi * x / 6), shape) + rng.normal(0, 6, shape)
+    y, x = np.ogrid[0:h, 0:w]
+    for cx, cy, r, level in spots:
+        cover = np.clip(1.5 - np.hypot(x - cx, y - cy) / r, 0, 1) * 0.8
+        frame = frame * (1 - cover) + level * cover
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark the contamination detector on synthetic fin fields')
+    parser.add_argument('--frames', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for name, shape in [('1080p', (1080, 1920)), ('4K', (2160, 3840))]:
+        h, w = shape
+        dirty = synthetic_fins(rng, shape, spots=[(w // 4, h // 3, h // 30, 200), (2 * w // 3, 2 * h // 3, h // 12, 160)])
+        clean = synthetic_fins(rng, shape)
+        found = detect_contamination(dirty)
+        print(f"{name} dirty:", [(d.type, d.box, round(d.confidence, 1), d.severity) for d in found])
+        print(f"{name} clean:", len(detect_contamination(clean)), "detections")
+
+        t0 = time.perf_counter()
+        for _ in range(args.frames):
+            detect_contamination(dirty)
+        per_frame = (time.perf_counter() - t0) / args.frames
+        print(f"{name}: {per_frame * 1000:.1f} ms/frame on one core")
@@ -0,0 +1,292 @@
+"""
+Process-wide columnar index of detections for Gallery and analytics filters.
+
+Detections are held as parallel NumPy columns sorted by timestamp, with
+type, severity, review status and unit ID stored as small integer codes into
+per-column vocabularies (type and severity use the same fixed codes as
+``DetectionBatch``). A filter is then a binary search on the time column plus
+boolean look-ups on the codes:
+
+    lo, hi = searchsorted(ts, [start, end])
+    mask   = type_allowed[type_code[lo:hi]] & severity_allowed[...] & ...
+
+which stays in the low milliseconds over millions of detections. The index
+is filled incrementally from the inspection store (only rows with an id
+above the last one seen are read) and review-status changes made through it
+are written back to the store. The index is shared by every session:
+refreshes run one at a time and vocabularies grow under a lock, so
+concurrent reruns neither read the same rows twice nor hand out one code
+for two names.
+
+Usage:
+    python defect_index.py --rows 2000000
+"""
+
+import threading
+
+import numpy as np
+
+from detection_records import DEFECT_TYPES, SEVERITIES
+from inspection_store import REVIEW_STATUSES
+
+COLUMNS = {
+    'ts': np.float64,
+    'detection_id': np.int64,
+    'type': np.uint8,
+    'severity': np.uint8,
+    'status': np.uint8,
+    'unit': np.int32,
+    'confidence': np.float32,
+    'x': np.int32,
+    'y': np.int32,
+}
+CATEGORICAL = ('type', 'severity', 'status', 'unit')
+
+
+class Vocabulary:
+    """Bidirectional string <-> integer code mapping for one categorical column."""
+
+    def __init__(self, names=()):
+        self.names = []
+        self._codes = {}
+        self._lock = threading.Lock()
+        for name in names:
+            self.code(name)
+
+    def code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(name)
+                if code is None:
+                    # names first: a published code always has its name
+                    self.names.append(name)
+                    code = self._codes[name] = len(self.names) - 1
+        return code
+
+    def codes(self, names):
+        return [self._codes[n] for n in names if n in self._codes]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class DefectIndex:
+    def __init__(self, store=None, capacity=1024):
+        self.store = store
+        self.vocab = {
+            'type': Vocabulary(DEFECT_TYPES),
+            'severity': Vocabulary(SEVERITIES),
+            'status': Vocabulary(REVIEW_STATUSES),
+            'unit': Vocabulary(),
+        }
+        self._columns = {name: np.empty(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self._size = 0
+        self._last_id = 0
+        self._unit_text = ''
+        self._unit_starts = np.empty(0, np.int64)
+        self._lock = threading.Lock()
+        # Held from reading the store to advancing _last_id
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        """Read-only view of the filled part of a column."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._columns['ts'])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, batch):
+        """
+        Add rows given as ``{column: array}`` (categoricals already as codes).
+        The time order is kept: an in-order batch is appended, a late one is
+        merged in.
+        """
+        n = len(batch['ts'])
+        if n == 0:
+            return
+        order = np.argsort(batch['ts'], kind='stable')
+        batch = {name: np.asarray(batch[name], COLUMNS[name])[order] for name in COLUMNS}
+        with self._lock:
+            self._reserve(n)
+            size = self._size
+            ts = self._columns['ts']
+            if size == 0 or batch['ts'][0] >= ts[size - 1]:
+                for name in COLUMNS:
+                    self._columns[name][size:size + n] = batch[name]
+            else:
+                # Late rows (e.g. the daemon backfilling old captures)
+                at = np.searchsorted(ts[:size], batch['ts'], side='right')
+                for name in COLUMNS:
+                    merged = np.insert(self._columns[name][:size], at, batch[name])
+                    self._columns[name][:size + n] = merged
+            self._size = size + n
+
+    def refresh(self, chunk=50000):
+        """Pull detections recorded since the last refresh from the store."""
+        with self._refresh_lock:
+            while True:
+                rows = self.store.detections_since(self._last_id, limit=chunk)
+                if not rows:
+                    return
+                vocab = self.vocab
+                self.append({
+                    'ts': [r['ts'] for r in rows],
+                    'detection_id': [r['id'] for r in rows],
+                    'type': [vocab['type'].code(r['type']) for r in rows],
+                    'severity': [vocab['severity'].code(r['severity'] or 'Low') for r in rows],
+                    'status': [vocab['status'].code(r['status']) for r in rows],
+                    'unit': [vocab['unit'].code(r['unit_id']) for r in rows],
+                    'confidence': [r['confidence'] for r in rows],
+                    'x': [r['x'] or 0 for r in rows],
+                    'y': [r['y'] or 0 for r in rows],
+                })
+                self._last_id = rows[-1]['id']
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _match(self, column, codes, lo, hi):
+        values = self._columns[column][lo:hi]
+        if len(codes) <= 4:
+            # A few equality tests beat a table look-up per row
+            mask = np.zeros(hi - lo, dtype=bool)
+            for code in codes:
+                mask |= values == code
+            return mask
+        table = np.zeros(len(self.vocab[column]), dtype=bool)
+        table[codes] = True
+        return np.take(table, values)
+
+    def _unit_codes(self, text):
+        # Substring search over one newline-joined string of lower-cased unit
+        # IDs; match offsets map back to codes by binary search.
+        names = self.vocab['unit'].names
+        if len(self._unit_starts) < len(names):
+            new = names[len(self._unit_starts):]
+            starts, offset = [], len(self._unit_text)
+            for name in new:
+                starts.append(offset)
+                offset += len(name) + 1
+            self._unit_text += ''.join(n.lower().replace('\n', ' ') + '\n' for n in new)
+            self._unit_starts = np.concatenate([self._unit_starts, starts]).astype(np.int64)
+        text = text.lower()
+        haystack = self._unit_text
+        positions = []
+        found = haystack.find(text)
+        while found >= 0:
+            positions.append(found)
+            found = haystack.find(text, found + 1)
+        codes = np.searchsorted(self._unit_starts, positions, side='right') - 1
+        return np.unique(codes).tolist()
+
+    def query(self, types=None, severities=None, statuses=None, unit=None,
+              start=None, end=None, min_confidence=None):
+        """
+        Row positions (ascending time) matching every given criterion.
+        ``unit`` matches unit IDs containing that text; ``start``/``end`` are
+        epoch seconds, end exclusive.
+        """
+        with self._lock:
+            ts = self._columns['ts'][:self._size]
+            lo = 0 if start is None else int(np.searchsorted(ts, start, side='left'))
+            hi = self._size if end is None else int(np.searchsorted(ts, end, side='left'))
+            hi = max(hi, lo)
+            mask = np.ones(hi - lo, dtype=bool)
+            for column, names in (('type', types), ('severity', severities), ('status', statuses)):
+                if names is not None:
+                    mask &= self._match(column, self.vocab[column].codes(names), lo, hi)
+            if unit:
+                mask &= self._match('unit', self._unit_codes(unit), lo, hi)
+            if min_confidence is not None:
+                mask &= self._columns['confidence'][lo:hi] >= min_confidence
+            return lo + np.flatnonzero(mask)
+
+    def counts(self, column, rows):
+        """``{name: count}`` of a categorical column over ``rows``."""
+        with self._lock:
+            codes = self._columns[column][rows]
+            tally = np.bincount(codes, minlength=len(self.vocab[column]))
+        return {name: int(c) for name, c in zip(self.vocab[column].names, tally) if c}
+
+    def records(self, rows):
+        """Row dicts with categorical codes decoded, for display."""
+        with self._lock:
+            values = {name: self._columns[name][rows] for name in COLUMNS}
+        out = []
+        for i in range(len(rows)):
+            record = {name: values[name][i].item() for name in COLUMNS}
+            for name in CATEGORICAL:
+                record[name] = self.vocab[name].names[record[name]]
+            out.append(record)
+        return out
+
+    def set_status(self, detection_ids, status):
+        """Change the review status of detections here and in the store."""
+        if self.store is not None:
+            self.store.set_detection_status(detection_ids, status)
+        code = self.vocab['status'].code(status)
+        with self._lock:
+            ids = self._columns['detection_id'][:self._size]
+            self._columns['status'][:self._size][np.isin(ids, detection_ids)] = code
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark multi-criteria defect filters')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = DefectIndex()
+    for i in range(50_000):
+        index.vocab['unit'].code(f'HAR-2024-{i:06d}')
+    now = time.time()
+    t0 = time.perf_counter()
+    index.append({
+        'ts': now - rng.uniform(0, 90 * 86400, args.rows),
+        'detection_id': np.arange(1, args.rows + 1),
+        'type': rng.integers(0, len(index.vocab['type']), args.rows),
+        'severity': rng.integers(0, len(SEVERITIES), args.rows),
+        'status': rng.integers(0, len(REVIEW_STATUSES), args.rows),
+        'unit': rng.integers(0, len(index.vocab['unit']), args.rows),
+        'confidence': rng.uniform(70, 100, args.rows),
+        'x': rng.integers(0, 1920, args.rows),
+        'y': rng.integers(0, 1080, args.rows),
+    })
+    print(f"built {len(index):,} rows in {time.perf_counter() - t0:.2f}s")
+
+    queries = {
+        'all, two types': dict(types=['Bent Fin', 'UV Leak']),
+        'last 7 days, High+Critical, Under Review': dict(
+            start=now - 7 * 86400, severities=['High', 'Critical'], statuses=['Under Review']),
+        'last 30 days, one type, conf >= 95': dict(
+            start=now - 30 * 86400, types=['Blocked Section'], min_confidence=95),
+        'unit contains "0012"': dict(unit='0012'),
+    }
+    for label, criteria in queries.items():
+        index.query(**criteria)
+        runs = 20
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            rows = index.query(**criteria)
+        print(f"{label:<45}{(time.perf_counter() - t0) / runs * 1000:7.2f} ms  {len(rows):>9,} rows")
@@ -0,0 +1,159 @@
+"""
+Classical computer-vision defect detector for RGB condenser frames.
+
+The frame is reduced to a grid of cells and each cell's brightness and
+texture are compared against robust (median/MAD) statistics of the whole fin
+field. Cells that stand out are reported as a ``DetectionBatch``
+(``detection_records.py``), most confident first.
+"""
+
+import numpy as np
+
+from detection_records import SEVERITY_CODES, TYPE_CODES, DetectionBatch
+
+CELL_SIZE = 32
+Z_THRESHOLD = 6.0
+MAX_DEFECTS = 20
+
+
+def to_gray(frame):
+    """float32 luminance of an HxW or HxWx3/4 uint8 frame."""
+    frame = np.asarray(frame)
+    if frame.ndim == 2:
+        return frame.astype(np.float32, copy=False)
+    rgb = frame[..., :3].astype(np.float32)
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def cell_stats(gray, cell=CELL_SIZE):
+    """Per-cell mean and standard deviation over a grid of ``cell`` x ``cell`` blocks."""
+    h, w = gray.shape
+    rows, cols = h // cell, w // cell
+    blocks = gray[:rows * cell, :cols * cell].reshape(rows, cell, cols, cell)
+    mean = blocks.mean(axis=(1, 3))
+    sq = (blocks * blocks).mean(axis=(1, 3))
+    std = np.sqrt(np.maximum(sq - mean * mean, 0.0))
+    return mean, std
+
+
+def _robust_z(values):
+    median = np.median(values)
+    mad = np.median(np.abs(values - median)) * 1.4826
+    return (values - median) / max(mad, 1.0)
+
+
+def _severity(score):
+    return np.select(
+        [score >= 4 * Z_THRESHOLD, score >= 2 * Z_THRESHOLD],
+        [SEVERITY_CODES['High'], SEVERITY_CODES['Medium']],
+        SEVERITY_CODES['Low'],
+    )
+
+
+def detect_defects(frame, cell=CELL_SIZE, z_threshold=Z_THRESHOLD, max_defects=MAX_DEFECTS):
+    """Detect defects in an RGB or grayscale frame (NumPy array or PIL image)."""
+    gray = to_gray(frame)
+    if gray.shape[0] < cell or gray.shape[1] < cell:
+        return DetectionBatch()
+    return classify_cells(*cell_stats(gray, cell), cell, z_threshold, max_defects)
+
+
+def classify_cells(mean, std, cell=CELL_SIZE, z_threshold=Z_THRESHOLD, max_defects=MAX_DEFECTS):
+    """
+    Defects from the whole frame's ``cell_stats`` grids: every cell is
+    judged against the median/MAD of all of them.
+    """
+    z_mean = _robust_z(mean)
+    z_std = _robust_z(std)
+
+    # Dark, flat cells look like a blocked channel; dark/bright blotches like
+    # contamination; disrupted fin texture like a bent fin.
+    blocked = (z_mean < -z_threshold) & (z_std < 0)
+    contamination = (np.abs(z_mean) > z_threshold) & ~blocked
+    bent = (z_std > z_threshold) & ~blocked & ~contamination
+
+    types, scores, rows, cols = [], [], [], []
+    for defect_type, mask, score in [
+        ('Blocked Section', blocked, -z_mean),
+        ('Surface Contamination', contamination, np.abs(z_mean)),
+        ('Bent Fin', bent, z_std),
+    ]:
+        r, c = np.nonzero(mask)
+        types.append(np.full(len(r), TYPE_CODES[defect_type], np.uint8))
+        scores.append(score[r, c])
+        rows.append(r)
+        cols.append(c)
+
+    score = np.concatenate(scores)
+    defects = DetectionBatch.from_columns(
+        np.concatenate(types),
+        np.minimum(85.0 + 14.0 * (1 - z_threshold / score), 99.5),
+        np.concatenate(cols) * cell + cell // 2,
+        np.concatenate(rows) * cell + cell // 2,
+        _severity(score),
+        cell, cell,
+    )
+    return defects.sorted()[:max_defects]
+
+
+class PositionGate:
+    """
+    Decide whether a conveyor unit is in position in a camera frame.
+
+    A unit is in position when enough of the (downsampled) frame differs from
+    the empty-station background and the scene has stopped moving. With
+    ``once_per_unit`` the gate fires on the first settled frame of each unit
+    only, so detection runs once per arrival instead of on every frame.
+    When it fires, ``region`` holds the unit's ``(x0, y0, x1, y1)`` extent in
+    full-resolution pixels.
+    """
+
+    def __init__(self, background=None, scale=8, min_coverage=0.3,
+                 max_motion=2.0, diff_threshold=25.0, once_per_unit=True):
+        self.scale = scale
+        self.min_coverage = min_coverage
+        self.max_motion = max_motion
+        self.diff_threshold = diff_threshold
+        self.once_per_unit = once_per_unit
+        self.background = None if background is None else self._small(background)
+        self._previous = None
+        self._fired = False
+        self.units_seen = 0
+        self.region = None
+
+    def _small(self, frame):
+        return to_gray(np.asarray(frame)[::self.scale, ::self.scale])
+
+    def __call__(self, frame):
+        small = self._small(frame)
+        if self.background is None:
+            # First frame of the stream is taken as the empty station
+            self.background = small
+        previous, self._previous = self._previous, small
+        foreground = np.abs(small - self.background) > self.diff_threshold
+        coverage = float(foreground.mean())
+        if coverage < self.min_coverage:
+            self._fired = False
+            return False
+        if previous is None or float(np.abs(small - previous).mean()) > self.max_motion:
+            return False
+        if self.once_per_unit and self._fired:
+            return False
+        if not self._fired:
+            self.units_seen += 1
+        self._fired = True
+        rows = np.flatnonzero(foreground.any(axis=1))
+        cols = np.flatnonzero(foreground.any(axis=0))
+        self.region = (
+            int(cols[0] * self.scale), int(rows[0] * self.scale),
+            int((cols[-1] + 1) * self.scale), int((rows[-1] + 1) * self.scale),
+        )
+        return True
+
+
+def detect_in_region(frame, region, detector=detect_defects, margin=CELL_SIZE):
+    """Run ``detector`` on ``region`` (inset by ``margin``) and map locations back to the frame."""
+    x0, y0, x1, y1 = region
+    x0, y0 = x0 + margin, y0 + margin
+    x1, y1 = max(x1 - margin, x0), max(y1 - margin, y0)
+    return detector(np.asarray(frame)[y0:y1, x0:x1]).shifted(x0, y0)
@@ -0,0 +1,233 @@
+"""
+Compact detection records.
+
+A detection is a defect type, a confidence (%), the defect's box in frame
+pixels (centre ``(x, y)`` and size ``(w, h)``; zero size when a detector
+only locates a point) and a severity. ``DetectionBatch`` holds any number of
+them in one NumPy structured array of fixed-width fields, 18 bytes per
+detection, with type and severity stored as ``uint8`` codes into
+``DEFECT_TYPES`` and ``SEVERITIES``. Indexing or iterating a batch yields ``Detection`` records,
+small ``__slots__`` objects for code that handles detections one at a time.
+
+Detectors return a ``DetectionBatch`` per frame; the inspection history,
+store, defect index and exports all consume batches.
+
+Usage:
+    python detection_records.py    # memory per million detections, dicts vs batch
+"""
+
+import numpy as np
+
+# Codes are positions in these lists: append new names, never reorder
+DEFECT_TYPES = [
+    'Bent Fin',
+    'Blocked Section',
+    'UV Leak',
+    'Thermal Anomaly',
+    'Structural Deformity',
+    'Surface Contamination',
+    'Mounting Misalignment',
+    'Pressure Drop',
+]
+SEVERITIES = ['Low', 'Medium', 'High', 'Critical']
+
+TYPE_CODES = {name: code for code, name in enumerate(DEFECT_TYPES)}
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITIES)}
+
+DETECTION_DTYPE = np.dtype([
+    ('type', 'u1'),
+    ('severity', 'u1'),
+    ('confidence', '<f4'),
+    ('x', '<i4'),
+    ('y', '<i4'),
+    ('w', '<u2'),
+    ('h', '<u2'),
+])
+
+
+def type_codes(names):
+    """``uint8`` codes for defect type names."""
+    return np.array([TYPE_CODES[n] for n in names], dtype=np.uint8)
+
+
+def severity_codes(names):
+    return np.array([SEVERITY_CODES[n] for n in names], dtype=np.uint8)
+
+
+class Detection:
+    __slots__ = ('type', 'confidence', 'x', 'y', 'severity', 'w', 'h')
+
+    def __init__(self, type, confidence, x, y, severity, w=0, h=0):
+        self.type = type
+        self.confidence = confidence
+        self.x = x
+        self.y = y
+        self.severity = severity
+        self.w = w
+        self.h = h
+
+    @property
+    def location(self):
+        return (self.x, self.y)
+
+    @property
+    def box(self):
+        """``(x0, y0, x1, y1)``, ``x1``/``y1`` exclusive."""
+        x0, y0 = self.x - self.w // 2, self.y - self.h // 2
+        return (x0, y0, x0 + self.w, y0 + self.h)
+
+    def to_dict(self):
+        return {
+            'type': self.type, 'confidence': self.confidence,
+            'location': [self.x, self.y], 'box': list(self.box), 'severity': self.severity,
+        }
+
+    def __repr__(self):
+        return (f"Detection({self.type!r}, {self.confidence:.1f}, "
+                f"({self.x}, {self.y}), {self.severity!r})")
+
+
+class DetectionBatch:
+    """Detections backed by a structured array of ``DETECTION_DTYPE``."""
+
+    __slots__ = ('array',)
+
+    def __init__(self, array=None):
+        self.array = np.zeros(0, DETECTION_DTYPE) if array is None else array
+
+    @classmethod
+    def from_columns(cls, types, confidence, x, y, severity, w=0, h=0):
+        """Build from column arrays; ``types``/``severity`` are codes or names."""
+        types = np.asarray(types)
+        severity = np.asarray(severity)
+        array = np.empty(len(types), DETECTION_DTYPE)
+        array['type'] = type_codes(types) if types.dtype.kind in 'US' else types
+        array['severity'] = severity_codes(severity) if severity.dtype.kind in 'US' else severity
+        array['confidence'] = confidence
+        array['x'] = x
+        array['y'] = y
+        array['w'] = np.clip(w, 0, 65535)
+        array['h'] = np.clip(h, 0, 65535)
+        return cls(array)
+
+    @classmethod
+    def from_boxes(cls, types, confidence, boxes, severity):
+        """Build from ``(n, 4)`` ``(x0, y0, x1, y1)`` boxes (``x1``/``y1`` exclusive)."""
+        boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+        w = boxes[:, 2] - boxes[:, 0]
+        h = boxes[:, 3] - boxes[:, 1]
+        return cls.from_columns(types, confidence, boxes[:, 0] + w // 2, boxes[:, 1] + h // 2, severity, w, h)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from ``Detection`` objects or ``{'type', 'confidence', 'location', 'severity'}`` dicts."""
+        records = list(records)
+        array = np.empty(len(records), DETECTION_DTYPE)
+        for i, r in enumerate(records):
+            if isinstance(r, Detection):
+                array[i] = (TYPE_CODES[r.type], SEVERITY_CODES[r.severity], r.confidence, r.x, r.y, r.w, r.h)
+            else:
+                x, y = r['location']
+                x0, y0, x1, y1 = r.get('box') or (x, y, x, y)
+                array[i] = (TYPE_CODES[r['type']], SEVERITY_CODES[r['severity']], r['confidence'], x, y,
+                            x1 - x0, y1 - y0)
+        return cls(array)
+
+    @classmethod
+    def concatenate(cls, batches):
+        arrays = [b.array for b in batches]
+        return cls(np.concatenate(arrays) if arrays else None)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            t, s, c, x, y, w, h = self.array[key].tolist()
+            return Detection(DEFECT_TYPES[t], c, x, y, SEVERITIES[s], w, h)
+        return DetectionBatch(self.array[key])
+
+    def __iter__(self):
+        for t, s, c, x, y, w, h in self.array.tolist():
+            yield Detection(DEFECT_TYPES[t], c, x, y, SEVERITIES[s], w, h)
+
+    def __repr__(self):
+        return f"DetectionBatch({len(self)} detections)"
+
+    @property
+    def nbytes(self):
+        return self.array.nbytes
+
+    def type_names(self):
+        return [DEFECT_TYPES[t] for t in self.array['type'].tolist()]
+
+    def severity_names(self):
+        return [SEVERITIES[s] for s in self.array['severity'].tolist()]
+
+    def type_counts(self):
+        """``{type name: count}`` of the detections in this batch."""
+        counts = np.bincount(self.array['type'], minlength=len(DEFECT_TYPES))
+        return {DEFECT_TYPES[t]: int(n) for t, n in enumerate(counts) if n}
+
+    def sorted(self):
+        """Most confident first (stable for equal confidence)."""
+        return DetectionBatch(self.array[np.argsort(-self.array['confidence'], kind='stable')])
+
+    def boxes(self):
+        """``(n, 4)`` int32 ``(x0, y0, x1, y1)`` boxes, ``x1``/``y1`` exclusive."""
+        a = self.array
+        out = np.empty((len(a), 4), np.int32)
+        out[:, 0] = a['x'] - a['w'] // 2
+        out[:, 1] = a['y'] - a['h'] // 2
+        out[:, 2] = out[:, 0] + a['w']
+        out[:, 3] = out[:, 1] + a['h']
+        return out
+
+    def shifted(self, dx, dy):
+        """Copy with locations offset by ``(dx, dy)``, e.g. from a tile or ROI to the full frame."""
+        array = self.array.copy()
+        array['x'] += dx
+        array['y'] += dy
+        return DetectionBatch(array)
+
+    def to_records(self):
+        """JSON-ready list of dicts."""
+        return [d.to_dict() for d in self]
+
+
+def as_batch(defects):
+    """A ``DetectionBatch`` from a batch, a list of batches, records or dicts."""
+    if isinstance(defects, DetectionBatch):
+        return defects
+    defects = list(defects)
+    if defects and isinstance(defects[0], DetectionBatch):
+        return DetectionBatch.concatenate(defects)
+    return DetectionBatch.from_records(defects)
+
+
+if __name__ == '__main__':
+    import tracemalloc
+
+    n = 1_000_000
+    rng = np.random.default_rng(0)
+    batch = DetectionBatch.from_columns(
+        rng.integers(0, len(DEFECT_TYPES), n), rng.uniform(70, 100, n),
+        rng.integers(0, 1920, n), rng.integers(0, 1080, n), rng.integers(0, len(SEVERITIES), n),
+    )
+
+    tracemalloc.start()
+    as_dicts = [
+        {'type': DEFECT_TYPES[t], 'confidence': c, 'location': (x, y), 'severity': SEVERITIES[s]}
+        for t, s, c, x, y, w, h in batch.array.tolist()
+    ]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    copy = DetectionBatch.from_records(as_dicts)
+    batch_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(copy) == n
+
+    print(f"list of dicts:   {dict_bytes / 2**20:7.1f} MiB per million ({dict_bytes / n:.0f} B/detection)")
+    print(f"DetectionBatch:  {batch_bytes / 2**20:7.1f} MiB per million ({batch_bytes / n:.0f} B/detection)")
@@ -0,0 +1,395 @@
+"""
+Pluggable defect detector backends with dynamic micro-batching.
+
+Backends share one interface, ``detect_batch(frames) -> [DetectionBatch, ...]``,
+and register themselves by name:
+
+    classical   NumPy cell-statistics detector (detection.py) with window-statistics
+                Surface Contamination regions (contamination.py), always available
+    numpy       per-cell linear classifier loaded from an .npz weights file
+    onnx        an ONNX model run on CPU with onnxruntime (optional dependency)
+
+A ``MicroBatcher`` sits in front of a backend whose ``detect_batch`` is one
+vectorized call (``batched = True``: the numpy model's single GEMM, the ONNX
+session). Requests arriving from several sessions, the stream ingester or
+the watch-folder workers are coalesced: the first request opens a window of
+``max_wait_ms`` and every request that arrives inside it (up to
+``max_batch_size``) goes to the backend in one batched call. Queue depth,
+batch sizes and the added wait are exported through ``metrics``. The
+classical backend only loops over the frames, so ``detector()`` hands it out
+unbatched and every caller's thread runs it directly, in parallel.
+
+Usage:
+    python detector_backends.py --bench --clients 8
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+import metrics
+from contamination import detect_contamination
+from detection import CELL_SIZE, MAX_DEFECTS, detect_defects, to_gray
+from detection_records import DEFECT_TYPES, SEVERITY_CODES, TYPE_CODES, DetectionBatch, type_codes
+
+BATCHER_QUEUE_DEPTH = metrics.REGISTRY.gauge(
+    'inspection_batcher_queue_depth', 'Detection requests waiting for a batch', labels=('backend',))
+BATCHER_BATCH_SIZE = metrics.REGISTRY.histogram(
+    'inspection_batcher_batch_size', 'Frames per batched detector call', labels=('backend',),
+    buckets=(1, 2, 4, 8, 16, 32, 64))
+BATCHER_WAIT_SECONDS = metrics.REGISTRY.histogram(
+    'inspection_batcher_wait_seconds', 'Time a request waited to be batched', labels=('backend',),
+    buckets=(0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1))
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    def decorator(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def available_backends():
+    """Names of the registered backends whose dependencies and models are present."""
+    return [name for name, cls in BACKENDS.items() if cls.available()]
+
+
+def get_backend(name, **kwargs):
+    if name not in BACKENDS:
+        raise KeyError(f"Unknown detector backend: {name}")
+    return BACKENDS[name](**kwargs)
+
+
+class DetectorBackend:
+    name = None
+    max_batch_size = 32
+    batched = False         # detect_batch is one vectorized call, worth micro-batching
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def detect_batch(self, frames):
+        raise NotImplementedError
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+
+@register_backend('classical')
+class ClassicalCVBackend(DetectorBackend):
+    """Cell-statistics detector from detection.py; Surface Contamination from contamination.py."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def detect(self, frame):
+        # Both detectors work on gray; convert once
+        gray = to_gray(frame)
+        return self.combine(detect_defects(gray, **self.kwargs), detect_contamination(gray))
+
+    def combine(self, cells, regions):
+        """The backend's result from the cell detector's and the contamination detector's."""
+        # Contamination is reported as whole regions rather than single cells
+        cells = cells[cells.array['type'] != TYPE_CODES['Surface Contamination']]
+        found = DetectionBatch.concatenate([cells, regions])
+        return found.sorted()[:self.kwargs.get('max_defects', MAX_DEFECTS)]
+
+    def detect_batch(self, frames):
+        return [self.detect(frame) for frame in frames]
+
+
+def cell_features(frame, cell=CELL_SIZE):
+    """Per-cell RGB mean and standard deviation, shape ``(rows * cols, 6)``."""
+    frame = np.asarray(frame)
+    if frame.ndim == 2:
+        frame = np.repeat(frame[..., None], 3, axis=2)
+    h, w = frame.shape[:2]
+    rows, cols = h // cell, w // cell
+    blocks = frame[:rows * cell, :cols * cell, :3].astype(np.float32)
+    blocks = blocks.reshape(rows, cell, cols, cell, 3)
+    mean = blocks.mean(axis=(1, 3))
+    std = blocks.std(axis=(1, 3))
+    return np.concatenate([mean, std], axis=2).reshape(rows * cols, 6), (rows, cols)
+
+
+@register_backend('numpy')
+class NumpyModelBackend(DetectorBackend):
+    """
+    Per-cell linear classifier. The weights file holds ``weight (6, C + 1)``,
+    ``bias (C + 1,)``, ``feature_mean``/``feature_std (6,)`` and ``classes``
+    (the C defect names; the last output column is background).
+    """
+
+    max_batch_size = 64
+    batched = True
+
+    def __init__(self, weights_path=None, threshold=0.9, cell=CELL_SIZE, weights=None):
+        if weights is None:
+            weights_path = weights_path or os.environ.get('INSPECTION_NUMPY_MODEL')
+            if not weights_path:
+                raise ValueError("NumpyModelBackend needs weights_path or INSPECTION_NUMPY_MODEL")
+            with np.load(weights_path, allow_pickle=False) as data:
+                weights = {k: data[k] for k in data.files}
+        self.weight = weights['weight'].astype(np.float32)
+        self.bias = weights['bias'].astype(np.float32)
+        self.feature_mean = weights['feature_mean'].astype(np.float32)
+        self.feature_std = weights['feature_std'].astype(np.float32)
+        self.classes = [str(c) for c in weights['classes']]
+        self.class_codes = type_codes(self.classes)
+        self.threshold = threshold
+        self.cell = cell
+
+    @classmethod
+    def available(cls):
+        path = os.environ.get('INSPECTION_NUMPY_MODEL')
+        return bool(path) and os.path.exists(path)
+
+    @classmethod
+    def random_weights(cls, classes=('Bent Fin', 'Surface Contamination', 'Blocked Section'), seed=0):
+        rng = np.random.default_rng(seed)
+        n = len(classes) + 1
+        return {
+            'weight': rng.standard_normal((6, n)).astype(np.float32),
+            'bias': np.r_[np.full(n - 1, -4.0), 4.0].astype(np.float32),
+            'feature_mean': np.full(6, 128.0, np.float32),
+            'feature_std': np.full(6, 40.0, np.float32),
+            'classes': np.array(classes),
+        }
+
+    def detect_batch(self, frames):
+        features, grids = zip(*(cell_features(f, self.cell) for f in frames))
+        counts = [len(f) for f in features]
+        # All cells of all frames through one GEMM
+        x = (np.concatenate(features) - self.feature_mean) / self.feature_std
+        logits = x @ self.weight + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+
+        results = []
+        start = 0
+        for n, (rows, cols) in zip(counts, grids):
+            p = probs[start:start + n]
+            start += n
+            label = p.argmax(axis=1)
+            score = p[np.arange(n), label]
+            hits = np.flatnonzero((label < len(self.classes)) & (score >= self.threshold))
+            r, c = np.divmod(hits, cols)
+            s = score[hits]
+            results.append(DetectionBatch.from_columns(
+                self.class_codes[label[hits]],
+                s * 100,
+                c * self.cell + self.cell // 2,
+                r * self.cell + self.cell // 2,
+                np.select([s >= 0.99, s >= 0.95], [SEVERITY_CODES['High'], SEVERITY_CODES['Medium']],
+                          SEVERITY_CODES['Low']),
+                self.cell, self.cell,
+            ).sorted())
+        return results
+
+
+@register_backend('onnx')
+class OnnxBackend(DetectorBackend):
+    """
+    Whole-frame classifier exported to ONNX and run on CPU. The model takes
+    ``(N, 3, H, W)`` float32 in [0, 1] and returns ``(N, C)`` per-class
+    probabilities; frames are resized to the model's input size.
+    """
+
+    max_batch_size = 16
+    batched = True
+
+    def __init__(self, model_path=None, classes=None, threshold=0.5, threads=None):
+        import onnxruntime as ort
+
+        model_path = model_path or os.environ.get('INSPECTION_ONNX_MODEL')
+        if not model_path:
+            raise ValueError("OnnxBackend needs model_path or INSPECTION_ONNX_MODEL")
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input = self.session.get_inputs()[0]
+        self.height, self.width = self.input.shape[2], self.input.shape[3]
+        self.classes = list(classes or DEFECT_TYPES)
+        self.class_codes = type_codes(self.classes)
+        self.threshold = threshold
+
+    @classmethod
+    def available(cls):
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            return False
+        path = os.environ.get('INSPECTION_ONNX_MODEL')
+        return bool(path) and os.path.exists(path)
+
+    def detect_batch(self, frames):
+        from PIL import Image
+
+        batch = np.stack([
+            np.asarray(Image.fromarray(np.asarray(f)).convert('RGB').resize((self.width, self.height)),
+                       dtype=np.float32)
+            for f in frames
+        ]).transpose(0, 3, 1, 2) / 255.0
+        probs = self.session.run(None, {self.input.name: batch})[0]
+        results = []
+        for frame, row in zip(frames, probs):
+            h, w = np.asarray(frame).shape[:2]
+            hits = np.flatnonzero(row >= self.threshold)
+            p = row[hits]
+            results.append(DetectionBatch.from_columns(
+                self.class_codes[hits],
+                p * 100,
+                np.full(len(hits), w // 2),
+                np.full(len(hits), h // 2),
+                np.select([p >= 0.9, p >= 0.7], [SEVERITY_CODES['High'], SEVERITY_CODES['Medium']],
+                          SEVERITY_CODES['Low']),
+                w, h,   # whole-frame classification: the box is the frame
+            ))
+        return results
+
+
+def detector(backend, **batcher_kwargs):
+    """A ``MicroBatcher`` in front of ``backend`` if it batches, else the backend itself."""
+    return MicroBatcher(backend, **batcher_kwargs) if backend.batched else backend
+
+
+class MicroBatcher:
+    """Coalesce concurrent detection requests into batched backend calls."""
+
+    def __init__(self, backend, max_batch_size=None, max_wait_ms=5.0):
+        self.backend = backend
+        self.max_batch_size = max_batch_size or backend.max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._depth = BATCHER_QUEUE_DEPTH.labels(backend.name)
+        self._batch_sizes = BATCHER_BATCH_SIZE.labels(backend.name)
+        self._waits = BATCHER_WAIT_SECONDS.labels(backend.name)
+        self._thread = threading.Thread(target=self._loop, name=f'batcher-{backend.name}', daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        future = Future()
+        self._depth.inc()
+        self._queue.put((time.perf_counter(), frame, future))
+        return future
+
+    def detect(self, frame, timeout=None):
+        return self.submit(frame).result(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        # The window opens when the first request was queued, so no request
+        # waits longer than max_wait for company.
+        deadline = first[0] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+            self._depth.dec(len(batch))
+            started = time.perf_counter()
+            for queued_at, _, _ in batch:
+                self._waits.observe(started - queued_at)
+            self._batch_sizes.observe(len(batch))
+            try:
+                results = list(self.backend.detect_batch([frame for _, frame, _ in batch]))
+            except Exception as exc:
+                for _, _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, _, future), defects in zip(batch, results):
+                future.set_result(defects)
+            # A short result list must not leave its callers waiting forever
+            for _, _, future in batch[len(results):]:
+                future.set_exception(RuntimeError(
+                    f"{self.backend.name} backend returned {len(results)} results for {len(batch)} frames"))
+
+    def stats(self):
+        """Snapshot of queue depth, batch-size distribution and added wait."""
+        sizes = self._batch_sizes
+        waits = self._waits
+        return {
+            'backend': self.backend.name,
+            'queue_depth': self._depth.value,
+            'batches': sizes.count,
+            'mean_batch_size': sizes.sum / sizes.count if sizes.count else 0.0,
+            'mean_wait_ms': waits.sum / waits.count * 1000 if waits.count else 0.0,
+            'p95_wait_ms': (waits.quantile(0.95) or 0.0) * 1000,
+            'batch_size_histogram': dict(zip(
+                [str(b) for b in sizes._bounds] + ['+Inf'], list(sizes._counts))),
+        }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare per-request and micro-batched detection')
+    parser.add_argument('--bench', action='store_true')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=50, help='requests per client')
+    parser.add_argument('--wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    backend = NumpyModelBackend(weights=NumpyModelBackend.random_weights())
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    def run(detect):
+        def client():
+            for _ in range(args.requests):
+                detect(frame)
+        threads = [threading.Thread(target=client) for _ in range(args.clients)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return args.clients * args.requests / (time.perf_counter() - t0)
+
+    lock = threading.Lock()
+
+    def unbatched(f):
+        # One model call per request, serialised as a single model instance would be
+        with lock:
+            return backend.detect(f)
+
+    print(f"per-request:   {run(unbatched):8.1f} frames/s")
+    batcher = MicroBatcher(backend, max_wait_ms=args.wait_ms)
+    print(f"micro-batched: {run(batcher.detect):8.1f} frames/s")
+    s = batcher.stats()
+    print(f"mean batch {s['mean_batch_size']:.1f}, mean wait {s['mean_wait_ms']:.2f} ms, "
+          f"p95 wait <= {s['p95_wait_ms']:.1f} ms")
+    batcher.close()
+
+    # The classical backend loops over its batch, so batching only serializes it
+    classical = ClassicalCVBackend()
+    print(f"classical, called directly: {run(classical.detect):8.1f} frames/s")
+    batcher = MicroBatcher(classical, max_wait_ms=args.wait_ms)
+    print(f"classical, micro-batched:   {run(batcher.detect):8.1f} frames/s")
+    batcher.close()
@@ -0,0 +1,312 @@
+"""
+Memory-mapped archive of raw inspection frames.
+
+Frames are stored uncompressed in fixed-layout ``.npy`` chunk files, one
+archive directory per shift and frame shape:
+
+    frame_archive/
+        2024-06-01_A_2160x3840x3/
+            meta.json              # shape, dtype, chunk size
+            index.jsonl            # unit_id -> (chunk, slot), append-only
+            chunk_00000.npy        # (chunk_size, H, W, C) frames
+            chunk_00001.npy
+
+Looking up a unit is a dict lookup plus a memory-mapped slice, so reading a
+frame or a defect crop costs the same regardless of how many units the
+archive holds, and crops are zero-copy NumPy views into the page cache.
+
+The Streamlit app and the ingest daemon append to the same shift archive.
+Slots are allocated under an exclusive lock on the archive's ``.lock`` file,
+after catching up with any index lines other processes have written, so two
+writers never claim the same slot.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+DEFAULT_ARCHIVE_DIR = os.environ.get('INSPECTION_ARCHIVE_DIR', 'frame_archive')
+
+# Shift boundaries (hour of day) for the three-shift line schedule
+SHIFTS = (('A', 6), ('B', 14), ('C', 22))
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on ``path`` (created if missing) across processes, held for the ``with`` block."""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def shift_of(when=None):
+    """Return ``(date, shift letter)`` for a timestamp; shift C runs past midnight."""
+    when = when or datetime.now()
+    hour = when.hour
+    if hour < SHIFTS[0][1]:
+        # Early morning belongs to the previous day's night shift
+        day = datetime.fromordinal(when.toordinal() - 1)
+        return day.strftime('%Y-%m-%d'), SHIFTS[-1][0]
+    letter = SHIFTS[0][0]
+    for name, start in SHIFTS:
+        if hour >= start:
+            letter = name
+    return when.strftime('%Y-%m-%d'), letter
+
+
+class FrameArchive:
+    """A single fixed-shape frame archive directory."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.shape = tuple(meta['shape'])
+        self.dtype = np.dtype(meta['dtype'])
+        self.chunk_size = int(meta['chunk_size'])
+        self._chunks = {}
+        self._lock = threading.Lock()
+        self._index = {}
+        self._count = 0
+        self._index_pos = 0         # bytes of index.jsonl already read
+        self._load_index()
+
+    @classmethod
+    def create(cls, path, shape, dtype='uint8', chunk_size=64):
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            # Another process may be creating the same shift archive: publish
+            # meta.json whole, never half-written
+            tmp = f"{meta_path}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump({
+                    'shape': list(shape),
+                    'dtype': np.dtype(dtype).str,
+                    'chunk_size': chunk_size,
+                }, f)
+            os.replace(tmp, meta_path)
+        return cls(path)
+
+    def _load_index(self):
+        """Read the index lines written since the last call, by this or any other process."""
+        index_path = os.path.join(self.path, 'index.jsonl')
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, 'rb') as f:
+            f.seek(self._index_pos)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Still being written (or torn); read it next time
+                    break
+                self._index_pos += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn line from an interrupted write
+                    continue
+                self._index[entry['unit_id']] = (entry['chunk'], entry['slot'])
+                self._count = max(self._count, entry['chunk'] * self.chunk_size + entry['slot'] + 1)
+
+    def _chunk(self, number, create=False):
+        chunk = self._chunks.get(number)
+        if chunk is None:
+            chunk_path = os.path.join(self.path, f'chunk_{number:05d}.npy')
+            if create and not os.path.exists(chunk_path):
+                chunk = np.lib.format.open_memmap(
+                    chunk_path, mode='w+', dtype=self.dtype,
+                    shape=(self.chunk_size,) + self.shape,
+                )
+            else:
+                chunk = np.load(chunk_path, mmap_mode='r+' if create else 'r')
+            self._chunks[number] = chunk
+        return chunk
+
+    def reload(self):
+        """Pick up units other processes have appended since the index was last read."""
+        try:
+            size = os.path.getsize(os.path.join(self.path, 'index.jsonl'))
+        except OSError:
+            return
+        if size > self._index_pos:
+            with self._lock:
+                self._load_index()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, unit_id):
+        if unit_id not in self._index:
+            self.reload()
+        return unit_id in self._index
+
+    def unit_ids(self):
+        return list(self._index)
+
+    def append(self, unit_id, frame):
+        """Copy ``frame`` into the next free slot and index it under ``unit_id``."""
+        frame = np.asarray(frame)
+        if frame.shape != self.shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match archive shape {self.shape}")
+        with self._lock, file_lock(os.path.join(self.path, '.lock')):
+            # Other processes may have taken slots since this one last looked
+            self._load_index()
+            chunk_no, slot = divmod(self._count, self.chunk_size)
+            chunk = self._chunk(chunk_no, create=True)
+            if not chunk.flags.writeable:
+                chunk = self._chunks[chunk_no] = np.load(chunk.filename, mmap_mode='r+')
+            chunk[slot] = frame
+            chunk.flush()
+            line = json.dumps({
+                'unit_id': unit_id,
+                'chunk': chunk_no,
+                'slot': slot,
+                'ts': datetime.now().isoformat(timespec='seconds'),
+            }) + '\n'
+            with open(os.path.join(self.path, 'index.jsonl'), 'a') as f:
+                f.write(line)
+            self._index_pos += len(line.encode())
+            self._index[unit_id] = (chunk_no, slot)
+            self._count += 1
+
+    def frame(self, unit_id):
+        """Zero-copy view of the full frame stored for ``unit_id``."""
+        if unit_id not in self._index:
+            self.reload()
+        chunk_no, slot = self._index[unit_id]
+        return self._chunk(chunk_no)[slot]
+
+    def crop(self, unit_id, x0, y0, x1, y1):
+        """Zero-copy view of the region ``[y0:y1, x0:x1]`` clipped to the frame."""
+        height, width = self.shape[:2]
+        x0, x1 = max(int(x0), 0), min(int(x1), width)
+        y0, y1 = max(int(y0), 0), min(int(y1), height)
+        return self.frame(unit_id)[y0:y1, x0:x1]
+
+
+class ArchiveSet:
+    """All frame archives under a base directory, searchable by unit ID."""
+
+    def __init__(self, base=DEFAULT_ARCHIVE_DIR):
+        self.base = base
+        self._archives = {}
+        self._units = {}
+        self._registered = {}       # archive name -> units already in _units
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """
+        Catch up with archives and units written since the last call, by this
+        or another process (the ingest daemon, a shift rollover): one
+        directory listing plus one ``stat`` per archive when nothing changed.
+        """
+        if not os.path.isdir(self.base):
+            return
+        with self._lock:
+            for name in sorted(os.listdir(self.base)):
+                path = os.path.join(self.base, name)
+                if name not in self._archives and os.path.exists(os.path.join(path, 'meta.json')):
+                    self._archives[name] = FrameArchive(path)
+            for name, archive in self._archives.items():
+                archive.reload()
+                if len(archive) != self._registered.get(name, 0):
+                    for unit_id in archive.unit_ids():
+                        self._units[unit_id] = archive
+                    self._registered[name] = len(archive)
+
+    def _archive_of(self, unit_id):
+        archive = self._units.get(unit_id)
+        if archive is None:
+            # Possibly written by another process since the last refresh
+            self.refresh()
+            archive = self._units[unit_id]
+        return archive
+
+    def archive_for(self, shape, dtype='uint8', when=None):
+        """Writable archive for the current shift and frame shape."""
+        day, shift = shift_of(when)
+        name = f"{day}_{shift}_{'x'.join(str(d) for d in shape)}"
+        with self._lock:
+            archive = self._archives.get(name)
+            if archive is None:
+                archive = FrameArchive.create(os.path.join(self.base, name), shape, dtype)
+                self._archives[name] = archive
+        return archive
+
+    def append(self, unit_id, frame, when=None):
+        frame = np.asarray(frame)
+        archive = self.archive_for(frame.shape, frame.dtype, when)
+        archive.append(unit_id, frame)
+        self._units[unit_id] = archive
+
+    def __contains__(self, unit_id):
+        if unit_id not in self._units:
+            self.refresh()
+        return unit_id in self._units
+
+    def __len__(self):
+        self.refresh()
+        return len(self._units)
+
+    def unit_ids(self):
+        self.refresh()
+        return list(self._units)
+
+    def frame(self, unit_id):
+        return self._archive_of(unit_id).frame(unit_id)
+
+    def crop(self, unit_id, x0, y0, x1, y1):
+        return self._archive_of(unit_id).crop(unit_id, x0, y0, x1, y1)
+
+    def crop_around(self, unit_id, center, size=(300, 200)):
+        """Zero-copy crop of ``size`` (width, height) centred on a defect location."""
+        x, y = center
+        w, h = size
+        return self.crop(unit_id, x - w // 2, y - h // 2, x + w // 2, y + h // 2)
+
+
+if __name__ == '__main__':
+    import tempfile
+    import time
+
+    shape = (2160, 3840, 3)
+    n_units = 200
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, shape, dtype=np.uint8)
+
+    with tempfile.TemporaryDirectory() as base:
+        archives = ArchiveSet(base)
+        t0 = time.perf_counter()
+        for i in range(n_units):
+            archives.append(f'HAR-2024-{i:06d}', frame)
+        write_s = time.perf_counter() - t0
+
+        reopened = ArchiveSet(base)
+        ids = reopened.unit_ids()
+        t0 = time.perf_counter()
+        for unit_id in rng.choice(ids, 1000):
+            crop = reopened.crop_around(unit_id, (1900, 1000))
+            crop[0, 0, 0]
+        crop_us = (time.perf_counter() - t0) / 1000 * 1e6
+
+        print(f"Wrote {n_units} 4K frames in {write_s:.2f} s ({n_units / write_s:.0f} frames/s)")
+        print(f"Random 300x200 crop: {crop_us:.1f} us, zero-copy view: {np.shares_memory(crop, reopened.frame(unit_id))}")
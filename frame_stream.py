@@ -0,0 +1,326 @@
+"""
+Streaming frame ingestion for the RGB line cameras.
+
+Frames come from a generator source (video file, image directory or a
+simulated camera) and pass through a bounded buffer to the inspection
+consumer:
+
+    source --> reader thread --> bounded queue --> position gate --> detector
+
+The queue provides backpressure for file sources (the reader blocks when the
+consumer falls behind) and frame skipping for live sources (the oldest
+buffered frame is dropped so the consumer always works on recent frames).
+Detection runs only on frames where the position gate reports a unit settled
+in front of the camera.
+
+Usage:
+    python frame_stream.py --source sim --seconds 10
+    python frame_stream.py --source /path/to/captures --fps 30
+"""
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import metrics
+from detection import PositionGate, detect_defects, detect_in_region
+from detection_records import DetectionBatch
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+FRAMES = metrics.REGISTRY.counter(
+    'inspection_stream_frames', 'Camera frames by outcome', labels=('outcome',))
+STREAM_LAG_SECONDS = metrics.REGISTRY.histogram(
+    'inspection_stream_lag_seconds', 'Delay between frame capture and processing')
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+def _paced(frames, fps):
+    # Release frames at the camera rate, as a live feed would
+    interval = 1.0 / fps
+    next_time = time.perf_counter()
+    for frame in frames:
+        now = time.perf_counter()
+        if next_time > now:
+            time.sleep(next_time - now)
+        next_time = max(next_time + interval, now - interval)
+        yield time.time(), frame
+
+
+def video_frames(path, fps=None, realtime=True):
+    """Frames from a local video file (needs OpenCV or imageio)."""
+    try:
+        import cv2
+    except ImportError:
+        cv2 = None
+
+    if cv2 is not None:
+        def read():
+            capture = cv2.VideoCapture(path)
+            try:
+                while True:
+                    ok, bgr = capture.read()
+                    if not ok:
+                        break
+                    yield bgr[..., ::-1]
+            finally:
+                capture.release()
+        if fps is None:
+            capture = cv2.VideoCapture(path)
+            fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+            capture.release()
+    else:
+        try:
+            import imageio.v3 as iio
+        except ImportError as exc:
+            raise ImportError("Reading video files needs opencv-python or imageio[ffmpeg]") from exc
+
+        def read():
+            yield from iio.imiter(path)
+        fps = fps or 30.0
+
+    if realtime:
+        return _paced(read(), fps)
+    return ((time.time(), frame) for frame in read())
+
+
+def directory_frames(path, fps=30.0, realtime=True, loop=False):
+    """Frames from the image files in ``path``, in filename order."""
+    from normalized_image import NormalizedImage
+
+    names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS))
+
+    def read():
+        while True:
+            for name in names:
+                yield NormalizedImage.open(os.path.join(path, name)).array
+            if not loop:
+                break
+
+    if realtime:
+        return _paced(read(), fps)
+    return ((time.time(), frame) for frame in read())
+
+
+def simulated_camera(shape=(1080, 1920, 3), fps=30.0, cycle_seconds=5.2,
+                     dwell_fraction=0.5, defect_rate=0.3, seed=None, realtime=True):
+    """
+    Synthetic conveyor feed: each cycle a unit slides in, dwells under the
+    camera, then leaves. A fraction of units carry a dark blotch defect.
+    """
+    rng = np.random.default_rng(seed)
+    h, w = shape[:2]
+    background = np.full(shape, 60, dtype=np.uint8)
+
+    def make_unit():
+        unit = np.full((h - h // 8, w // 2, 3), 190, dtype=np.uint8)
+        unit[:, ::16] = 140          # fin pattern
+        if rng.random() < defect_rate:
+            y = rng.integers(80, unit.shape[0] - 160)
+            x = rng.integers(80, unit.shape[1] - 160)
+            unit[y:y + 80, x:x + 80] = 20
+        return unit
+
+    def read():
+        frames_per_cycle = max(int(cycle_seconds * fps), 4)
+        travel = int(frames_per_cycle * (1 - dwell_fraction) / 2)
+        while True:
+            unit = make_unit()
+            unit_h, unit_w = unit.shape[:2]
+            top = (h - unit_h) // 2
+            stop_x = (w - unit_w) // 2
+            for i in range(frames_per_cycle):
+                if i < travel:
+                    x = -unit_w + (stop_x + unit_w) * i // max(travel, 1)
+                elif i < frames_per_cycle - travel:
+                    x = stop_x
+                else:
+                    k = i - (frames_per_cycle - travel)
+                    x = stop_x + (w - stop_x) * k // max(travel, 1)
+                frame = background.copy()
+                x0, x1 = max(x, 0), min(x + unit_w, w)
+                if x1 > x0:
+                    frame[top:top + unit_h, x0:x1] = unit[:, x0 - x:x1 - x]
+                yield frame
+
+    if realtime:
+        return _paced(read(), fps)
+    return ((time.time(), frame) for frame in read())
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+@dataclass
+class StreamStats:
+    received: int = 0
+    dropped: int = 0
+    processed: int = 0
+    inspections: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    max_lag: float = 0.0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def input_fps(self):
+        return self.received / max(self.elapsed, 1e-9)
+
+    @property
+    def processed_fps(self):
+        return self.processed / max(self.elapsed, 1e-9)
+
+    @property
+    def drop_rate(self):
+        return self.dropped / max(self.received, 1)
+
+
+@dataclass
+class StreamResult:
+    unit_number: int
+    captured_at: float
+    frame: np.ndarray
+    defects: DetectionBatch
+
+
+class StreamIngest:
+    """
+    Run a frame source through a bounded buffer into the position gate and
+    detector. ``policy`` is ``'drop_oldest'`` for live cameras (frame
+    skipping) or ``'block'`` for files (backpressure on the reader).
+    """
+
+    def __init__(self, source, buffer_size=8, policy='drop_oldest',
+                 gate=None, detector=detect_defects):
+        if policy not in ('drop_oldest', 'block'):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.source = source
+        self.policy = policy
+        self.gate = gate or PositionGate()
+        self.detector = detector
+        self.stats = StreamStats()
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._stop = threading.Event()
+        self._reader = None
+
+    def _put(self, item):
+        if self.policy == 'block':
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            return
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.stats.dropped += 1
+                    FRAMES.labels('dropped').inc()
+                except queue.Empty:
+                    pass
+
+    def _read(self):
+        try:
+            for captured_at, frame in self.source:
+                if self._stop.is_set():
+                    break
+                self.stats.received += 1
+                FRAMES.labels('received').inc()
+                self._put((captured_at, frame))
+        finally:
+            self._put(None)
+
+    def start(self):
+        self.stats = StreamStats()
+        self._reader = threading.Thread(target=self._read, name='frame-reader', daemon=True)
+        self._reader.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        # Unblock a reader waiting on a full queue
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def results(self, max_seconds=None, max_units=None):
+        """Yield a StreamResult for every unit that settles in position."""
+        if self._reader is None:
+            self.start()
+        deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+        try:
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                try:
+                    item = self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                captured_at, frame = item
+                lag = time.time() - captured_at
+                STREAM_LAG_SECONDS.observe(lag)
+                self.stats.max_lag = max(self.stats.max_lag, lag)
+                self.stats.processed += 1
+                FRAMES.labels('processed').inc()
+
+                if not self.gate(frame):
+                    continue
+                with metrics.DETECTION_SECONDS.time():
+                    defects = detect_in_region(frame, self.gate.region, self.detector)
+                self.stats.inspections += 1
+                metrics.INSPECTIONS.labels('fail' if defects else 'pass').inc()
+                for defect_type, count in defects.type_counts().items():
+                    metrics.DEFECTS_DETECTED.labels(defect_type).inc(count)
+                yield StreamResult(self.gate.units_seen, captured_at, frame, defects)
+                if max_units is not None and self.stats.inspections >= max_units:
+                    break
+        finally:
+            self.stop()
+
+
+def open_source(spec, fps=30.0, realtime=True, shape=(1080, 1920, 3)):
+    """Build a source from ``'sim'``, an image directory or a video file path."""
+    if spec == 'sim':
+        return simulated_camera(shape=shape, fps=fps, realtime=realtime)
+    if os.path.isdir(spec):
+        return directory_frames(spec, fps=fps, realtime=realtime)
+    return video_frames(spec, fps=fps, realtime=realtime)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stream frames through the inspection pipeline')
+    parser.add_argument('--source', default='sim', help="'sim', an image directory or a video file")
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--buffer', type=int, default=8)
+    parser.add_argument('--policy', default='drop_oldest', choices=['drop_oldest', 'block'])
+    args = parser.parse_args()
+
+    ingest = StreamIngest(open_source(args.source, args.fps), args.buffer, args.policy)
+    for result in ingest.results(max_seconds=args.seconds):
+        status = 'FAIL' if result.defects else 'PASS'
+        print(f"unit {result.unit_number:4d}  {status}  {len(result.defects)} defect(s)")
+
+    s = ingest.stats
+    print(f"{s.received} frames in {s.elapsed:.1f} s ({s.input_fps:.1f} fps in, "
+          f"{s.processed_fps:.1f} fps processed), dropped {s.dropped} "
+          f"({s.drop_rate:.1%}), max lag {s.max_lag * 1000:.0f} ms, {s.inspections} inspections")
@@ -0,0 +1,419 @@
+"""
+Golden-template inspection: register each capture to its variant's
+known-good reference and localize defects by difference.
+
+Every Harrier/Safari condenser variant has a golden template: the mean and
+per-pixel spread of registered captures of known-good units, kept at a
+working resolution of ``WORK_WIDTH`` pixels across. A capture is
+
+    gray, resized to the template, median/MAD normalized, Hann windowed
+      -> one forward FFT
+      -> [rotation] log-polar resampling of its magnitude spectrum, phase
+         correlated with the template's -> rotation and scale; the capture
+         is de-rotated and transformed again
+      -> phase correlation with the template's spectrum (one inverse FFT)
+         -> translation, to a fraction of a pixel
+      -> resampled onto the template (one bilinear affine warp)
+      -> per-pixel z-score against the template, averaged over blocks
+      -> regions (regions.py)
+
+The template's spectrum, its log-polar magnitude spectrum and the sampling
+grid are computed once when it is built or loaded, so translation-only
+registration costs one forward and one inverse real FFT per unit. Rotation
+adds two small FFTs for the log-polar step and one more forward FFT after
+de-rotating; it is recovered within +-90 degrees (magnitude spectra are
+symmetric).
+
+Regions darker than the template are reported as Blocked Section and
+brighter ones as Surface Contamination. A pose beyond ``TemplateTolerances``
+is reported as Mounting Misalignment, a point where the template centre
+lands. Detections are in capture pixels.
+
+Templates are stored per variant as ``.npz`` files under
+``$INSPECTION_TEMPLATES``.
+
+Usage:
+    python golden_template.py --units 50    # synthetic 1080p captures: registration error and per-unit time
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from detection import to_gray
+from detection_records import SEVERITY_CODES, TYPE_CODES, DetectionBatch
+from regions import find_regions
+
+TEMPLATE_DIR = os.environ.get('INSPECTION_TEMPLATES', 'golden_templates')
+WORK_WIDTH = 1024
+LOG_POLAR_SHAPE = (1024, 512)   # angles over 180 degrees, log radii
+BLOCK = 4                       # working px averaged per difference cell
+Z_THRESHOLD = 4.0
+MIN_STD = 0.25                  # normalized units; floor for pixels that barely vary between good units
+MIN_AREA = 4                    # blocks
+MAX_DEFECTS = 20
+
+
+@dataclass
+class TemplateTolerances:
+    shift: float = 20.0                 # capture px
+    angle: float = 2.0                  # degrees
+    scale: float = 0.03                 # relative
+
+
+@dataclass
+class Registration:
+    # Template pixel p shows capture pixel c + scale * R(angle) (p - c) + (dx, dy),
+    # c the frame centre, in working pixels
+    dx: float = 0.0
+    dy: float = 0.0
+    angle: float = 0.0                  # degrees
+    scale: float = 1.0
+    response: float = 0.0               # phase-correlation peak: 0 no match .. 1 exact
+
+
+@dataclass
+class TemplateInspection:
+    registration: Registration
+    misalignment: float                 # largest pose error over its tolerance
+    detections: DetectionBatch
+    aligned: np.ndarray = None          # the capture on the template grid, as from ``align``
+
+
+def working_shape(shape, width=WORK_WIDTH):
+    """``(h, w)`` of a frame scaled down to at most ``width`` pixels across."""
+    h, w = shape[:2]
+    if w <= width:
+        return (h, w)
+    return (max(int(round(h * width / w)), 1), width)
+
+
+def normalize(gray):
+    """Gray with its median subtracted, in units of its (MAD) spread."""
+    sample = gray[::4, ::4]
+    median = np.median(sample)
+    mad = np.median(np.abs(sample - median)) * 1.4826
+    return ((gray - median) / max(mad, 1.0)).astype(np.float32)
+
+
+def _resize(gray, shape):
+    if gray.shape == shape:
+        return gray
+    return np.asarray(Image.fromarray(gray, 'F').resize((shape[1], shape[0]), Image.BILINEAR))
+
+
+def _matrix(registration):
+    a = np.radians(registration.angle)
+    s = registration.scale
+    return s * np.cos(a), s * np.sin(a)
+
+
+def warp(gray, registration, fill=np.nan):
+    """``gray`` (float32) resampled onto the template grid, ``fill`` where it has no pixels."""
+    h, w = gray.shape
+    cos, sin = _matrix(registration)
+    # PIL maps output pixel centres to input coordinates; the centre is (w/2, h/2) in them
+    cx, cy = w / 2, h / 2
+    coeffs = (cos, -sin, cx - cos * cx + sin * cy + registration.dx,
+              sin, cos, cy - sin * cx - cos * cy + registration.dy)
+    image = Image.fromarray(np.asarray(gray, np.float32), 'F')
+    return np.asarray(image.transform((w, h), Image.AFFINE, coeffs, Image.BILINEAR, fillcolor=fill))
+
+
+def to_capture(points, registration, shape):
+    """``(n, 2)`` template ``(x, y)`` coordinates (pixel edges) to capture working coordinates."""
+    h, w = shape
+    cos, sin = _matrix(registration)
+    x = points[:, 0] - w / 2
+    y = points[:, 1] - h / 2
+    return np.stack([w / 2 + cos * x - sin * y + registration.dx,
+                     h / 2 + sin * x + cos * y + registration.dy], axis=1)
+
+
+def _peak(surface):
+    """Sub-pixel ``(dy, dx)`` of the highest value of a cyclic correlation surface, and that value."""
+    h, w = surface.shape
+    y, x = divmod(int(np.argmax(surface)), w)
+    peak = float(surface[y, x])
+
+    def offset(before, after):
+        curvature = before - 2 * peak + after
+        return 0.5 * (before - after) / curvature if curvature < 0 else 0.0
+
+    dy = y + offset(surface[y - 1, x], surface[(y + 1) % h, x])
+    dx = x + offset(surface[y, x - 1], surface[y, (x + 1) % w])
+    # Shifts past half the frame are negative shifts that wrapped around
+    return (dy + h / 2) % h - h / 2, (dx + w / 2) % w - w / 2, peak
+
+
+def phase_correlate(spectrum, reference_conj, shape):
+    """
+    ``(dy, dx, response)`` of the frame behind ``spectrum`` relative to the
+    reference (rfft2 spectra). The cross-power spectrum is whitened by the
+    square root of its magnitude rather than all of it, which keeps the
+    peak sharp without letting noise and defects outvote the structure.
+    """
+    cross = spectrum * reference_conj
+    weight = np.sqrt(np.abs(cross))
+    cross /= weight + 1e-12
+    dy, dx, peak = _peak(np.fft.irfft2(cross, s=shape))
+    # The peak if every frequency agreed: the weights summed over the full
+    # spectrum, whose columns past the first (and the Nyquist one) appear twice
+    total = 2 * weight.sum() - weight[:, 0].sum() - (weight[:, -1].sum() if shape[1] % 2 == 0 else 0)
+    return dy, dx, peak * shape[0] * shape[1] / max(total, 1e-12)
+
+
+def _hann(shape):
+    return np.outer(np.hanning(shape[0]), np.hanning(shape[1])).astype(np.float32)
+
+
+def _severity(score, threshold):
+    return np.select(
+        [score >= 4 * threshold, score >= 2 * threshold],
+        [SEVERITY_CODES['High'], SEVERITY_CODES['Medium']],
+        SEVERITY_CODES['Low'],
+    )
+
+
+class GoldenTemplate:
+    """Known-good appearance of one variant, with the FFTs registration needs precomputed."""
+
+    def __init__(self, mean, std=None, variant=''):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        std = np.zeros_like(self.mean) if std is None else np.asarray(std, dtype=np.float32)
+        self.inv_std = 1.0 / np.maximum(std, MIN_STD)
+        self.variant = variant
+        self.shape = self.mean.shape
+
+        h, w = self.shape
+        self._window = _hann(self.shape)
+        self._spectrum_conj = np.conj(np.fft.rfft2(self.mean * self._window))
+
+        # Log-polar sampling of an rfft2 spectrum: angles over the half plane
+        # fx >= 0, log-spaced radii in cycles per pixel, bilinear weights
+        n_angle, n_radius = LOG_POLAR_SHAPE
+        theta = -np.pi / 2 + np.pi * np.arange(n_angle) / n_angle
+        r_min, r_max = 2.0 / min(h, w), 0.5
+        self._log_step = np.log(r_max / r_min) / (n_radius - 1)
+        radius = r_min * np.exp(self._log_step * np.arange(n_radius))
+        row = (np.sin(theta)[:, None] * radius * h) % h
+        col = np.minimum(np.cos(theta)[:, None] * radius * w, w // 2)
+        r0, c0 = np.floor(row).astype(np.intp), np.floor(col).astype(np.intp)
+        self._grid = (r0, (r0 + 1) % h, c0, np.minimum(c0 + 1, w // 2),
+                      (row - r0).astype(np.float32), (col - c0).astype(np.float32))
+        # High-pass emphasis against the low-frequency peak (Reddy & Chatterji)
+        x = np.cos(np.pi * np.fft.fftfreq(h))[:, None] * np.cos(np.pi * np.fft.rfftfreq(w))[None, :]
+        self._highpass = ((1 - x) * (2 - x)).astype(np.float32)
+        self._radial_window = np.hanning(n_radius).astype(np.float32)
+        self._log_polar_conj = np.conj(np.fft.rfft2(self._log_polar(np.conj(self._spectrum_conj))))
+
+    @classmethod
+    def fit(cls, frames, variant='', width=WORK_WIDTH, rotation=False):
+        """Template from captures of known-good units, each registered to the first."""
+        grays = [to_gray(f) for f in frames]
+        first = cls(normalize(_resize(grays[0], working_shape(grays[0].shape, width))), variant=variant)
+        stack = []
+        for gray in grays:
+            working = first._prepare(gray)
+            stack.append(warp(working, first._register(working, rotation)))
+        stack = np.stack(stack)
+        seen = np.isfinite(stack)
+        count = np.maximum(seen.sum(axis=0), 1)
+        filled = np.where(seen, stack, 0)
+        mean = filled.sum(axis=0) / count
+        var = np.where(seen, (filled - mean) ** 2, 0).sum(axis=0) / count
+        return cls(mean, np.sqrt(var), variant)
+
+    def save(self, path=None):
+        path = path or os.path.join(TEMPLATE_DIR, f'{self.variant}.npz')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez(path, mean=self.mean, std=1.0 / self.inv_std, variant=self.variant)
+        return path
+
+    @classmethod
+    def load(cls, variant=None, path=None):
+        path = path or os.path.join(TEMPLATE_DIR, f'{variant}.npz')
+        with np.load(path) as data:
+            return cls(data['mean'], data['std'], str(data['variant']))
+
+    def _prepare(self, gray):
+        return normalize(_resize(np.asarray(gray, np.float32), self.shape))
+
+    def _log_polar(self, spectrum):
+        magnitude = np.log1p(np.abs(spectrum)) * self._highpass
+        r0, r1, c0, c1, wr, wc = self._grid
+        top = magnitude[r0, c0] * (1 - wc) + magnitude[r0, c1] * wc
+        bottom = magnitude[r1, c0] * (1 - wc) + magnitude[r1, c1] * wc
+        return (top * (1 - wr) + bottom * wr) * self._radial_window
+
+    def _register(self, working, rotation=False):
+        spectrum = np.fft.rfft2(working * self._window)
+        angle, scale = 0.0, 1.0
+        if rotation:
+            # Magnitude spectra ignore translation; rotation and scale shift
+            # their log-polar image along its angle and log-radius axes
+            d_angle, d_radius, _ = phase_correlate(np.fft.rfft2(self._log_polar(spectrum)),
+                                                   self._log_polar_conj, LOG_POLAR_SHAPE)
+            angle = d_angle * 180.0 / LOG_POLAR_SHAPE[0]
+            scale = float(np.exp(-d_radius * self._log_step))
+            spectrum = np.fft.rfft2(np.nan_to_num(warp(working, Registration(angle=angle, scale=scale)))
+                                    * self._window)
+        dy, dx, response = phase_correlate(spectrum, self._spectrum_conj, self.shape)
+        # The translation was measured after de-rotating: bring it into the capture
+        cos, sin = _matrix(Registration(angle=angle, scale=scale))
+        return Registration(cos * dx - sin * dy, sin * dx + cos * dy, angle, scale, response)
+
+    def register(self, frame, rotation=False):
+        """``Registration`` of a capture (RGB or gray, any size) onto the template."""
+        return self._register(self._prepare(to_gray(frame)), rotation)
+
+    def align(self, frame, rotation=False):
+        """
+        ``(registration, aligned)`` of a capture: its pose, and its
+        normalized gray resampled onto the template grid (NaN where the
+        capture has no pixels).
+        """
+        working = self._prepare(to_gray(frame))
+        registration = self._register(working, rotation)
+        return registration, warp(working, registration)
+
+    def difference_detections(self, z, registration, frame_shape, z_threshold=Z_THRESHOLD, min_area=MIN_AREA):
+        """
+        Blocked Section (negative) and Surface Contamination (positive)
+        regions of a per-pixel z-score on the template grid, boxed in the
+        pixels of a capture of ``frame_shape``; unsorted.
+        """
+        # Averaged over blocks: a defect is a patch, a leftover sub-pixel
+        # misregistration only a thin line along strong edges
+        h, w = self.shape
+        rows, cols = h // BLOCK, w // BLOCK
+        z = z[:rows * BLOCK, :cols * BLOCK].reshape(rows, BLOCK, cols, BLOCK).mean(axis=(1, 3))
+
+        to_frame = np.array([frame_shape[1] / w, frame_shape[0] / h], np.float32)
+        types, scores, boxes = [], [], []
+        with np.errstate(invalid='ignore'):    # NaN outside the capture compares False
+            masks = [('Blocked Section', z < -z_threshold, -z), ('Surface Contamination', z > z_threshold, z)]
+        for defect_type, mask, values in masks:
+            regions = find_regions(mask, values, min_area=min_area)
+            for field in ('x0', 'y0', 'x1', 'y1'):
+                regions[field] *= BLOCK
+            # Region corners mapped back into the capture, then boxed
+            corners = np.stack([
+                np.stack([regions[x], regions[y]], axis=1)
+                for x, y in (('x0', 'y0'), ('x1', 'y0'), ('x0', 'y1'), ('x1', 'y1'))
+            ], axis=1).reshape(-1, 2).astype(np.float32)
+            corners = (to_capture(corners, registration, self.shape) * to_frame).reshape(-1, 4, 2)
+            boxes.append(np.concatenate([np.floor(corners.min(axis=1)), np.ceil(corners.max(axis=1))], axis=1))
+            types.append(np.full(len(regions), TYPE_CODES[defect_type], np.uint8))
+            scores.append(regions['peak'] / z_threshold)
+        return _detections(types, scores, boxes, frame_shape)
+
+    def inspect(self, frame, rotation=False, tolerances=TemplateTolerances(), z_threshold=Z_THRESHOLD,
+                min_area=MIN_AREA, max_defects=MAX_DEFECTS):
+        """Register a capture, difference it against the template and report what stands out."""
+        gray = to_gray(frame)
+        registration, aligned = self.align(gray, rotation)
+        z = (aligned - self.mean) * self.inv_std
+        batches = [self.difference_detections(z, registration, gray.shape, z_threshold, min_area)]
+
+        h, w = self.shape
+        to_frame = np.array([gray.shape[1] / w, gray.shape[0] / h], np.float32)
+        shift = np.hypot(registration.dx * to_frame[0], registration.dy * to_frame[1])
+        misalignment = max(shift / tolerances.shift, abs(registration.angle) / tolerances.angle,
+                           abs(registration.scale - 1) / tolerances.scale)
+        if misalignment > 1:
+            centre = to_capture(np.array([[w / 2, h / 2]]), registration, self.shape)[0] * to_frame
+            batches.append(_detections([np.array([TYPE_CODES['Mounting Misalignment']], np.uint8)],
+                                       [np.array([misalignment], np.float32)],
+                                       [np.array([[centre[0], centre[1], centre[0], centre[1]]])], gray.shape))
+        detections = DetectionBatch.concatenate(batches)
+        return TemplateInspection(registration, misalignment, detections.sorted()[:max_defects], aligned)
+
+
+def _detections(types, scores, boxes, frame_shape):
+    # Scores are in units of their threshold: 1 is just detected
+    score = np.concatenate(scores).astype(np.float32)
+    h, w = frame_shape[:2]
+    box = np.clip(np.concatenate(boxes), 0, [w, h, w, h])
+    return DetectionBatch.from_boxes(
+        np.concatenate(types),
+        np.minimum(85.0 + 14.0 * (1 - 1 / score), 99.5),
+        box,
+        _severity(score, 1.0),
+    )
+
+
+def available_variants(directory=None):
+    """Variants with a stored template."""
+    directory = directory or TEMPLATE_DIR
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.npz'))
+
+
+def synthetic_unit(rng, shape=(1080, 1920), defects=()):
+    """
+    8-bit grayscale condenser: header tanks, a fin core, brackets and a pipe
+    on a dark background, plus sensor noise. ``defects`` are
+    ``(x, y, radius, level)`` blotches.
+    """
+    h, w = shape
+    y, x = np.mgrid[0:h, 0:w].astype(np.float32)
+    frame = np.full(shape, 40, np.float32)
+    core = (x > 0.12 * w) & (x < 0.88 * w) & (y > 0.15 * h) & (y < 0.85 * h)
+    frame[core] = 130 + 50 * np.sin(2 * np.pi * x[core] / 9)
+    frame[(x > 0.08 * w) & (x < 0.92 * w) & (((y > 0.08 * h) & (y < 0.15 * h)) | ((y > 0.85 * h) & (y < 0.92 * h)))] = 200
+    for bx, by in ((0.05, 0.3), (0.95, 0.3), (0.05, 0.7), (0.95, 0.7)):
+        frame[(np.abs(x - bx * w) < 0.02 * w) & (np.abs(y - by * h) < 0.04 * h)] = 230
+    frame[(np.abs(y - 0.5 * h - 0.3 * (x - 0.9 * w)) < 0.015 * h) & (x > 0.9 * w)] = 180
+    for cx, cy, r, level in defects:
+        frame[(x - cx) ** 2 + (y - cy) ** 2 < r * r] = level
+    frame += rng.normal(0, 4, shape)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Golden-template registration accuracy and per-unit time')
+    parser.add_argument('--units', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scene = synthetic_unit(rng)
+    template = GoldenTemplate.fit([synthetic_unit(rng) for _ in range(5)], variant='synthetic')
+    h, w = scene.shape
+    corners = np.array([[0, 0], [w, 0], [0, h], [w, h]], np.float32)
+
+    scale = w / template.shape[1]
+    for rotation in (False, True):
+        errors, times = [], []
+        for _ in range(args.units):
+            # A capture posed by a known transform of the scene: capture(q) = scene(c + A (q - c) + d)
+            pose = Registration(rng.uniform(-60, 60), rng.uniform(-40, 40),
+                                rng.uniform(-3, 3) if rotation else 0.0,
+                                rng.uniform(0.97, 1.03) if rotation else 1.0)
+            capture = warp(scene.astype(np.float32), pose, fill=40.0).astype(np.uint8)
+            t0 = time.perf_counter()
+            found = template.register(capture, rotation)
+            times.append(time.perf_counter() - t0)
+            # Where the template's corners land in the capture, estimated vs true
+            cos, sin = _matrix(pose)
+            det = cos * cos + sin * sin
+            inverse = Registration(-(cos * pose.dx + sin * pose.dy) / det, -(cos * pose.dy - sin * pose.dx) / det,
+                                   -pose.angle, 1 / pose.scale)
+            true = to_capture(corners, inverse, (h, w))
+            estimated = to_capture(corners / scale, found, template.shape) * scale
+            errors.append(np.abs(true - estimated).max())
+        mode = 'translation + rotation/scale' if rotation else 'translation'
+        print(f"{mode:<29} register {np.median(times) * 1000:6.1f} ms/unit, "
+              f"corner error median {np.median(errors):.2f} px, max {np.max(errors):.2f} px")
+
+    capture = synthetic_unit(rng, defects=[(900, 500, 30, 250), (1400, 700, 25, 30)])
+    t0 = time.perf_counter()
+    result = template.inspect(capture)
+    elapsed = time.perf_counter() - t0
+    print(f"inspect {elapsed * 1000:.1f} ms:", [(d.type, d.box, round(d.confidence, 1)) for d in result.detections])
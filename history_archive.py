@@ -0,0 +1,370 @@
+"""
+Date-partitioned Parquet archive of the inspection history.
+
+The SQLite store is built for recording inspections one at a time; long-range
+analytics over months of history read this archive instead. Closed days
+(before today, local time) are compacted into column-compressed Parquet
+files, one partition per day:
+
+    history_archive/
+        inspections/date=2026-10-18/part-0.parquet
+        detections/date=2026-10-18/part-0.parquet
+        _manifest.json              rows compacted per day
+
+A query names the columns it needs and a date range, so only those column
+chunks of the matching partitions are read. A day is rewritten when the
+store holds more rows for it than were compacted (e.g. the ingest daemon
+backfilling old captures). Days not compacted yet, normally just today, are
+read from the store.
+
+Both the app and the ingest daemon compact: a compaction holds an exclusive
+lock on the archive's ``.lock`` file across processes, re-reads the manifest
+under it, and writes through per-process temporary files.
+
+Only days listed in the manifest are read from the archive; the manifest
+entry is saved right after each day's files, and a partition written without
+one (a crash in between) is ignored until it is rewritten.
+
+pyarrow is optional: without it nothing is compacted and ``summarize``
+reads everything from the store, with a warning logged once.
+
+Usage:
+    python history_archive.py --compact             # compact closed days now
+    python history_archive.py --bench --days 365    # 12-month trend query on synthetic data
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from frame_archive import file_lock
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+log = logging.getLogger('history_archive')
+
+DEFAULT_HISTORY_DIR = os.environ.get('INSPECTION_HISTORY_ARCHIVE', 'history_archive')
+TABLES = ('inspections', 'detections')
+
+
+_warned = False
+
+
+def available():
+    global _warned
+    if pa is None and not _warned:
+        _warned = True
+        log.warning("pyarrow is not installed: inspection history is not compacted and statistics are read "
+                    "from the store row by row (pip install pyarrow)")
+    return pa is not None
+
+
+def _schemas():
+    return {
+        'inspections': pa.schema([
+            ('id', pa.int64()),
+            ('unit_id', pa.string()),
+            ('ts', pa.float64()),
+            ('status', pa.dictionary(pa.int8(), pa.string())),
+            ('defect_count', pa.int32()),
+            ('duration', pa.float64()),
+            ('source', pa.dictionary(pa.int8(), pa.string())),
+        ]),
+        'detections': pa.schema([
+            ('id', pa.int64()),
+            ('inspection_id', pa.int64()),
+            ('unit_id', pa.string()),
+            ('ts', pa.float64()),
+            ('type', pa.dictionary(pa.int8(), pa.string())),
+            ('confidence', pa.float32()),
+            ('x', pa.int32()),
+            ('y', pa.int32()),
+            ('severity', pa.dictionary(pa.int8(), pa.string())),
+            ('status', pa.dictionary(pa.int8(), pa.string())),
+        ]),
+    }
+
+
+def _day_bounds(day):
+    start = datetime.combine(day, datetime.min.time())
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+
+class HistoryArchive:
+    def __init__(self, base=DEFAULT_HISTORY_DIR):
+        self.base = base
+        self._manifest_path = os.path.join(base, '_manifest.json')
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def manifest(self):
+        try:
+            with open(self._manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_manifest(self, manifest):
+        os.makedirs(self.base, exist_ok=True)
+        tmp = f"{self._manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._manifest_path)
+
+    def write_day(self, day, tables):
+        """Write one day's ``{table: {column: values}}`` as its partitions."""
+        schemas = _schemas()
+        for name, columns in tables.items():
+            table = pa.table({
+                field.name: pa.array(columns[field.name], type=field.type.value_type)
+                if pa.types.is_dictionary(field.type) else pa.array(columns[field.name], type=field.type)
+                for field in schemas[name]
+            })
+            table = table.cast(schemas[name])
+            directory = os.path.join(self.base, name, f'date={day.isoformat()}')
+            os.makedirs(directory, exist_ok=True)
+            # Hidden, so dataset scans skip it
+            tmp = os.path.join(directory, f'.part-0.parquet.{os.getpid()}.tmp')
+            pq.write_table(table, tmp, compression='zstd')
+            os.replace(tmp, os.path.join(directory, 'part-0.parquet'))
+
+    def compact(self, store, today=None):
+        """Write closed days whose store row counts differ from the manifest; returns the days written."""
+        today = today or date.today()
+        os.makedirs(self.base, exist_ok=True)
+        with self._lock, file_lock(os.path.join(self.base, '.lock')):
+            manifest = self.manifest()
+            inspection_counts = store.daily_counts('inspections')
+            detection_counts = store.daily_counts('detections')
+            written = []
+            for day_str in sorted(set(inspection_counts) | set(detection_counts)):
+                day = date.fromisoformat(day_str)
+                counts = [inspection_counts.get(day_str, 0), detection_counts.get(day_str, 0)]
+                if day >= today or manifest.get(day_str) == counts:
+                    continue
+                start, end = _day_bounds(day)
+                tables = {}
+                for name in TABLES:
+                    rows = getattr(store, f'{name}_since')(0, min_ts=start, max_ts=end)
+                    columns = _schemas()[name].names
+                    tables[name] = {c: [r[c] for r in rows] for c in columns}
+                self.write_day(day, tables)
+                manifest[day_str] = [len(tables['inspections']['id']), len(tables['detections']['id'])]
+                # Listed as soon as its files are in place, never before
+                self._save_manifest(manifest)
+                written.append(day_str)
+        return written
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def scan(self, table, columns, start=None, end=None, dates=None):
+        """
+        ``columns`` of ``table`` for partitions with ``start <= date <= end``
+        (and, with ``dates``, among those ISO dates) as a pyarrow Table
+        (``date`` is available as a column).
+        """
+        path = os.path.join(self.base, table)
+        if not os.path.isdir(path):
+            return None
+        dataset = ds.dataset(
+            path, format='parquet',
+            partitioning=ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive'),
+        )
+        condition = None
+        if start is not None:
+            condition = ds.field('date') >= start.isoformat()
+        if end is not None:
+            upper = ds.field('date') <= end.isoformat()
+            condition = upper if condition is None else condition & upper
+        if dates is not None:
+            listed = ds.field('date').isin(pa.array(sorted(dates), pa.string()))
+            condition = listed if condition is None else condition & listed
+        return dataset.to_table(columns=columns, filter=condition)
+
+    def clear(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+
+def _value_counts(column):
+    counts = pc.value_counts(column.cast(pa.string()).combine_chunks())
+    return Counter(dict(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist())))
+
+
+def summarize(start, end, store=None, archive=None):
+    """
+    Daily pass/fail trend plus defect type and severity counts for the days
+    ``start``..``end`` (inclusive). Compacted days come from the Parquet
+    archive, the rest from the store.
+    """
+    compacted = set()
+    daily = []
+    types, severities = Counter(), Counter()
+    confidence_sum, confidence_count = 0.0, 0
+
+    if archive is not None and available():
+        compacted = {d for d in archive.manifest() if start.isoformat() <= d <= end.isoformat()}
+        # Partitions missing from the manifest are read from the store instead
+        inspections = archive.scan('inspections', ['date', 'status'], start, end, compacted)
+        if inspections is not None and inspections.num_rows:
+            fails = pc.equal(inspections['status'].cast(pa.string()), 'FAIL')
+            grouped = pa.table({'date': inspections['date'], 'failed': pc.cast(fails, pa.int64())}) \
+                .group_by('date').aggregate([('failed', 'sum'), ('failed', 'count')])
+            daily.append(pd.DataFrame({
+                'date': grouped['date'].to_pylist(),
+                'failed': grouped['failed_sum'].to_numpy(),
+                'total': grouped['failed_count'].to_numpy(),
+            }))
+        detections = archive.scan('detections', ['type', 'severity', 'confidence'], start, end, compacted)
+        if detections is not None and detections.num_rows:
+            types += _value_counts(detections['type'])
+            severities += _value_counts(detections['severity'])
+            confidence_sum += pc.sum(detections['confidence']).as_py()
+            confidence_count += detections.num_rows
+
+    if store is not None:
+        day = start
+        while day <= end:
+            if day.isoformat() not in compacted:
+                lo, hi = _day_bounds(day)
+                statuses = [r['status'] for r in store.inspections_since(0, min_ts=lo, max_ts=hi)]
+                if statuses:
+                    failed = sum(s == 'FAIL' for s in statuses)
+                    daily.append(pd.DataFrame({'date': [day.isoformat()], 'failed': [failed], 'total': [len(statuses)]}))
+                for row in store.detections_since(0, min_ts=lo, max_ts=hi):
+                    types[row['type']] += 1
+                    severities[row['severity'] or 'Low'] += 1
+                    confidence_sum += row['confidence']
+                    confidence_count += 1
+            day += timedelta(days=1)
+
+    if daily:
+        trend = pd.concat(daily).groupby('date', as_index=False).sum().sort_values('date')
+    else:
+        trend = pd.DataFrame({'date': [], 'failed': [], 'total': []})
+    trend['passed'] = trend['total'] - trend['failed']
+    trend['date'] = pd.to_datetime(trend['date'])
+
+    return {
+        'daily': trend,
+        'inspections': int(trend['total'].sum()),
+        'failed': int(trend['failed'].sum()),
+        'defect_types': dict(types.most_common()),
+        'severities': dict(severities.most_common()),
+        'mean_confidence': confidence_sum / confidence_count if confidence_count else None,
+    }
+
+
+class Compactor:
+    """Background thread compacting closed days every ``interval`` seconds."""
+
+    def __init__(self, store, archive, interval=3600.0):
+        self.store = store
+        self.archive = archive
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='history-compactor', daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                written = self.archive.compact(self.store)
+                if written:
+                    log.info("Compacted %d day(s) of history: %s", len(written), ', '.join(written))
+            except Exception:
+                log.exception("History compaction failed")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+if __name__ == '__main__':
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description='Compact inspection history to Parquet / benchmark range scans')
+    parser.add_argument('--compact', action='store_true')
+    parser.add_argument('--bench', action='store_true')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--per-day', type=int, default=2000, help='synthetic inspections per day')
+    args = parser.parse_args()
+
+    if not available():
+        raise SystemExit("pyarrow is not installed: pip install pyarrow")
+
+    if args.compact:
+        from inspection_store import get_store
+        print("Compacted:", HistoryArchive().compact(get_store()) or "nothing new")
+
+    if args.bench:
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = HistoryArchive(tmp)
+            today = date.today()
+            next_id = 1
+            manifest = {}
+            t0 = time.perf_counter()
+            for offset in range(args.days, 0, -1):
+                day = today - timedelta(days=offset)
+                lo, _ = _day_bounds(day)
+                n = args.per_day
+                ids = np.arange(next_id, next_id + n)
+                next_id += n
+                failed = rng.random(n) < 0.03
+                ts = lo + np.sort(rng.uniform(0, 86400, n))
+                k = int(failed.sum()) * 2
+                manifest[day.isoformat()] = [n, k]
+                archive.write_day(day, {
+                    'inspections': {
+                        'id': ids, 'unit_id': [f'HAR-{day:%Y}-{i:06d}' for i in ids], 'ts': ts,
+                        'status': np.where(failed, 'FAIL', 'PASS'), 'defect_count': failed * 2,
+                        'duration': rng.uniform(0.05, 0.4, n), 'source': np.full(n, 'watch-folder'),
+                    },
+                    'detections': {
+                        'id': np.arange(k), 'inspection_id': np.repeat(ids[failed], 2),
+                        'unit_id': np.repeat([f'HAR-{day:%Y}-{i:06d}' for i in ids[failed]], 2),
+                        'ts': np.repeat(ts[failed], 2),
+                        'type': rng.choice(['Bent Fin', 'Blocked Section', 'Surface Contamination'], k),
+                        'confidence': rng.uniform(85, 99.5, k), 'x': rng.integers(0, 1920, k),
+                        'y': rng.integers(0, 1080, k), 'severity': rng.choice(['Low', 'Medium', 'High'], k),
+                        'status': np.full(k, 'Under Review'),
+                    },
+                })
+            archive._save_manifest(manifest)
+            size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(tmp) for f in fs)
+            print(f"wrote {args.days} days x {args.per_day} inspections in {time.perf_counter() - t0:.1f}s "
+                  f"({size / 2**20:.1f} MiB on disk)")
+
+            start = today - timedelta(days=args.days)
+            for label, fn in [
+                ('12-month daily trend (date, status)', lambda: archive.scan('inspections', ['date', 'status'], start, today)),
+                ('last 30 days of detections (type)', lambda: archive.scan('detections', ['type'], today - timedelta(days=30), today)),
+                ('summarize() over 12 months', lambda: summarize(start, today, archive=archive)),
+            ]:
+                fn()
+                t0 = time.perf_counter()
+                result = fn()
+                rows = result.num_rows if hasattr(result, 'num_rows') else len(result['daily'])
+                print(f"{label:<40}{(time.perf_counter() - t0) * 1000:8.1f} ms  {rows:>9,} rows")
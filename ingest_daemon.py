@@ -0,0 +1,343 @@
+"""
+Headless watch-folder ingestion daemon.
+
+Watches the directory the line cameras drop captures into and pushes each
+new image through the inspection pipeline:
+
+    watcher --> debounce --> bounded job queue --> N inspection workers
+                                                     |-> frame archive
+                                                     `-> inspection history
+
+Changes are picked up with inotify on Linux; on other platforms, or on
+network shares where remote writes raise no inotify events, the directory is
+polled. A file is only taken once its size and modification time have stayed
+unchanged for ``settle`` seconds, so half-written captures are never read.
+The job queue is bounded: during a burst, settled paths wait in the pending
+table (a few bytes each) and images are decoded only by a worker about to
+inspect them, so memory stays flat however many files arrive.
+
+Usage:
+    python ingest_daemon.py /mnt/line_captures --workers 4 --settle 1.0
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import re
+import select
+import shutil
+import struct
+import sys
+import threading
+import time
+
+import history_archive
+import metrics
+from detection import detect_defects
+from detector_backends import BACKENDS, detector, get_backend
+from frame_archive import ArchiveSet
+from frame_stream import IMAGE_EXTENSIONS
+from inspection_store import get_store
+
+log = logging.getLogger('ingest_daemon')
+
+UNIT_ID_PATTERN = re.compile(r'([A-Z]{3}-\d{4}-\d{4,})')
+
+FILES = metrics.REGISTRY.counter(
+    'inspection_daemon_files', 'Watch-folder files by outcome', labels=('outcome',))
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def parse_unit_id(filename):
+    """Unit ID such as ``HAR-2024-001234`` from a capture filename, else the file stem."""
+    match = UNIT_ID_PATTERN.search(os.path.basename(filename))
+    if match:
+        return match.group(1)
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+class Inotify:
+    """Minimal ctypes wrapper around Linux inotify for one directory."""
+
+    def __init__(self, path, mask=IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f'inotify_add_watch failed for {path}')
+
+    def read(self, timeout):
+        """Return ``(mask, name)`` events, waiting up to ``timeout`` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            events.append((mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class IngestDaemon:
+    def __init__(self, watch_dir, workers=2, settle=1.0, poll_interval=1.0,
+                 queue_size=None, done_action='move', use_inotify=True,
+                 store=None, archive=None, detector=detect_defects):
+        if done_action not in ('move', 'delete', 'keep'):
+            raise ValueError(f"Unknown done action: {done_action}")
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.workers = workers
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.done_action = done_action
+        self.use_inotify = use_inotify and sys.platform.startswith('linux')
+        self.store = store or get_store()
+        self.archive = archive if archive is not None else ArchiveSet()
+        self.detector = detector
+
+        self._jobs = queue.Queue(maxsize=queue_size or 2 * workers)
+        self._pending = {}        # path -> (size, mtime, last change)
+        self._queued = set()      # paths handed to workers, not yet finished
+        self._seen = set()        # paths already inspected (done_action='keep')
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    # ------------------------------------------------------------------
+    # Watching and debouncing
+    # ------------------------------------------------------------------
+    def _is_candidate(self, name):
+        return name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith('.')
+
+    def _touch(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._pending.pop(path, None)
+            return
+        previous = self._pending.get(path)
+        signature = (st.st_size, st.st_mtime_ns)
+        if previous is None or previous[:2] != signature:
+            self._pending[path] = signature + (time.monotonic(),)
+
+    def _scan(self):
+        with os.scandir(self.watch_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and self._is_candidate(entry.name):
+                    path = entry.path
+                    with self._lock:
+                        skip = path in self._queued or path in self._seen
+                    if not skip:
+                        self._touch(path)
+
+    def _dispatch_settled(self):
+        now = time.monotonic()
+        for path, (size, mtime_ns, changed) in list(self._pending.items()):
+            if now - changed < self.settle:
+                continue
+            # Re-check: the writer may have appended since the last event
+            self._touch(path)
+            if path not in self._pending or self._pending[path][2] != changed:
+                continue
+            if size == 0:
+                continue
+            del self._pending[path]
+            with self._lock:
+                self._queued.add(path)
+            # Blocks while the workers are saturated (backpressure)
+            while not self._stop.is_set():
+                try:
+                    self._jobs.put(path, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def _watch(self):
+        notifier = None
+        if self.use_inotify:
+            try:
+                notifier = Inotify(self.watch_dir)
+                log.info("Watching %s with inotify", self.watch_dir)
+            except (OSError, AttributeError) as exc:
+                log.warning("inotify unavailable (%s); polling every %.1fs", exc, self.poll_interval)
+        if notifier is None:
+            log.info("Polling %s every %.1fs", self.watch_dir, self.poll_interval)
+
+        self._scan()
+        try:
+            while not self._stop.is_set():
+                if notifier is not None:
+                    for mask, name in notifier.read(timeout=min(self.settle, self.poll_interval)):
+                        if mask & IN_Q_OVERFLOW:
+                            self._scan()
+                        elif self._is_candidate(name):
+                            self._touch(os.path.join(self.watch_dir, name))
+                    # Re-stat pending files so quiet ones can settle
+                    for path in list(self._pending):
+                        self._touch(path)
+                else:
+                    self._stop.wait(self.poll_interval)
+                    self._scan()
+                self._dispatch_settled()
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+    # ------------------------------------------------------------------
+    # Inspection workers
+    # ------------------------------------------------------------------
+    def _finish(self, path, outcome):
+        FILES.labels(outcome).inc()
+        if self.done_action == 'keep':
+            with self._lock:
+                self._seen.add(path)
+            return
+        if self.done_action == 'delete' and outcome == 'inspected':
+            os.remove(path)
+            return
+        target = os.path.join(self.watch_dir, 'processed' if outcome == 'inspected' else 'failed')
+        os.makedirs(target, exist_ok=True)
+        shutil.move(path, os.path.join(target, os.path.basename(path)))
+
+    def inspect_file(self, path):
+        """Decode, inspect, archive and record one capture."""
+        from normalized_image import NormalizedImage
+
+        started = time.perf_counter()
+        with metrics.INGEST_SECONDS.time():
+            frame = NormalizedImage.open(path, source=path).array
+        metrics.IMAGES_INGESTED.inc()
+
+        with metrics.DETECTION_SECONDS.time():
+            defects = self.detector(frame)
+        metrics.INSPECTIONS.labels('fail' if defects else 'pass').inc()
+        for defect_type, count in defects.type_counts().items():
+            metrics.DEFECTS_DETECTED.labels(defect_type).inc(count)
+
+        unit_id = parse_unit_id(path)
+        if unit_id not in self.archive:
+            self.archive.append(unit_id, frame)
+        self.store.record(
+            unit_id, defects,
+            ts=os.path.getmtime(path),
+            duration=time.perf_counter() - started,
+            source='watch-folder',
+        )
+        return unit_id, defects
+
+    def _work(self):
+        while True:
+            path = self._jobs.get()
+            if path is None:
+                break
+            try:
+                unit_id, defects = self.inspect_file(path)
+                log.info("%s %s (%d defects)", unit_id, 'FAIL' if defects else 'PASS', len(defects))
+                self._finish(path, 'inspected')
+            except Exception:
+                log.exception("Failed to inspect %s", path)
+                try:
+                    self._finish(path, 'failed')
+                except OSError:
+                    log.exception("Could not move %s aside", path)
+            finally:
+                with self._lock:
+                    self._queued.discard(path)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'inspect-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        watcher = threading.Thread(target=self._watch, name='watcher', daemon=True)
+        watcher.start()
+        self._watcher = watcher
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._watcher.join()
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def run_forever(self):
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect captures dropped into a watch folder')
+    parser.add_argument('watch_dir')
+    parser.add_argument('--workers', type=int, default=max((os.cpu_count() or 2) // 2, 1))
+    parser.add_argument('--settle', type=float, default=1.0,
+                        help='seconds a file must stay unchanged before it is read')
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--queue-size', type=int, default=None)
+    parser.add_argument('--done-action', default='move', choices=['move', 'delete', 'keep'])
+    parser.add_argument('--poll', action='store_true', help='force polling instead of inotify')
+    parser.add_argument('--backend', default='classical', choices=sorted(BACKENDS),
+                        help='detector backend; with numpy/onnx workers share one micro-batching queue, '
+                             'classical runs directly in each worker')
+    parser.add_argument('--batch-wait-ms', type=float, default=5.0,
+                        help='how long the first request waits for others to batch with (numpy/onnx)')
+    parser.add_argument('--compact-interval', type=float, default=3600.0,
+                        help='seconds between Parquet history compactions (0 disables)')
+    parser.add_argument('--metrics-port', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+    else:
+        metrics.start_exporters_from_env()
+
+    if args.compact_interval > 0 and history_archive.available():
+        history_archive.Compactor(get_store(), history_archive.HistoryArchive(), args.compact_interval).start()
+
+    IngestDaemon(
+        args.watch_dir,
+        workers=args.workers,
+        settle=args.settle,
+        poll_interval=args.poll_interval,
+        queue_size=args.queue_size,
+        done_action=args.done_action,
+        use_inotify=not args.poll,
+        detector=detector(get_backend(args.backend), max_wait_ms=args.batch_wait_ms).detect,
+    ).run_forever()
@@ -0,0 +1,115 @@
+import streamlit as st
+import plotly.graph_objects as go
+import plotly.express as px
+import pandas as pd
+from datetime import datetime
+from inspection_store import get_store
+from inspection_resources import get_kpi_cache
+
+# ============================================================================
+# DASHBOARD
+# ============================================================================
+st.markdown('<div class="main-header">Visual Inspection System</div>', unsafe_allow_html=True)
+st.subheader("Condenser Quality Control - Tata Motors Harrier/Safari Line")
+
+refresh_seconds = st.sidebar.select_slider(
+    "Dashboard Refresh",
+    options=[2, 5, 10, 30, 60],
+    value=5,
+    format_func=lambda s: f"every {s}s"
+)
+
+# Only the KPI tiles and the recent-inspections table rerun on the timer
+@st.fragment(run_every=refresh_seconds)
+def live_kpis():
+    kpis = get_kpi_cache().snapshot()
+    avg_time = kpis['avg_inspection_seconds']
+    tiles = [
+        (f"{kpis['inspected_this_hour']:,}", "Units This Hour"),
+        (f"{avg_time:.2f}s" if avg_time is not None else "—", "Avg. Inspection Time"),
+        (f"{kpis['inspected_today']:,}", "Units Inspected Today"),
+        (f"{kpis['rejection_rate']:.1%}", "Rejection Rate"),
+    ]
+    
+    # Key Metrics
+    for col, (value, label) in zip(st.columns(4), tiles):
+        with col:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>{value}</h3>
+                <p>{label}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Recent Inspections
+    st.subheader("Recent Inspections")
+    
+    # Inspection history shared by this app, stream ingestion and the watch-folder daemon
+    recent = get_store().recent(limit=10)
+    if recent:
+        df_recent = pd.DataFrame({
+            'Unit ID': [r['unit_id'] for r in recent],
+            'Timestamp': [datetime.fromtimestamp(r['ts']).strftime('%Y-%m-%d %H:%M:%S') for r in recent],
+            'Status': ['✅ PASS' if r['status'] == 'PASS' else '❌ FAIL' for r in recent],
+            'Defects Found': [r['defect_count'] for r in recent],
+            'Source': [r['source'] for r in recent]
+        })
+        st.dataframe(df_recent, use_container_width=True, hide_index=True)
+    else:
+        st.info("ℹ️ No inspections recorded yet. Run an inspection or start the watch-folder daemon.")
+
+live_kpis()
+
+kpis = get_kpi_cache().snapshot()
+
+# Defect Distribution Chart
+st.markdown("---")
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("Defect Type Distribution (Last 24h)")
+    if kpis['defects_24h']:
+        df_dist = pd.DataFrame({
+            'Defect Type': list(kpis['defects_24h']),
+            'Count': list(kpis['defects_24h'].values())
+        })
+        
+        fig = px.pie(
+            df_dist,
+            values='Count',
+            names='Defect Type',
+            title="Defect Distribution",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("ℹ️ No defects detected in the last 24 hours.")
+
+with col2:
+    st.subheader("Inspection Status Over Time")
+    time_data = pd.DataFrame(kpis['hourly'])
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=time_data['hour'],
+        y=time_data['passed'],
+        mode='lines+markers',
+        name='Passed',
+        line=dict(color='#2ca02c', width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=time_data['hour'],
+        y=time_data['failed'],
+        mode='lines+markers',
+        name='Failed',
+        line=dict(color='#d62728', width=3)
+    ))
+    fig.update_layout(
+        title="Inspection Status (24 Hours)",
+        xaxis_title="Hour",
+        yaxis_title="Count",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,126 @@
+import streamlit as st
+import pandas as pd
+from PIL import Image, ImageDraw
+import metrics
+
+# ============================================================================
+# DEFECT DETECTION
+# ============================================================================
+st.title("Defect Detection & Visualization")
+
+if st.session_state.current_image is None:
+    st.warning("⚠️ Please upload an image first in the 'Image Upload & Analysis' section.")
+    if st.button("Go to Image Upload"):
+        st.switch_page("inspection_pages/upload.py")
+else:
+    image = st.session_state.current_image
+    
+    # Defect detection results
+    if st.session_state.detected_defects:
+        st.subheader("🔴 Detected Defects")
+        
+        # Create annotated image
+        # Drawn on the preview level of the image's pyramid; boxes are in
+        # full-frame pixels, ``factor`` of them per preview pixel
+        with metrics.ANNOTATION_SECONDS.time():
+            preview, factor = image.preview()
+            annotated_image = Image.fromarray(preview)
+            draw = ImageDraw.Draw(annotated_image)
+            
+            for i, defect in enumerate(st.session_state.detected_defects):
+                x0, y0, x1, y1 = defect.box
+                if x1 == x0 and y1 == y0:
+                    # Point detections (no extent) get a fixed-size marker
+                    x0, y0, x1, y1 = x0 - 50, y0 - 50, x0 + 50, y0 + 50
+                x0, y0, x1, y1 = x0 // factor, y0 // factor, -(-x1 // factor), -(-y1 // factor)
+                # Draw bounding box
+                draw.rectangle([x0, y0, x1 - 1, y1 - 1], outline='red', width=3)
+                # Draw label
+                label = f"{defect.type}\n{defect.confidence:.1f}%"
+                draw.text((x0, y0 - 20), label, fill='red')
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Annotated Image")
+            st.image(annotated_image, use_container_width=True, caption="Defects Highlighted")
+        
+        with col2:
+            st.subheader("Defect Details")
+            
+            for i, defect in enumerate(st.session_state.detected_defects, 1):
+                with st.expander(f"Defect #{i}: {defect.type}", expanded=True):
+                    col_a, col_b = st.columns(2)
+                    with col_a:
+                        st.metric("Confidence", f"{defect.confidence:.1f}%")
+                        st.metric("Severity", defect.severity)
+                    with col_b:
+                        st.metric("Location", f"({defect.x}, {defect.y})")
+                        st.metric("Size", f"{defect.w} × {defect.h} px")
+                    
+                    # Defect type information
+                    defect_info = {
+                        'Bent Fin': 'Fin deformation detected. May affect airflow and cooling efficiency.',
+                        'Surface Contamination': 'Foreign particles or residue detected on surface.',
+                        'Blocked Section': 'Obstruction detected in condenser channels.',
+                        'UV Leak': 'UV-visible dye indicates potential refrigerant leak.',
+                        'Thermal Anomaly': 'Temperature variation detected beyond normal range.',
+                        'Structural Deformity': 'Geometric deviation from specification detected.'
+                    }
+                    
+                    st.info(defect_info.get(defect.type, 'Defect information not available.'))
+        
+        # Inspection result
+        st.markdown("---")
+        if len(st.session_state.detected_defects) > 0:
+            st.markdown('<div class="defect-box">', unsafe_allow_html=True)
+            st.markdown("### ❌ INSPECTION FAILED")
+            st.write(f"**Defects Found:** {len(st.session_state.detected_defects)}")
+            st.write("**Action Required:** Unit requires review and potential rework.")
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="pass-box">', unsafe_allow_html=True)
+            st.markdown("### ✅ INSPECTION PASSED")
+            st.write("No defects detected. Unit meets quality standards.")
+            st.markdown('</div>', unsafe_allow_html=True)
+    
+    else:
+        st.info("ℹ️ No defects detected yet. Run inspection analysis to detect defects.")
+        
+        # Show original image
+        st.subheader("Original Image")
+        st.image(image.preview()[0], use_container_width=True)
+        
+        if st.button("🔍 Run Defect Detection", type="primary"):
+            st.info("Please run inspection from the 'Image Upload & Analysis' section first.")
+    
+    # Defect classification reference
+    st.markdown("---")
+    st.subheader("Defect Classification Reference")
+    
+    defect_types = pd.DataFrame({
+        'Defect Type': [
+            'Bent Fin',
+            'Blocked Section',
+            'UV Leak',
+            'Thermal Anomaly',
+            'Surface Contamination',
+            'Structural Deformity',
+            'Mounting Misalignment',
+            'Pressure Drop'
+        ],
+        'Severity': ['High', 'High', 'Critical', 'Medium', 'Low', 'High', 'High', 'Critical'],
+        'Detection Method': [
+            'RGB Camera',
+            'Structured Light',
+            'UV Camera',
+            'Thermal IR',
+            'RGB Camera',
+            'RGB + Structured Light',
+            'Structured Light',
+            'Pressure/Temp Sensor'
+        ],
+        'Typical Confidence': ['99.2%', '97.8%', '98.5%', '96.5%', '95.2%', '98.9%', '99.1%', '97.5%']
+    })
+    
+    st.dataframe(defect_types, use_container_width=True, hide_index=True)
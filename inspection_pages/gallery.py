@@ -0,0 +1,102 @@
+import streamlit as st
+from PIL import Image
+from datetime import date, datetime, timedelta
+from detection_records import SEVERITIES
+from inspection_store import REVIEW_STATUSES
+from inspection_resources import get_defect_index, get_frame_archive
+
+# ============================================================================
+# DEFECT GALLERY
+# ============================================================================
+st.title("Defect Gallery")
+st.write("Browse examples of different defect types detected in condenser inspections.")
+
+index = get_defect_index()
+# Only detections recorded since the last visit are read from the store
+index.refresh()
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    defect_types = sorted(set(index.vocab['type'].names) | {
+        'Bent Fin', 'Blocked Section', 'UV Leak', 'Thermal Anomaly',
+        'Surface Contamination', 'Structural Deformity', 'Mounting Misalignment'})
+    defect_categories = st.multiselect(
+        "Filter by Defect Type:",
+        options=defect_types,
+        default=[t for t in defect_types if t in index.vocab['type'].names] or defect_types[:3]
+    )
+    unit_filter = st.text_input("Unit ID contains:")
+with col2:
+    severities = st.multiselect("Severity:", options=SEVERITIES, default=SEVERITIES)
+    statuses = st.multiselect("Review Status:", options=REVIEW_STATUSES, default=REVIEW_STATUSES)
+with col3:
+    today = date.today()
+    date_range = st.date_input("Date Range:", value=(today - timedelta(days=30), today))
+    max_cards = st.slider("Defects Shown", min_value=3, max_value=60, value=12, step=3)
+
+start = end = None
+if date_range:
+    start = datetime.combine(date_range[0], datetime.min.time()).timestamp()
+    end = datetime.combine(date_range[-1] + timedelta(days=1), datetime.min.time()).timestamp()
+
+rows = index.query(
+    types=defect_categories,
+    severities=severities,
+    statuses=statuses,
+    unit=unit_filter or None,
+    start=start,
+    end=end
+)
+
+def update_status(detection_id):
+    index.set_status([detection_id], st.session_state[f"status_{detection_id}"])
+
+if len(rows):
+    # Most recent first
+    gallery_data = index.records(rows[::-1][:max_cards])
+    archive = get_frame_archive()
+    
+    # Display gallery
+    cols_per_row = 3
+    for idx in range(0, len(gallery_data), cols_per_row):
+        cols = st.columns(cols_per_row)
+        for col_idx, col in enumerate(cols):
+            if idx + col_idx < len(gallery_data):
+                defect = gallery_data[idx + col_idx]
+                with col:
+                    if defect['unit'] in archive:
+                        # Zero-copy view into the archived raw frame
+                        img = archive.crop_around(defect['unit'], (defect['x'], defect['y']), size=(300, 200))
+                    else:
+                        # Create placeholder image
+                        img = Image.new('RGB', (300, 200), color='lightgray')
+                    st.image(img, use_container_width=True)
+                    
+                    st.write(f"**{defect['type']}**")
+                    st.write(f"Unit: {defect['unit']}")
+                    st.write(f"Severity: {defect['severity']}")
+                    st.write(f"Confidence: {defect['confidence']:.1f}%")
+                    st.selectbox(
+                        "Status",
+                        options=REVIEW_STATUSES,
+                        index=REVIEW_STATUSES.index(defect['status']),
+                        key=f"status_{defect['detection_id']}",
+                        on_change=update_status,
+                        args=(defect['detection_id'],)
+                    )
+                    st.write(f"Date: {datetime.fromtimestamp(defect['ts']):%Y-%m-%d %H:%M}")
+    
+    # Statistics
+    st.markdown("---")
+    st.subheader("Gallery Statistics")
+    
+    by_severity = index.counts('severity', rows)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Defects", f"{len(rows):,}")
+    with col2:
+        st.metric("Avg. Confidence", f"{index.column('confidence')[rows].mean():.1f}%")
+    with col3:
+        st.metric("Critical Defects", f"{by_severity.get('Critical', 0):,}")
+else:
+    st.info("ℹ️ No recorded defects match these filters. Run inspections to populate the gallery.")
@@ -0,0 +1,122 @@
+import streamlit as st
+import plotly.graph_objects as go
+import plotly.express as px
+import pandas as pd
+from datetime import datetime
+from history_archive import summarize
+from inspection_resources import get_history_archive
+from inspection_store import get_store
+
+# ============================================================================
+# INSPECTION STATISTICS
+# ============================================================================
+st.title("Inspection Statistics & Analytics")
+
+# Time range selector
+col1, col2 = st.columns(2)
+with col1:
+    date_from = st.date_input("From Date", value=datetime.now() - pd.Timedelta(days=30))
+with col2:
+    date_to = st.date_input("To Date", value=datetime.now())
+
+# Closed days come from the Parquet history archive, today from the store
+summary = summarize(date_from, date_to, get_store(), get_history_archive())
+days = (date_to - date_from).days + 1
+total_inspections = summary['inspections']
+total_failed = summary['failed']
+total_passed = total_inspections - total_failed
+
+# Key metrics
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Total Inspections", f"{total_inspections:,}")
+with col2:
+    st.metric("Pass Rate", f"{(total_passed/total_inspections)*100:.2f}%" if total_inspections else "—")
+with col3:
+    st.metric("Failed Inspections", f"{total_failed:,}")
+with col4:
+    st.metric("Avg. Daily Volume", f"{total_inspections//days:,}")
+
+st.markdown("---")
+
+# Charts
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("Defect Frequency by Type")
+    defect_freq = pd.DataFrame({
+        'Defect Type': list(summary['defect_types']),
+        'Count': list(summary['defect_types'].values())
+    })
+    
+    fig = px.bar(
+        defect_freq,
+        x='Defect Type',
+        y='Count',
+        color='Count',
+        color_continuous_scale='Reds',
+        title="Defect Frequency"
+    )
+    fig.update_xaxes(tickangle=-45)
+    st.plotly_chart(fig, use_container_width=True)
+
+with col2:
+    st.subheader("Inspection Trend")
+    trend_data = summary['daily'].set_index('date').reindex(
+        pd.date_range(date_from, date_to, freq='D'), fill_value=0)
+    trend_data = pd.DataFrame({
+        'Date': trend_data.index,
+        'Passed': trend_data['passed'].to_numpy(),
+        'Failed': trend_data['failed'].to_numpy()
+    })
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=trend_data['Date'],
+        y=trend_data['Passed'],
+        mode='lines+markers',
+        name='Passed',
+        line=dict(color='#2ca02c', width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=trend_data['Date'],
+        y=trend_data['Failed'],
+        mode='lines+markers',
+        name='Failed',
+        line=dict(color='#d62728', width=2)
+    ))
+    fig.update_layout(
+        title="Daily Inspection Results",
+        xaxis_title="Date",
+        yaxis_title="Count",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+# Defect severity distribution
+st.markdown("---")
+st.subheader("Defect Severity Distribution")
+
+severity_counts = [summary['severities'].get(s, 0) for s in ['Low', 'Medium', 'High', 'Critical']]
+severity_data = pd.DataFrame({
+    'Severity': ['Low', 'Medium', 'High', 'Critical'],
+    'Count': severity_counts,
+    'Percentage': [round(100 * c / max(sum(severity_counts), 1), 1) for c in severity_counts]
+})
+
+fig = px.bar(
+    severity_data,
+    x='Severity',
+    y='Count',
+    text='Percentage',
+    color='Severity',
+    color_discrete_map={
+        'Low': '#90EE90',
+        'Medium': '#FFD700',
+        'High': '#FF8C00',
+        'Critical': '#FF4500'
+    },
+    title="Defect Severity Distribution"
+)
+fig.update_traces(texttemplate='%{text}%', textposition='outside')
+st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,150 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from PIL import Image
+import io
+import zipfile
+from datetime import datetime
+import json
+import metrics
+from detection_records import DetectionBatch
+from history_archive import summarize
+from inspection_resources import get_frame_archive, get_history_archive
+from inspection_store import get_store
+
+# ============================================================================
+# INSPECTION REPORTS
+# ============================================================================
+st.title("Inspection Reports")
+
+# Report generation options
+col1, col2 = st.columns(2)
+
+with col1:
+    report_type = st.selectbox(
+        "Report Type",
+        options=['Daily Summary', 'Defect Analysis', 'Quality Metrics', 'Custom Report']
+    )
+    
+    date_range = st.date_input(
+        "Date Range",
+        value=(datetime.now() - pd.Timedelta(days=7), datetime.now())
+    )
+
+with col2:
+    include_images = st.checkbox("Include Sample Images", value=True)
+    include_charts = st.checkbox("Include Charts", value=True)
+    export_format = st.selectbox(
+        "Export Format",
+        options=['PDF', 'Excel', 'CSV', 'JSON']
+    )
+
+if st.button("📄 Generate Report", type="primary"):
+    with st.spinner("Generating report..."), metrics.EXPORT_SECONDS.time():
+        # While only the first day of the range is picked, report that day
+        dates = date_range if isinstance(date_range, tuple) else (date_range,)
+        summary = summarize(dates[0], dates[-1], get_store(), get_history_archive())
+        total = summary['inspections']
+        failed = summary['failed']
+        
+        st.success("Report generated successfully!")
+        
+        st.markdown("---")
+        st.subheader("Report Preview")
+        
+        report_data = {
+            'Metric': [
+                'Total Inspections',
+                'Passed',
+                'Failed',
+                'Pass Rate',
+                'Avg. Confidence',
+                'Most Common Defect',
+                'Critical Defects'
+            ],
+            'Value': [
+                f"{total:,}",
+                f"{total - failed:,}",
+                f"{failed:,}",
+                f"{(total - failed) / total * 100:.1f}%" if total else '—',
+                f"{summary['mean_confidence']:.1f}%" if summary['mean_confidence'] is not None else '—',
+                next(iter(summary['defect_types']), '—'),
+                f"{summary['severities'].get('Critical', 0):,}"
+            ]
+        }
+        
+        st.dataframe(pd.DataFrame(report_data), use_container_width=True, hide_index=True)
+        
+        # Detections from this session's inspections, straight from their batches
+        history = st.session_state.inspection_history
+        if export_format == 'CSV':
+            batches = [record['defects'] for record in history]
+            per_unit = [len(b) for b in batches]
+            all_defects = DetectionBatch.concatenate(batches)
+            report_file = pd.DataFrame({
+                'unit_id': np.repeat([record['unit_id'] for record in history], per_unit),
+                'timestamp': np.repeat([record['timestamp'].isoformat() for record in history], per_unit),
+                'type': all_defects.type_names(),
+                'confidence': all_defects.array['confidence'].round(2),
+                'x': all_defects.array['x'],
+                'y': all_defects.array['y'],
+                'w': all_defects.array['w'],
+                'h': all_defects.array['h'],
+                'severity': all_defects.severity_names()
+            }).to_csv(index=False)
+        elif export_format == 'JSON':
+            report_file = json.dumps([
+                {
+                    'unit_id': record['unit_id'],
+                    'timestamp': record['timestamp'].isoformat(),
+                    'status': record['status'],
+                    'defects': record['defects'].to_records()
+                }
+                for record in history
+            ], indent=2)
+        else:
+            # PDF and Excel rendering not implemented yet
+            report_file = "Sample report data"
+        
+        metrics.REPORTS_EXPORTED.labels(export_format).inc()
+        st.download_button(
+            label=f"📥 Download Report ({export_format})",
+            data=report_file,
+            file_name=f"inspection_report_{datetime.now().strftime('%Y%m%d')}.{export_format.lower()}",
+            mime="application/octet-stream"
+        )
+        
+        # Defect crops sliced straight from the archived raw frames
+        archive = get_frame_archive()
+        archived = [
+            (record, defect)
+            for record in st.session_state.inspection_history
+            for defect in record['defects']
+            if record['unit_id'] in archive
+        ]
+        if include_images and archived:
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, 'w') as zf:
+                for i, (record, defect) in enumerate(archived, 1):
+                    crop = archive.crop_around(record['unit_id'], defect.location, size=(300, 200))
+                    png_buffer = io.BytesIO()
+                    Image.fromarray(crop).save(png_buffer, format='PNG')
+                    zf.writestr(f"{record['unit_id']}_{i:03d}_{defect.type.replace(' ', '_')}.png", png_buffer.getvalue())
+            st.download_button(
+                label=f"📥 Download Defect Crops ({len(archived)} images)",
+                data=zip_buffer.getvalue(),
+                file_name=f"defect_crops_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip"
+            )
+
+st.markdown("---")
+st.subheader("Report History")
+
+report_history = pd.DataFrame({
+    'Report ID': ['RPT-001', 'RPT-002', 'RPT-003'],
+    'Type': ['Daily Summary', 'Defect Analysis', 'Quality Metrics'],
+    'Date': ['2024-01-15', '2024-01-14', '2024-01-13'],
+    'Status': ['Generated', 'Generated', 'Generated']
+})
+
+st.dataframe(report_history, use_container_width=True, hide_index=True)
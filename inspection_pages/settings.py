@@ -0,0 +1,141 @@
+import streamlit as st
+import pandas as pd
+from appearance_model import MIN_UNITS, AppearanceModel
+from detector_backends import available_backends
+from golden_template import GoldenTemplate, available_variants
+from inspection_resources import get_appearance_model, get_detector, get_golden_template
+from normalized_image import NormalizedImage
+
+# ============================================================================
+# SETTINGS & CONFIGURATION
+# ============================================================================
+st.title("Settings & Configuration")
+
+st.subheader("Detection Parameters")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("**Confidence Thresholds**")
+    min_confidence = st.slider(
+        "Minimum Confidence (%)",
+        min_value=70,
+        max_value=99,
+        value=85,
+        help="Minimum confidence level for defect detection"
+    )
+    
+    critical_threshold = st.slider(
+        "Critical Defect Threshold (%)",
+        min_value=90,
+        max_value=99,
+        value=95,
+        help="Confidence threshold for critical defects"
+    )
+
+with col2:
+    st.write("**Image Processing**")
+    image_resolution = st.selectbox(
+        "Processing Resolution",
+        options=['Original', '1920x1080', '1280x720', '640x480'],
+        index=0
+    )
+    
+    enable_enhancement = st.checkbox("Enable Auto-Enhancement", value=True)
+    
+    noise_reduction = st.checkbox("Enable Noise Reduction", value=True)
+
+st.markdown("---")
+st.subheader("Detection Engine")
+
+backends = available_backends()
+col1, col2 = st.columns(2)
+with col1:
+    st.session_state.detector_backend = st.selectbox(
+        "Detector Backend",
+        options=backends,
+        index=backends.index(st.session_state.detector_backend) if st.session_state.detector_backend in backends else 0,
+        format_func=lambda b: {'classical': 'Classical CV (NumPy)', 'numpy': 'NumPy Model', 'onnx': 'ONNX Runtime (CPU)'}.get(b, b),
+        help="NumPy Model needs INSPECTION_NUMPY_MODEL and ONNX Runtime needs INSPECTION_ONNX_MODEL to point at a model file"
+    )
+with col2:
+    detector = get_detector(st.session_state.detector_backend)
+    if hasattr(detector, 'stats'):
+        batch_stats = detector.stats()
+        st.metric("Queued Requests", batch_stats['queue_depth'])
+        st.metric("Mean Batch Size", f"{batch_stats['mean_batch_size']:.1f}",
+                  delta=f"{batch_stats['mean_wait_ms']:.1f} ms added wait", delta_color="off")
+    else:
+        st.caption("This backend is not micro-batched: each session runs it directly, in parallel.")
+
+st.markdown("---")
+st.subheader("Golden Templates")
+
+col1, col2 = st.columns(2)
+with col1:
+    variant = st.text_input("Variant", value="Harrier", help="One template per condenser variant")
+    good_files = st.file_uploader(
+        "Known-good captures",
+        type=['png', 'jpg', 'jpeg', 'bmp', 'tiff'],
+        accept_multiple_files=True,
+        help="Captures of good units of this variant; without any, the current image is used"
+    )
+    if st.button("⭐ Save Golden Template", use_container_width=True):
+        if good_files:
+            frames = [NormalizedImage.open(f).array for f in good_files]
+        elif st.session_state.current_image is not None:
+            frames = [st.session_state.current_image.array]
+        else:
+            frames = []
+        if not variant or not frames:
+            st.warning("Enter a variant and upload known-good captures (or load an image first).")
+        else:
+            with st.spinner("Registering captures..."):
+                template = GoldenTemplate.fit(frames, variant=variant)
+                template.save()
+                # Passed units learned so far were aligned to the old template
+                AppearanceModel(template.shape, variant).save()
+            get_golden_template.clear()
+            get_appearance_model.clear()
+            st.success(f"Golden template for {variant} saved from {len(frames)} capture(s).")
+with col2:
+    variants = available_variants()
+    st.metric("Stored Templates", len(variants))
+    if variants:
+        st.write(", ".join(variants))
+        st.write("**Appearance Models**")
+        learned = {v: get_appearance_model(v).count for v in variants}
+        st.dataframe(pd.DataFrame({
+            'Variant': list(learned),
+            'Passed Units': list(learned.values()),
+            'Scoring': ['Yes' if n >= MIN_UNITS else f'after {MIN_UNITS - n} more' for n in learned.values()],
+        }), use_container_width=True, hide_index=True)
+
+st.markdown("---")
+st.subheader("Defect Type Configuration")
+
+defect_config = pd.DataFrame({
+    'Defect Type': ['Bent Fin', 'Blocked Section', 'UV Leak', 'Thermal Anomaly'],
+    'Enabled': [True, True, True, True],
+    'Min Confidence': [85, 80, 90, 75],
+    'Severity': ['High', 'High', 'Critical', 'Medium']
+})
+
+edited_config = st.data_editor(
+    defect_config,
+    use_container_width=True,
+    num_rows="dynamic"
+)
+
+st.markdown("---")
+st.subheader("System Information")
+
+sys_info = {
+    'Component': ['AI Model Version', 'Detection Engine', 'Image Processor', 'Last Update'],
+    'Value': ['v2.1.3', st.session_state.detector_backend, 'OpenCV 4.8', '2024-01-15']
+}
+
+st.dataframe(pd.DataFrame(sys_info), use_container_width=True, hide_index=True)
+
+if st.button("💾 Save Configuration", type="primary"):
+    st.success("Configuration saved successfully!")
@@ -0,0 +1,82 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from inspection_store import get_store
+from inspection_resources import get_detector, get_frame_archive
+
+# ============================================================================
+# STREAM INGESTION
+# ============================================================================
+st.title("Stream Ingestion")
+
+st.write("""
+Inspect units straight from a camera feed. Frames pass through a bounded buffer; detection runs only when a
+unit has settled in position, and frames are skipped (live feeds) or the reader is throttled (files) when
+inspection falls behind.
+""")
+
+from frame_stream import StreamIngest, directory_frames, simulated_camera, video_frames
+
+col1, col2 = st.columns(2)
+with col1:
+    source_type = st.selectbox("Frame Source", options=['Simulated Camera', 'Image Directory', 'Video File'])
+    source_path = ""
+    if source_type != 'Simulated Camera':
+        source_path = st.text_input("Path on this PC")
+    stream_fps = st.slider("Camera Frame Rate (fps)", 5, 60, 30)
+with col2:
+    stream_seconds = st.slider("Run For (seconds)", 5, 120, 15)
+    buffer_size = st.slider("Frame Buffer Size", 1, 64, 8)
+    default_policy = 0 if source_type == 'Simulated Camera' else 1
+    policy = st.radio(
+        "When Inspection Falls Behind",
+        options=['drop_oldest', 'block'],
+        index=default_policy,
+        format_func=lambda p: {'drop_oldest': 'Skip frames (live)', 'block': 'Throttle reader (files)'}[p]
+    )
+
+if st.button("▶️ Start Stream", type="primary"):
+    if source_type == 'Simulated Camera':
+        source = simulated_camera(fps=stream_fps)
+    elif source_type == 'Image Directory':
+        source = directory_frames(source_path, fps=stream_fps)
+    else:
+        source = video_frames(source_path, fps=stream_fps)
+    
+    ingest = StreamIngest(source, buffer_size=buffer_size, policy=policy,
+                          detector=get_detector(st.session_state.detector_backend).detect)
+    status = st.empty()
+    archive = get_frame_archive()
+    results = []
+    for result in ingest.results(max_seconds=stream_seconds):
+        unit_id = f"HAR-{datetime.now():%Y}-S{int(result.captured_at) % 1000000:06d}-{result.unit_number:03d}"
+        if unit_id not in archive:
+            archive.append(unit_id, result.frame)
+        st.session_state.inspection_history.append({
+            'unit_id': unit_id,
+            'timestamp': datetime.fromtimestamp(result.captured_at),
+            'status': 'FAIL' if result.defects else 'PASS',
+            'defects': result.defects
+        })
+        get_store().record(unit_id, result.defects, ts=result.captured_at, source='stream')
+        results.append({
+            'Unit ID': unit_id,
+            'Status': '❌ FAIL' if result.defects else '✅ PASS',
+            'Defects Found': len(result.defects)
+        })
+        stats = ingest.stats
+        status.info(f"Units inspected: {stats.inspections} | {stats.input_fps:.1f} fps in | dropped {stats.dropped}")
+    
+    stats = ingest.stats
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Frames Received", f"{stats.received:,}")
+    with col2:
+        st.metric("Processed FPS", f"{stats.processed_fps:.1f}")
+    with col3:
+        st.metric("Dropped Frames", f"{stats.dropped:,}", delta=f"{stats.drop_rate:.1%}", delta_color="inverse")
+    with col4:
+        st.metric("Units Inspected", stats.inspections)
+    
+    if results:
+        st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
@@ -0,0 +1,179 @@
+import streamlit as st
+from PIL import Image, ImageDraw
+import time
+from datetime import datetime
+import metrics
+from detection_records import DetectionBatch
+from golden_template import available_variants
+from inspection_store import get_store
+from inspection_resources import (get_appearance_model, get_detector, get_frame_archive, get_golden_template,
+                                  get_parallel_tiler)
+from normalized_image import NormalizedImage
+from parallel_tiling import TILED_BACKENDS
+
+# ============================================================================
+# IMAGE UPLOAD & ANALYSIS
+# ============================================================================
+st.title("Image Upload & Analysis")
+
+st.write("Upload condenser images for visual inspection and defect detection.")
+
+# Image upload
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    uploaded_file = st.file_uploader(
+        "Choose an image file",
+        type=['png', 'jpg', 'jpeg', 'bmp', 'tiff'],
+        help="Upload a condenser image for inspection"
+    )
+
+with col2:
+    st.subheader("Quick Actions")
+    if st.button("📷 Use Sample Image", use_container_width=True):
+        # Create a sample image
+        sample_img = Image.new('RGB', (800, 600), color='lightblue')
+        draw = ImageDraw.Draw(sample_img)
+        # Draw a simple condenser representation
+        for i in range(20):
+            draw.rectangle([10 + i*40, 100, 30 + i*40, 500], fill='silver', outline='gray')
+        st.session_state.current_image = NormalizedImage.from_pil(sample_img, source='sample')
+        uploaded_file = None
+    
+    if st.button("🔄 Clear Current Image", use_container_width=True):
+        st.session_state.current_image = None
+        st.session_state.detected_defects = DetectionBatch()
+        st.rerun()
+    
+    archive = get_frame_archive()
+    if len(archive) > 0:
+        archived_unit = st.selectbox("Re-inspect Archived Unit", options=sorted(archive.unit_ids(), reverse=True))
+        if st.button("📂 Load Archived Frame", use_container_width=True):
+            st.session_state.current_image = NormalizedImage(archive.frame(archived_unit), source=archived_unit)
+            st.session_state.unit_id = archived_unit
+            st.session_state.detected_defects = DetectionBatch()
+            uploaded_file = None
+
+# Display uploaded image, decoded once: reruns reuse it while the same upload is selected
+upload_id = uploaded_file.file_id if uploaded_file is not None else None
+current = st.session_state.current_image
+if uploaded_file is not None and (current is None or current.source != upload_id):
+    with metrics.INGEST_SECONDS.time():
+        image = NormalizedImage.open(uploaded_file, source=upload_id)
+    metrics.IMAGES_INGESTED.inc()
+    st.session_state.current_image = image
+elif st.session_state.current_image is not None:
+    image = st.session_state.current_image
+else:
+    image = None
+
+if image is not None:
+    st.markdown("---")
+    
+    # Image information
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Image Size", f"{image.size[0]} × {image.size[1]}")
+    with col2:
+        st.metric("Format", image.format or "Unknown")
+    with col3:
+        st.metric("Mode", image.mode if image.bit_depth == 8 else f"{image.mode} ({image.bit_depth}-bit)")
+    with col4:
+        file_size = len(uploaded_file.getvalue()) if uploaded_file else 0
+        st.metric("File Size", f"{file_size / 1024:.1f} KB" if file_size > 0 else "N/A")
+    
+    st.markdown("---")
+    
+    # Image display with analysis options
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.subheader("Image Preview")
+        st.image(image.preview()[0], use_container_width=True, caption="Uploaded Condenser Image")
+    
+    with col2:
+        st.subheader("Analysis Options")
+        
+        analysis_mode = st.radio(
+            "Select Analysis Mode:",
+            ["Full Inspection", "Quick Scan", "Defect-Specific", "Custom Region"]
+        )
+        
+        tileable = st.session_state.detector_backend in TILED_BACKENDS
+        parallel_tiling = st.checkbox(
+            "⚡ Parallel Tiling (all CPU cores)",
+            value=False,
+            disabled=not tileable,
+            help="Split large images into overlapping tiles processed by worker processes over shared memory"
+                 + ("" if tileable else f" (not available for the {st.session_state.detector_backend} backend)")
+        ) and tileable
+        
+        template_variant = st.selectbox(
+            "🎯 Golden Template",
+            options=['None'] + available_variants(),
+            help="Also register the image to the variant's known-good template and report differences (templates are saved under Settings)"
+        )
+        template_rotation = template_variant != 'None' and st.checkbox(
+            "Allow rotation/scale",
+            value=False,
+            help="Also recover rotation and scale against the template, not only the shift"
+        )
+        learn_appearance = template_variant != 'None' and st.checkbox(
+            "📈 Learn from passed units",
+            value=True,
+            help="Add units that pass to the variant's appearance model, which scores new units once it has seen enough"
+        )
+        
+        unit_id = st.text_input(
+            "Unit ID",
+            value=st.session_state.get('unit_id') or f"HAR-{datetime.now():%Y}-{len(st.session_state.inspection_history) + 1:06d}"
+        )
+        
+        if st.button("🔍 Run Inspection", type="primary", use_container_width=True):
+            frame = image.array
+            inspection_start = time.perf_counter()
+            with st.spinner("Analyzing image..."), metrics.DETECTION_SECONDS.time():
+                if parallel_tiling:
+                    defects = get_parallel_tiler().detect(frame, st.session_state.detector_backend)
+                else:
+                    defects = get_detector(st.session_state.detector_backend).detect(frame)
+                if template_variant != 'None':
+                    template = get_golden_template(template_variant)
+                    result = template.inspect(image.gray, rotation=template_rotation)
+                    appearance = get_appearance_model(template_variant)
+                    learned = appearance.detect(template, result.registration, result.aligned, frame.shape)
+                    defects = DetectionBatch.concatenate([defects, result.detections, learned]).sorted()
+                    if learn_appearance and not defects:
+                        appearance.update(result.aligned)
+                        appearance.save_if_due()
+                st.session_state.detected_defects = defects
+            
+            # Keep the raw frame so defects can be reviewed later without re-decoding
+            archive = get_frame_archive()
+            if unit_id not in archive:
+                archive.append(unit_id, frame)
+            st.session_state.inspection_history.append({
+                'unit_id': unit_id,
+                'timestamp': datetime.now(),
+                'status': 'FAIL' if defects else 'PASS',
+                'defects': defects
+            })
+            get_store().record(unit_id, defects, duration=time.perf_counter() - inspection_start, source='upload')
+            st.session_state.unit_id = None
+            
+            metrics.INSPECTIONS.labels('fail' if defects else 'pass').inc()
+            for defect_type, count in defects.type_counts().items():
+                metrics.DEFECTS_DETECTED.labels(defect_type).inc(count)
+            st.success(f"Analysis complete! Found {len(defects)} potential defect(s).")
+            st.rerun()
+        
+        # Image enhancement options
+        st.markdown("---")
+        st.subheader("Image Enhancement")
+        
+        enhance_brightness = st.slider("Brightness", 0.5, 2.0, 1.0, 0.1)
+        enhance_contrast = st.slider("Contrast", 0.5, 2.0, 1.0, 0.1)
+        
+        if st.button("Apply Enhancements", use_container_width=True):
+            st.session_state.current_image = image.enhanced(enhance_brightness, enhance_contrast)
+            st.rerun()
@@ -0,0 +1,70 @@
+"""
+Process-wide resources shared by the Visual Inspection pages.
+
+Each resource is created on first use and its module imported only then,
+so pages that do not need the archive, the detector or the worker pool
+never pay for loading them.
+"""
+
+import streamlit as st
+
+
+@st.cache_resource
+def get_frame_archive():
+    from frame_archive import ArchiveSet
+    return ArchiveSet()
+
+
+@st.cache_resource
+def get_parallel_tiler():
+    from parallel_tiling import ParallelTiler
+    return ParallelTiler()
+
+
+@st.cache_resource
+def get_kpi_cache():
+    from inspection_store import get_store
+    from kpi_cache import KpiCache
+    return KpiCache(get_store())
+
+
+@st.cache_resource
+def get_detector(backend):
+    # One per backend shared by every session: a batcher coalescing concurrent
+    # inspections into batched model calls, or the backend itself if it does
+    # not batch (called directly from each session's thread)
+    from detector_backends import detector, get_backend
+    return detector(get_backend(backend))
+
+
+@st.cache_resource
+def get_golden_template(variant):
+    # Loading computes the template's FFTs once; every unit reuses them
+    from golden_template import GoldenTemplate
+    return GoldenTemplate.load(variant)
+
+
+@st.cache_resource
+def get_appearance_model(variant):
+    # One model per variant shared by every session; each passed unit
+    # updates it in place
+    from appearance_model import AppearanceModel
+    return AppearanceModel.for_template(get_golden_template(variant))
+
+
+@st.cache_resource
+def get_defect_index():
+    from defect_index import DefectIndex
+    from inspection_store import get_store
+    return DefectIndex(get_store())
+
+
+@st.cache_resource
+def get_history_archive():
+    # The compactor thread lives as long as the server process
+    from history_archive import Compactor, HistoryArchive, available
+    from inspection_store import get_store
+    archive = HistoryArchive()
+    if available():
+        Compactor(get_store(), archive).start()
+    return archive
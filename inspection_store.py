@@ -0,0 +1,164 @@
+"""
+Persistent inspection history shared by the apps and the ingest daemon.
+
+A small SQLite database (WAL mode, so the Dashboard can read while the
+daemon writes) with one row per inspection and one row per detection:
+
+    inspections(id, unit_id, ts, status, defect_count, duration, source)
+    detections(id, inspection_id, unit_id, ts, type, confidence, x, y, severity, status)
+
+A detection's ``status`` is its review disposition (``REVIEW_STATUSES``).
+
+Timestamps are Unix epoch seconds.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from detection_records import as_batch
+
+DEFAULT_DB_PATH = os.environ.get('INSPECTION_DB', 'inspection_history.db')
+
+REVIEW_STATUSES = ['Under Review', 'Rejected', 'Reworked', 'Accepted']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inspections (
+    id INTEGER PRIMARY KEY,
+    unit_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    defect_count INTEGER NOT NULL,
+    duration REAL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_inspections_ts ON inspections (ts);
+CREATE INDEX IF NOT EXISTS idx_inspections_unit ON inspections (unit_id);
+CREATE TABLE IF NOT EXISTS detections (
+    id INTEGER PRIMARY KEY,
+    inspection_id INTEGER NOT NULL REFERENCES inspections (id),
+    unit_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    x INTEGER,
+    y INTEGER,
+    severity TEXT,
+    status TEXT NOT NULL DEFAULT 'Under Review'
+);
+CREATE INDEX IF NOT EXISTS idx_detections_ts ON detections (ts);
+"""
+
+
+class InspectionStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        columns = [row['name'] for row in self._conn.execute('PRAGMA table_info(detections)')]
+        if 'status' not in columns:
+            self._conn.execute("ALTER TABLE detections ADD COLUMN status TEXT NOT NULL DEFAULT 'Under Review'")
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call ``callback(inspection, detections)`` after each recorded inspection."""
+        self._listeners.append(callback)
+
+    def record(self, unit_id, defects, ts=None, duration=None, source='upload'):
+        """Store one inspection and its defects (a ``DetectionBatch``); returns the inspection id."""
+        defects = as_batch(defects)
+        ts = time.time() if ts is None else ts
+        status = 'FAIL' if defects else 'PASS'
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO inspections (unit_id, ts, status, defect_count, duration, source) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (unit_id, ts, status, len(defects), duration, source),
+            )
+            inspection_id = cursor.lastrowid
+            a = defects.array
+            rows = [
+                (inspection_id, unit_id, ts, *fields)
+                for fields in zip(defects.type_names(), a['confidence'].tolist(), a['x'].tolist(),
+                                  a['y'].tolist(), defects.severity_names())
+            ]
+            self._conn.executemany(
+                'INSERT INTO detections (inspection_id, unit_id, ts, type, confidence, x, y, severity) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+        inspection = {
+            'id': inspection_id, 'unit_id': unit_id, 'ts': ts, 'status': status,
+            'defect_count': len(defects), 'duration': duration, 'source': source,
+        }
+        for callback in self._listeners:
+            callback(inspection, defects)
+        return inspection_id
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def recent(self, limit=20):
+        return self._query('SELECT * FROM inspections ORDER BY id DESC LIMIT ?', (limit,))
+
+    def inspections_since(self, after_id=0, limit=None, min_ts=None, max_ts=None):
+        return self._since('inspections', after_id, limit, min_ts, max_ts)
+
+    def detections_since(self, after_id=0, limit=None, min_ts=None, max_ts=None):
+        return self._since('detections', after_id, limit, min_ts, max_ts)
+
+    def _since(self, table, after_id, limit, min_ts, max_ts):
+        sql = f'SELECT * FROM {table} WHERE id > ?'
+        params = [after_id]
+        if min_ts is not None:
+            sql += ' AND ts >= ?'
+            params.append(min_ts)
+        if max_ts is not None:
+            sql += ' AND ts < ?'
+            params.append(max_ts)
+        sql += ' ORDER BY id'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self._query(sql, params)
+
+    def last_id(self, table='inspections'):
+        """Highest row id in ``table``, 0 if it is empty."""
+        return self._query(f'SELECT COALESCE(MAX(id), 0) AS id FROM {table}')[0]['id']
+
+    def daily_counts(self, table='inspections'):
+        """``{'YYYY-MM-DD': rows}`` per local calendar day."""
+        rows = self._query(
+            f"SELECT date(ts, 'unixepoch', 'localtime') AS day, COUNT(*) AS n FROM {table} GROUP BY day")
+        return {row['day']: row['n'] for row in rows}
+
+    def set_detection_status(self, detection_ids, status):
+        if status not in REVIEW_STATUSES:
+            raise ValueError(f"Unknown review status: {status}")
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'UPDATE detections SET status = ? WHERE id = ?',
+                [(status, int(i)) for i in detection_ids],
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(path=None):
+    """Process-wide store instance."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = InspectionStore(path or DEFAULT_DB_PATH)
+        return _store
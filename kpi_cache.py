@@ -0,0 +1,139 @@
+"""
+Dashboard KPIs kept up to date from the inspection history.
+
+``KpiCache`` folds inspections and detections into hourly buckets as they
+are recorded, so the Dashboard never scans the history table. New rows are
+pulled incrementally by id (which also picks up rows written by the ingest
+daemon in another process) and a recorded inspection in this process
+triggers the same incremental pull. Reads within ``ttl`` seconds of the last
+pull are served from memory.
+
+Buckets are local clock hours (the UTC offset in effect at each row,
+half-hour zones and DST included), so "today" starts at local midnight and
+"this hour" at the top of the local hour. Buckets older than ``KEEP_HOURS``
+are dropped, so memory stays flat.
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+HOUR = 3600
+KEEP_HOURS = 48
+
+
+def hour_start(ts):
+    """Timestamp of the start of the local clock hour containing ``ts``."""
+    offset = time.localtime(ts).tm_gmtoff
+    return int((ts + offset) // HOUR) * HOUR - offset
+
+
+class _Bucket:
+    __slots__ = ('passed', 'failed', 'duration_sum', 'duration_count', 'defects')
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.duration_sum = 0.0
+        self.duration_count = 0
+        self.defects = Counter()
+
+
+class KpiCache:
+    def __init__(self, store, ttl=2.0, listen=True):
+        self.store = store
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._last_inspection_id = 0
+        self._last_detection_id = 0
+        self._refreshed = None
+        self._snapshot = None
+        if listen:
+            store.add_listener(lambda inspection, defects: self.refresh())
+
+    def _bucket(self, ts):
+        key = hour_start(ts)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def refresh(self):
+        """Fold rows recorded since the last pull into the hourly buckets."""
+        with self._lock:
+            horizon = time.time() - KEEP_HOURS * HOUR
+            first = self._refreshed is None
+            if first:
+                # The ids start past every row there is now, so an old
+                # history with nothing recent is not read again next time
+                latest = self.store.last_id('inspections'), self.store.last_id('detections')
+            # Only the retained window is ever read
+            for row in self.store.inspections_since(self._last_inspection_id, min_ts=horizon):
+                self._last_inspection_id = row['id']
+                bucket = self._bucket(row['ts'])
+                if row['status'] == 'PASS':
+                    bucket.passed += 1
+                else:
+                    bucket.failed += 1
+                if row['duration'] is not None:
+                    bucket.duration_sum += row['duration']
+                    bucket.duration_count += 1
+            for row in self.store.detections_since(self._last_detection_id, min_ts=horizon):
+                self._last_detection_id = row['id']
+                self._bucket(row['ts']).defects[row['type']] += 1
+            if first:
+                self._last_inspection_id = max(self._last_inspection_id, latest[0])
+                self._last_detection_id = max(self._last_detection_id, latest[1])
+            for key in [k for k in self._buckets if k + HOUR < horizon]:
+                del self._buckets[key]
+            self._refreshed = time.monotonic()
+            self._snapshot = None
+
+    def snapshot(self):
+        """KPIs for the Dashboard, pulling new rows at most once per ``ttl``."""
+        if self._refreshed is None or time.monotonic() - self._refreshed >= self.ttl:
+            self.refresh()
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._compute()
+            return self._snapshot
+
+    def _compute(self):
+        now = time.time()
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        current_hour = hour_start(now)
+        hours = [current_hour]
+        while len(hours) < 24:
+            # Step back through the previous local hour's start: correct across DST changes
+            hours.append(hour_start(hours[-1] - 1))
+        hours.reverse()
+
+        today = [b for k, b in self._buckets.items() if k >= midnight]
+        passed = sum(b.passed for b in today)
+        failed = sum(b.failed for b in today)
+        duration_count = sum(b.duration_count for b in today)
+        last_hour = self._buckets.get(current_hour)
+
+        defects = Counter()
+        for key in hours:
+            if key in self._buckets:
+                defects.update(self._buckets[key].defects)
+
+        return {
+            'inspected_today': passed + failed,
+            'rejection_rate': failed / (passed + failed) if passed + failed else 0.0,
+            'avg_inspection_seconds': (
+                sum(b.duration_sum for b in today) / duration_count if duration_count else None),
+            'inspected_this_hour': last_hour.passed + last_hour.failed if last_hour else 0,
+            'hourly': [
+                {
+                    'hour': datetime.fromtimestamp(key),
+                    'passed': self._buckets[key].passed if key in self._buckets else 0,
+                    'failed': self._buckets[key].failed if key in self._buckets else 0,
+                }
+                for key in hours
+            ],
+            'defects_24h': dict(defects.most_common()),
+        }
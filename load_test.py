@@ -0,0 +1,510 @@
+"""
+Concurrent-session load test for the Streamlit apps.
+
+Simulates N operators using one app at the same time. The app is started
+with ``streamlit run`` (headless, on a free local port) and every simulated
+operator is a websocket session speaking the browser's own protocol: it
+sends rerun requests with widget values and reads the app's output until
+the script run finishes. Each session loops through a scenario with a
+random think time between steps:
+
+    visual_inspection.py   dashboard, upload an image (a real file upload),
+                           run an inspection, use the sample image, defect
+                           detection, gallery, statistics, report
+    app.py                 every section, plus the line simulation
+
+Every rerun is timed from request to ``script_finished``. Each concurrency
+level gets a fresh server, warmed by visiting every page once, and reports
+rerun latency percentiles, reruns per second, peak RSS and CPU use of the
+server process:
+
+    python load_test.py --app visual_inspection.py --sessions 1 2 4 8 16 --duration 30
+
+Like ``startup_benchmark.py``, the history database and archives go to a
+temporary directory unless ``INSPECTION_DB`` / ``INSPECTION_ARCHIVE_DIR`` /
+``INSPECTION_HISTORY_ARCHIVE`` are set. Needs nothing beyond the apps' own
+requirements; Linux only (server memory and CPU are read from ``/proc``).
+"""
+
+import base64
+import http.client
+import io
+import os
+import random
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+
+HOST = '127.0.0.1'
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def _page(title):
+    return f"page {title}", lambda session: session.switch_page(title)
+
+
+def _click(label):
+    return f"click {label}", lambda session: session.click(label)
+
+
+def _upload(label):
+    return f"upload {label}", lambda session: session.upload(label)
+
+
+SCENARIOS = {
+    'app.py': [
+        _page('Executive Summary'),
+        _page('Context & Problem Statement'),
+        _page('Defect Taxonomy & Sensor Modalities'),
+        _page('AI Mesh Transformer Architecture'),
+        _page('Sensor Placement (3D)'),
+        _page('Defect Detection Flow'),
+        _click('Run Simulation'),
+        _page('ROI Calculator'),
+        _page('Implementation Timeline'),
+        _page('References'),
+    ],
+    'visual_inspection.py': [
+        _page('Dashboard'),
+        _page('Image Upload & Analysis'),
+        _upload('Choose an image file'),
+        _click('Run Inspection'),
+        _click('Use Sample Image'),
+        _click('Run Inspection'),
+        _page('Defect Detection'),
+        _page('Defect Gallery'),
+        _page('Inspection Statistics'),
+        _page('Inspection Reports'),
+        _click('Generate Report'),
+    ],
+}
+
+
+def sample_png(width=1280, height=960, seed=0):
+    """A condenser-like test image (fins, tubes, a few dark spots) as PNG bytes."""
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    img = np.full((height, width, 3), 170, np.uint8)
+    img[:, (np.arange(width) % 24) < 4] = 205
+    img[(np.arange(height) % 160) < 18] = 120
+    for _ in range(6):
+        y, x = rng.integers(40, height - 40), rng.integers(40, width - 40)
+        img[y - 12:y + 12, x - 12:x + 12] = 45
+    img = np.clip(img + rng.normal(0, 6, img.shape), 0, 255).astype(np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(img).save(out, format='PNG')
+    return out.getvalue()
+
+
+# ============================================================================
+# WEBSOCKET CLIENT
+# ============================================================================
+
+class WebSocket:
+    """Minimal blocking RFC 6455 client: binary messages only, no extensions."""
+
+    def __init__(self, port, path='/_stcore/stream', protocol='streamlit', timeout=300):
+        self.sock = socket.create_connection((HOST, port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall(
+            f"GET {path} HTTP/1.1\r\nHost: {HOST}:{port}\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n"
+            f"Sec-WebSocket-Protocol: {protocol}\r\n\r\n".encode()
+        )
+        head = b''
+        while b'\r\n\r\n' not in head:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("connection closed during the websocket handshake")
+            head += chunk
+        head, self._pending = head.split(b'\r\n\r\n', 1)
+        status = head.split(b'\r\n', 1)[0]
+        if b' 101 ' not in status:
+            raise ConnectionError(f"websocket handshake failed: {status.decode(errors='replace')}")
+
+    def _read(self, n):
+        while len(self._pending) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._pending)))
+            if not chunk:
+                raise ConnectionError("websocket closed by the server")
+            self._pending += chunk
+        data, self._pending = self._pending[:n], self._pending[n:]
+        return data
+
+    def _send_frame(self, opcode, payload):
+        head = bytes([0x80 | opcode])
+        n = len(payload)
+        if n < 126:
+            head += bytes([0x80 | n])
+        elif n < 1 << 16:
+            head += bytes([0x80 | 126]) + struct.pack('!H', n)
+        else:
+            head += bytes([0x80 | 127]) + struct.pack('!Q', n)
+        # Client frames must be masked
+        mask = os.urandom(4)
+        masked = (np.frombuffer(payload, np.uint8) ^ np.resize(np.frombuffer(mask, np.uint8), n)).tobytes()
+        self.sock.sendall(head + mask + masked)
+
+    def send(self, payload):
+        self._send_frame(0x2, payload)
+
+    def recv(self):
+        """The next complete binary message; answers pings on the way."""
+        message = b''
+        while True:
+            b0, b1 = self._read(2)
+            n = b1 & 0x7F
+            if n == 126:
+                n = struct.unpack('!H', self._read(2))[0]
+            elif n == 127:
+                n = struct.unpack('!Q', self._read(8))[0]
+            payload = self._read(n)
+            opcode = b0 & 0x0F
+            if opcode == 0x8:
+                raise ConnectionError("websocket closed by the server")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            message += payload
+            if b0 & 0x80:
+                return message
+
+    def close(self):
+        try:
+            self._send_frame(0x8, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+class Session(threading.Thread):
+    """
+    One simulated operator: a websocket session on the server, looping over
+    a scenario until ``deadline``. ``latencies`` holds the seconds of every
+    rerun, ``errors`` counts failures by message.
+    """
+
+    def __init__(self, port, scenario, deadline, think, seed, upload=b''):
+        super().__init__(daemon=True)
+        self.port = port
+        self.scenario = scenario
+        self.deadline = deadline
+        self.think = think
+        self.rng = random.Random(seed)
+        self.upload_bytes = upload
+        self.latencies = []
+        self.errors = {}
+        self.ws = None
+        self.session_id = None
+        self.pages = {}             # page title -> page script hash
+        self.page_hash = ''
+        self.widgets = {}           # label -> (kind, widget id) from the last run
+
+    def _error(self, key):
+        key = key[:160]
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+    def connect(self):
+        self.ws = WebSocket(self.port)
+        self.session_id = None
+        self.page_hash = ''
+        return self.rerun()
+
+    def _handle(self, msg):
+        """Update the session's view of the app from one ForwardMsg; returns its type."""
+        kind = msg.WhichOneof('type')
+        if kind == 'new_session':
+            self.session_id = msg.new_session.initialize.session_id or self.session_id
+            self.page_hash = msg.new_session.page_script_hash
+            self.widgets = {}
+        elif kind == 'navigation':
+            self.pages = {p.page_name: p.page_script_hash for p in msg.navigation.app_pages}
+            self.page_hash = msg.navigation.page_script_hash or self.page_hash
+        elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+            element = msg.delta.new_element
+            widget = element.WhichOneof('type')
+            if widget in ('button', 'file_uploader'):
+                node = getattr(element, widget)
+                self.widgets[node.label] = (widget, node.id)
+            elif widget == 'exception':
+                self._error(f"{element.exception.type}: {element.exception.message}")
+        return kind
+
+    def rerun(self, widget_states=()):
+        """Rerun the current page with these widget values; returns the seconds it took."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        back = BackMsg()
+        back.rerun_script.page_script_hash = self.page_hash
+        back.rerun_script.widget_states.widgets.extend(widget_states)
+        t0 = time.perf_counter()
+        self.ws.send(back.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(self.ws.recv())
+            if self._handle(msg) == 'script_finished':
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self._error("script compile error")
+                # st.rerun() inside the script starts another run straight away
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - t0
+
+    def _widget(self, label, kind):
+        for text, (widget, widget_id) in self.widgets.items():
+            if widget == kind and label in text:
+                return widget_id
+        raise LookupError(f"no {kind} labelled {label!r}")
+
+    def switch_page(self, title):
+        if title not in self.pages:
+            raise LookupError(f"no page {title!r}")
+        self.page_hash = self.pages[title]
+        return self.rerun()
+
+    def click(self, label):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        return self.rerun([WidgetState(id=self._widget(label, 'button'), trigger_value=True)])
+
+    def upload(self, label):
+        """Upload ``upload_bytes`` through the file uploader as the browser does; returns the rerun's seconds."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id = self._widget(label, 'file_uploader')
+        name = 'condenser.png'
+        request_id = uuid.uuid4().hex
+        back = BackMsg()
+        back.file_urls_request.request_id = request_id
+        back.file_urls_request.file_names.append(name)
+        back.file_urls_request.session_id = self.session_id
+        self.ws.send(back.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(self.ws.recv())
+            if self._handle(msg) == 'file_urls_response' and msg.file_urls_response.response_id == request_id:
+                break
+        if msg.file_urls_response.error_msg:
+            raise RuntimeError(msg.file_urls_response.error_msg)
+        urls = msg.file_urls_response.file_urls[0]
+
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+                f"Content-Type: image/png\r\n\r\n").encode() + self.upload_bytes + f"\r\n--{boundary}--\r\n".encode()
+        conn = http.client.HTTPConnection(HOST, self.port, timeout=60)
+        try:
+            conn.request('PUT', urls.upload_url, body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+            response = conn.getresponse()
+            response.read()
+        finally:
+            conn.close()
+        if response.status != 204:
+            raise RuntimeError(f"upload failed: HTTP {response.status}")
+
+        state = WidgetState(id=widget_id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.name, info.size, info.file_id = name, len(self.upload_bytes), urls.file_id
+        info.file_urls.CopyFrom(urls)
+        return self.rerun([state])
+
+    # ------------------------------------------------------------------
+    # Scenario loop
+    # ------------------------------------------------------------------
+    def _timed(self, name, action):
+        try:
+            self.latencies.append(action(self))
+            return True
+        except LookupError as e:
+            # The page did not render what the step needs; carry on with the next step
+            self._error(f"{name}: {e}")
+            return True
+        except (OSError, ConnectionError, RuntimeError) as e:
+            self._error(f"{name}: {type(e).__name__}: {e}")
+            return False
+
+    def run(self):
+        connected = self._timed('connect', Session.connect)
+        while time.monotonic() < self.deadline:
+            if not connected:
+                # Like a browser tab: reconnect with a fresh session
+                if self.ws is not None:
+                    self.ws.close()
+                time.sleep(1.0)
+                connected = self._timed('reconnect', Session.connect)
+                continue
+            for name, step in self.scenario:
+                if time.monotonic() >= self.deadline:
+                    break
+                time.sleep(self.rng.expovariate(1 / self.think) if self.think else 0)
+                if not self._timed(name, step):
+                    connected = False
+                    break
+        if self.ws is not None:
+            self.ws.close()
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def _rss_bytes(pid):
+    with open(f'/proc/{pid}/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        # Fields after the parenthesised command name; utime and stime are 14 and 15
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def start_server(app_path, env, port, timeout=60.0):
+    """``streamlit run`` the app headless on ``port``; returns the process once it is healthy."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', os.path.basename(app_path),
+         '--server.headless', 'true', '--server.address', HOST, '--server.port', str(port),
+         '--server.enableXsrfProtection', 'false', '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        cwd=os.path.dirname(os.path.abspath(app_path)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection(HOST, port, timeout=2)
+            conn.request('GET', '/_stcore/health')
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit did not become healthy")
+
+
+def run_level(app_path, sessions, duration, think, env, seed=0):
+    """Run ``sessions`` concurrent sessions for ``duration`` seconds against a fresh server."""
+    scenario = SCENARIOS[os.path.basename(app_path)]
+    upload = sample_png()
+    port = _free_port()
+    server = start_server(app_path, env, port)
+    try:
+        # Visit every step once first so page compiles and resource caches are
+        # warm, as on a server that has been up for a while
+        warm = Session(port, scenario, 0, 0, seed, upload)
+        warm.connect()
+        for name, step in scenario:
+            warm._timed(name, step)
+        warm.ws.close()
+
+        rss_base = _rss_bytes(server.pid)
+        peak = [rss_base]
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(0.2):
+                peak[0] = max(peak[0], _rss_bytes(server.pid))
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        deadline = time.monotonic() + duration
+        workers = [Session(port, scenario, deadline, think, seed + i, upload) for i in range(sessions)]
+        cpu0, wall0 = _cpu_seconds(server.pid), time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        cpu, wall = _cpu_seconds(server.pid) - cpu0, time.perf_counter() - wall0
+        stop.set()
+        sampler.join()
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    latencies = np.array([t for w in workers for t in w.latencies])
+    errors = {}
+    for w in workers:
+        for key, n in w.errors.items():
+            errors[key] = errors.get(key, 0) + n
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'reruns_per_s': len(latencies) / wall,
+        'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+        'max': float(latencies.max()) if len(latencies) else 0.0,
+        'rss_base_mib': rss_base / 2**20,
+        'rss_peak_mib': peak[0] / 2**20,
+        'cpu_percent': 100 * cpu / wall,
+        'errors': errors,
+    }
+
+
+def measure(app_path, levels, duration, think):
+    """One fresh server per concurrency level; yields each level's result."""
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as scratch:
+        env.setdefault('INSPECTION_DB', os.path.join(scratch, 'history.db'))
+        env.setdefault('INSPECTION_ARCHIVE_DIR', os.path.join(scratch, 'archive'))
+        env.setdefault('INSPECTION_HISTORY_ARCHIVE', os.path.join(scratch, 'history_archive'))
+        for sessions in levels:
+            yield run_level(app_path, sessions, duration, think, env)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load-test an app with N concurrent sessions')
+    parser.add_argument('--app', default='visual_inspection.py', choices=sorted(SCENARIOS))
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds per level')
+    parser.add_argument('--think', type=float, default=0.3, help='mean seconds between a session\'s steps')
+    args = parser.parse_args()
+
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), args.app)
+    print(f"{args.app}: {args.duration:.0f} s per level, {args.think:.1f} s mean think time")
+    print(f"{'sessions':>8}{'reruns':>8}{'per s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+          f"{'server RSS MiB':>16}{'CPU':>7}")
+    errors = {}
+    for r in measure(app_path, args.sessions, args.duration, args.think):
+        print(f"{r['sessions']:>8}{r['reruns']:>8}{r['reruns_per_s']:>8.1f}"
+              f"{r['p50'] * 1000:>7.0f}ms{r['p95'] * 1000:>7.0f}ms{r['p99'] * 1000:>7.0f}ms{r['max'] * 1000:>7.0f}ms"
+              f"{r['rss_base_mib']:>9.0f}->{r['rss_peak_mib']:<5.0f}{r['cpu_percent']:>6.0f}%", flush=True)
+        for key, n in r['errors'].items():
+            errors[key] = errors.get(key, 0) + n
+    for key, n in sorted(errors.items(), key=lambda kv: -kv[1]):
+        print(f"  {n:>5} x {key}")
@@ -0,0 +1,250 @@
+"""
+CPU (NumPy) implementation of the Mesh Transformer fusion block.
+
+Mirrors the architecture described on the "AI Mesh Transformer Architecture"
+page of app.py:
+
+    per-modality feature tokens (6 sensors)
+      -> per-modality linear token projection + modality embedding
+      -> N transformer blocks with cross-modal multi-head attention
+      -> mean-pooled fused representation
+      -> one sigmoid classification head per defect type
+
+Every operation works on a whole batch of units at once: linear layers fold
+the batch and token axes into a single GEMM and attention uses stacked
+``(batch, heads)`` matmuls, so inference cost per unit falls as the batch
+grows. Weights are loaded from a local ``.npz``
+file written by ``MeshTransformer.save``.
+
+Usage:
+    python mesh_transformer.py --bench
+    python mesh_transformer.py --init weights.npz
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+from detection_records import DEFECT_TYPES
+
+MODALITIES = ['rgb', 'uv', 'thermal', 'structured_light', 'acoustic', 'pressure_temp']
+
+
+@dataclass
+class MeshTransformerConfig:
+    d_model: int = 256
+    n_heads: int = 8
+    n_layers: int = 3
+    mlp_ratio: int = 4
+    # Feature-vector size and token count produced per modality by feature extraction
+    feature_dims: dict = field(default_factory=lambda: {
+        'rgb': 512, 'uv': 512, 'thermal': 256,
+        'structured_light': 256, 'acoustic': 128, 'pressure_temp': 16,
+    })
+    tokens: dict = field(default_factory=lambda: {
+        'rgb': 16, 'uv': 8, 'thermal': 8,
+        'structured_light': 8, 'acoustic': 4, 'pressure_temp': 2,
+    })
+    # Mask attention within a modality so tokens only attend across sensors
+    cross_modal_only: bool = False
+    classes: list = field(default_factory=lambda: list(DEFECT_TYPES))
+
+
+def _layer_norm(x, gamma, beta, eps=1e-5):
+    mean = x.mean(axis=-1, keepdims=True)
+    var = x.var(axis=-1, keepdims=True)
+    return (x - mean) / np.sqrt(var + eps) * gamma + beta
+
+
+def _gelu(x):
+    return 0.5 * x * (1.0 + np.tanh(0.7978845608 * (x + 0.044715 * x * x * x)))
+
+
+def _dense(x, weight, bias):
+    # One GEMM over all batch x token rows instead of a stack of small ones
+    shape = x.shape
+    out = x.reshape(-1, shape[-1]) @ weight
+    out += bias
+    return out.reshape(shape[:-1] + (weight.shape[1],))
+
+
+def _softmax(x, axis=-1):
+    x = x - x.max(axis=axis, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=axis, keepdims=True)
+    return x
+
+
+class MeshTransformer:
+    def __init__(self, config, weights):
+        self.config = config
+        self.w = {k: np.asarray(v, dtype=np.float32) for k, v in weights.items()}
+        self._mask = self._attention_mask()
+
+    # ------------------------------------------------------------------
+    # Weights
+    # ------------------------------------------------------------------
+    @classmethod
+    def init_random(cls, config=None, seed=0):
+        """Randomly initialised weights, for benchmarking and tests."""
+        config = config or MeshTransformerConfig()
+        rng = np.random.default_rng(seed)
+        d = config.d_model
+        hidden = d * config.mlp_ratio
+
+        def dense(n_in, n_out):
+            return (rng.standard_normal((n_in, n_out)) / np.sqrt(n_in)).astype(np.float32)
+
+        w = {}
+        for m in MODALITIES:
+            w[f'proj.{m}.weight'] = dense(config.feature_dims[m], d)
+            w[f'proj.{m}.bias'] = np.zeros(d, np.float32)
+            w[f'embed.{m}'] = (0.02 * rng.standard_normal((config.tokens[m], d))).astype(np.float32)
+        for i in range(config.n_layers):
+            p = f'block{i}.'
+            w[p + 'ln1.gamma'] = np.ones(d, np.float32)
+            w[p + 'ln1.beta'] = np.zeros(d, np.float32)
+            w[p + 'qkv.weight'] = dense(d, 3 * d)
+            w[p + 'qkv.bias'] = np.zeros(3 * d, np.float32)
+            w[p + 'out.weight'] = dense(d, d)
+            w[p + 'out.bias'] = np.zeros(d, np.float32)
+            w[p + 'ln2.gamma'] = np.ones(d, np.float32)
+            w[p + 'ln2.beta'] = np.zeros(d, np.float32)
+            w[p + 'mlp1.weight'] = dense(d, hidden)
+            w[p + 'mlp1.bias'] = np.zeros(hidden, np.float32)
+            w[p + 'mlp2.weight'] = dense(hidden, d)
+            w[p + 'mlp2.bias'] = np.zeros(d, np.float32)
+        w['ln_final.gamma'] = np.ones(d, np.float32)
+        w['ln_final.beta'] = np.zeros(d, np.float32)
+        w['heads.weight'] = dense(d, len(config.classes))
+        w['heads.bias'] = np.zeros(len(config.classes), np.float32)
+        return cls(config, w)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            config = MeshTransformerConfig(**json.loads(str(data['__config__'])))
+            weights = {k: data[k] for k in data.files if k != '__config__'}
+        return cls(config, weights)
+
+    def save(self, path):
+        np.savez(path, __config__=np.array(json.dumps(asdict(self.config))), **self.w)
+
+    # ------------------------------------------------------------------
+    # Forward pass
+    # ------------------------------------------------------------------
+    def _attention_mask(self):
+        if not self.config.cross_modal_only:
+            return None
+        owner = np.concatenate([
+            np.full(self.config.tokens[m], i) for i, m in enumerate(MODALITIES)
+        ])
+        # Additive mask: -inf between tokens of the same modality
+        return np.where(owner[:, None] == owner[None, :], -np.inf, 0.0).astype(np.float32)
+
+    def embed(self, features):
+        """Project each modality's ``(batch, tokens, feature_dim)`` features to model tokens."""
+        parts = []
+        for m in MODALITIES:
+            x = np.asarray(features[m], dtype=np.float32)
+            parts.append(_dense(x, self.w[f'proj.{m}.weight'], self.w[f'proj.{m}.bias']) + self.w[f'embed.{m}'])
+        return np.concatenate(parts, axis=1)
+
+    def _attention(self, x, p):
+        b, t, d = x.shape
+        h = self.config.n_heads
+        qkv = _dense(x, self.w[p + 'qkv.weight'], self.w[p + 'qkv.bias'])
+        # (3, batch, heads, tokens, head_dim)
+        qkv = qkv.reshape(b, t, 3, h, d // h).transpose(2, 0, 3, 1, 4)
+        q, k, v = qkv[0], qkv[1], qkv[2]
+        scores = q @ k.transpose(0, 1, 3, 2)
+        scores *= 1.0 / np.sqrt(d // h)
+        if self._mask is not None:
+            scores += self._mask
+        out = _softmax(scores) @ v
+        out = out.transpose(0, 2, 1, 3).reshape(b, t, d)
+        return _dense(out, self.w[p + 'out.weight'], self.w[p + 'out.bias'])
+
+    def fuse(self, features):
+        """Fused ``(batch, d_model)`` representation of a batch of units."""
+        x = self.embed(features)
+        for i in range(self.config.n_layers):
+            p = f'block{i}.'
+            x = x + self._attention(_layer_norm(x, self.w[p + 'ln1.gamma'], self.w[p + 'ln1.beta']), p)
+            y = _layer_norm(x, self.w[p + 'ln2.gamma'], self.w[p + 'ln2.beta'])
+            y = _gelu(_dense(y, self.w[p + 'mlp1.weight'], self.w[p + 'mlp1.bias']))
+            x = x + _dense(y, self.w[p + 'mlp2.weight'], self.w[p + 'mlp2.bias'])
+        x = _layer_norm(x, self.w['ln_final.gamma'], self.w['ln_final.beta'])
+        return x.mean(axis=1)
+
+    def predict(self, features):
+        """Per-class defect probabilities, shape ``(batch, n_classes)``."""
+        logits = self.fuse(features) @ self.w['heads.weight'] + self.w['heads.bias']
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def to_detections(self, probabilities, threshold=0.5):
+        """A ``DetectionBatch`` per unit (no image location at fusion level)."""
+        from detection_records import SEVERITY_CODES, DetectionBatch, type_codes
+
+        codes = type_codes(self.config.classes)
+        results = []
+        for row in np.atleast_2d(probabilities):
+            hits = np.flatnonzero(row >= threshold)
+            p = row[hits]
+            results.append(DetectionBatch.from_columns(
+                codes[hits],
+                p * 100,
+                np.zeros(len(hits)),
+                np.zeros(len(hits)),
+                np.select([p >= 0.95, p >= 0.8], [SEVERITY_CODES['Critical'], SEVERITY_CODES['High']],
+                          SEVERITY_CODES['Medium']),
+            ))
+        return results
+
+    def random_features(self, batch, seed=0):
+        rng = np.random.default_rng(seed)
+        return {
+            m: rng.standard_normal((batch, self.config.tokens[m], self.config.feature_dims[m])).astype(np.float32)
+            for m in MODALITIES
+        }
+
+
+def benchmark(model=None, batch_sizes=(1, 2, 4, 8, 16, 32, 64), min_seconds=0.5):
+    """Measured ``(batch_size, units/s, ms/batch)`` for each batch size."""
+    import time
+
+    model = model or MeshTransformer.init_random()
+    results = []
+    for batch in batch_sizes:
+        features = model.random_features(batch)
+        model.predict(features)  # warm-up
+        runs = 0
+        t0 = time.perf_counter()
+        while True:
+            model.predict(features)
+            runs += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= min_seconds:
+                break
+        per_batch = elapsed / runs
+        results.append((batch, batch / per_batch, per_batch * 1000))
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='NumPy Mesh Transformer fusion block')
+    parser.add_argument('--weights', help='load weights from this .npz file')
+    parser.add_argument('--init', metavar='PATH', help='write randomly initialised weights to PATH')
+    parser.add_argument('--bench', action='store_true', help='report units/s at batch sizes 1-64')
+    args = parser.parse_args()
+
+    if args.init:
+        MeshTransformer.init_random().save(args.init)
+        print(f"Wrote random weights to {args.init}")
+    if args.bench or not args.init:
+        model = MeshTransformer.load(args.weights) if args.weights else MeshTransformer.init_random()
+        for batch, units_per_s, ms in benchmark(model):
+            print(f"batch {batch:3d}: {units_per_s:8.1f} units/s  ({ms:7.2f} ms/batch)")
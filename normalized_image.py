@@ -0,0 +1,193 @@
+"""
+Decode-once image buffer shared by the pages, the detectors and the archive.
+
+A capture is decoded exactly once, into the form everything downstream
+expects:
+
+    file -> PIL decode -> EXIF orientation applied (upright pixels, so
+            detection boxes, previews and annotations share coordinates)
+         -> 8-bit frames: one conversion to RGB (palette, gray, RGBA, CMYK)
+            16-bit/32-bit/float frames (TIFF, PNG): scaled once to float32
+            gray on 0..255 by the sensor's bit depth, then rounded to 8-bit RGB
+         -> one C-contiguous, read-only ``uint8`` HxWx3 array
+
+Pages hold a ``NormalizedImage`` in ``st.session_state.current_image`` and
+pass ``.array`` (or ``.gray``) to the detectors with no further
+``convert()`` or copy. The float32 gray and a 2x pyramid for previews and
+annotation are built on first use and kept. High bit-depth captures keep the
+gray they were decoded from, so gray-based detectors see their full
+precision.
+
+The bit depth is the same for every frame of a sensor, never guessed from a
+frame's content, so a dim frame stays dim next to a bright one and frames
+compare against golden templates and appearance models. It is the nominal
+range of the decoded mode (16 bits for ``I;16`` and ``I``, 0..1 for ``F``)
+unless the sensor's depth is set: ``$INSPECTION_SENSOR_BIT_DEPTH`` (e.g. 12
+for a 12-bit sensor written as 16-bit TIFF) or ``bit_depth=`` per call.
+
+Usage:
+    python normalized_image.py --width 3840 --height 2160    # decode and preview time, 8- and 16-bit
+"""
+
+import os
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from detection import to_gray
+
+PREVIEW_WIDTH = 1280        # px; pages display the largest pyramid level no wider
+EXIF_ORIENTATION = 0x0112
+# Full scale of high bit-depth modes, in bits (0: floats on 0..1)
+MODE_BIT_DEPTH = {'I;16': 16, 'I;16L': 16, 'I;16B': 16, 'I;16N': 16, 'I': 16, 'F': 0}
+SENSOR_BIT_DEPTH = int(os.environ.get('INSPECTION_SENSOR_BIT_DEPTH', 0)) or None
+
+
+def _downsample(array):
+    # 2x2 box average, the odd last row/column dropped
+    h, w = array.shape[0] // 2 * 2, array.shape[1] // 2 * 2
+    rows = array[0:h:2].astype(np.uint16)
+    rows += array[1:h:2]
+    out = rows[:, 0:w:2] + rows[:, 1:w:2]
+    out += 2
+    out >>= 2
+    return out.astype(np.uint8)
+
+
+class NormalizedImage:
+    """One decoded capture: upright 8-bit RGB, with its gray and pyramid built on first use."""
+
+    def __init__(self, array, format=None, mode='RGB', bit_depth=8, source=None, gray=None):
+        array = np.asarray(array)
+        if array.ndim == 2:
+            array = np.repeat(array[..., None], 3, axis=2)
+        array = np.ascontiguousarray(array[..., :3], dtype=np.uint8)
+        # Shared by every page and detector; nothing may write to it
+        array.flags.writeable = False
+        self.array = array
+        self.format = format
+        self.mode = mode                # the decoded file's PIL mode, e.g. 'I;16'
+        self.bit_depth = bit_depth
+        self.source = source            # what it was decoded from (upload id, path), to skip re-decoding
+        self._gray = gray
+        self._pyramid = [array]
+
+    @classmethod
+    def open(cls, file, source=None, bit_depth=SENSOR_BIT_DEPTH):
+        """Decode an image file (path or file-like) once."""
+        with Image.open(file) as image:
+            return cls.from_pil(image, source=source, bit_depth=bit_depth)
+
+    @classmethod
+    def from_pil(cls, image, source=None, bit_depth=SENSOR_BIT_DEPTH):
+        """``bit_depth`` is the sensor's, for high bit-depth modes; default the mode's full scale."""
+        format, mode = image.format, image.mode
+        orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+        if orientation != 1:
+            image = ImageOps.exif_transpose(image)
+        if mode.startswith('I') or mode == 'F':
+            # High bit depth: one float32 gray on 0..255, the 8-bit frame from it
+            values = np.asarray(image)
+            depth = MODE_BIT_DEPTH.get(mode, 16) if bit_depth is None else bit_depth
+            full_scale = 1.0 if depth == 0 else float(2 ** depth - 1)
+            gray = values.astype(np.float32)
+            gray *= np.float32(255.0 / full_scale)
+            np.clip(gray, 0, 255, out=gray)
+            return cls(np.rint(gray).astype(np.uint8), format, mode, depth or 32, source, gray)   # 32: float on 0..1
+        if mode != 'RGB':
+            image = image.convert('RGB')
+        return cls(np.asarray(image), format, mode, 8, source)
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    @property
+    def size(self):
+        """``(width, height)``, as PIL's ``Image.size``."""
+        return self.array.shape[1], self.array.shape[0]
+
+    @property
+    def gray(self):
+        """float32 luminance, computed once."""
+        if self._gray is None:
+            self._gray = to_gray(self.array)
+        return self._gray
+
+    def level(self, k):
+        """Pyramid level ``k``: each level half the size of the one before (level 0 is ``array``)."""
+        while len(self._pyramid) <= k:
+            self._pyramid.append(_downsample(self._pyramid[-1]))
+        return self._pyramid[k]
+
+    def preview(self, max_width=PREVIEW_WIDTH):
+        """``(array, factor)``: the largest pyramid level at most ``max_width`` wide, and full-frame px per its px."""
+        k = 0
+        while (self.array.shape[1] >> k) > max_width and min(self.array.shape[:2]) >> (k + 1) > 0:
+            k += 1
+        return self.level(k), 2 ** k
+
+    def enhanced(self, brightness=1.0, contrast=1.0):
+        """A new image with PIL ``ImageEnhance`` brightness, then contrast, applied to the array."""
+        # Brightness scales towards black, contrast blends with the mean gray
+        # of the brightened frame; PIL rounds to 8 bits in between
+        out = self.array * np.float32(brightness)
+        np.clip(out, 0, 255, out=out)
+        np.rint(out, out=out)
+        mean = np.float32(int(float(to_gray(out).mean()) + 0.5))
+        out -= mean
+        out *= np.float32(contrast)
+        out += mean
+        np.clip(out, 0, 255, out=out)
+        return NormalizedImage(np.rint(out).astype(np.uint8), self.format, self.mode, self.bit_depth, self.source)
+
+    def to_pil(self, k=0):
+        """Pyramid level ``k`` as a PIL image, e.g. to draw on."""
+        return Image.fromarray(self.level(k))
+
+
+def synthetic_capture(rng, width=1920, height=1080, bits=8):
+    """Fin-like test pattern as a PIL image, 8-bit RGB or 16-bit gray (``'I;16'``)."""
+    x = np.arange(width, dtype=np.float32)
+    pattern = 0.5 + 0.35 * np.sin(2 * np.pi * x / 6) + rng.normal(0, 0.02, (height, width))
+    pattern = np.clip(pattern, 0, 1)
+    if bits == 8:
+        gray = np.rint(pattern * 255).astype(np.uint8)
+        return Image.fromarray(np.repeat(gray[..., None], 3, axis=2))
+    return Image.fromarray(np.rint(pattern * (2 ** bits - 1)).astype(np.uint16))
+
+
+if __name__ == '__main__':
+    import argparse
+    import io
+    import time
+
+    parser = argparse.ArgumentParser(description='Decode-once image buffer: decode and preview time')
+    parser.add_argument('--width', type=int, default=3840)
+    parser.add_argument('--height', type=int, default=2160)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for bits, format in [(8, 'PNG'), (16, 'TIFF')]:
+        buffer = io.BytesIO()
+        synthetic_capture(rng, args.width, args.height, bits).save(buffer, format=format)
+        data = buffer.getvalue()
+
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            image = NormalizedImage.open(io.BytesIO(data))
+        decode = (time.perf_counter() - t0) / args.repeat
+
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            with Image.open(io.BytesIO(data)) as pil:
+                pil.load()
+        pil_decode = (time.perf_counter() - t0) / args.repeat
+
+        t0 = time.perf_counter()
+        preview, factor = image.preview()
+        build = time.perf_counter() - t0
+        print(f"{bits:>2}-bit {format:<4} {image.size[0]}x{image.size[1]}: decode + normalize {decode * 1000:.0f} ms "
+              f"(PIL decode alone {pil_decode * 1000:.0f} ms), preview 1/{factor} in {build * 1000:.1f} ms, "
+              f"{image.array.nbytes / 2**20:.0f} MiB")
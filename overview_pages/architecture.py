@@ -0,0 +1,209 @@
+import streamlit as st
+import plotly.graph_objects as go
+import plotly.express as px
+import pandas as pd
+
+# ============================================================================
+# AI MESH TRANSFORMER ARCHITECTURE
+# ============================================================================
+st.title("AI Mesh Transformer Architecture")
+
+st.write("""
+The Mesh Transformer architecture enables efficient fusion of multimodal sensor data through a novel 
+attention mechanism that processes spatial and temporal relationships across different sensor modalities.
+""")
+
+# Architecture Diagram (using Plotly)
+st.subheader("Architecture Overview")
+
+# Create a simplified architecture diagram
+fig = go.Figure()
+
+# Input layer (sensors)
+sensor_positions = {
+    'RGB': (0, 2),
+    'UV': (0, 1),
+    'Thermal': (0, 0),
+    'Structured Light': (0, -1),
+    'Acoustic': (0, -2),
+    'Pressure/Temp': (0, -3)
+}
+
+# Draw sensor inputs
+for sensor, (x, y) in sensor_positions.items():
+    fig.add_trace(go.Scatter(
+        x=[x], y=[y],
+        mode='markers+text',
+        marker=dict(size=30, color='#1f77b4'),
+        text=[sensor],
+        textposition='middle right',
+        name=sensor,
+        hovertemplate=f'<b>{sensor} Sensor</b><extra></extra>'
+    ))
+
+# Feature extraction layer
+fig.add_trace(go.Scatter(
+    x=[1, 1, 1, 1, 1, 1],
+    y=[2, 1, 0, -1, -2, -3],
+    mode='markers',
+    marker=dict(size=25, color='#ff7f0e', symbol='square'),
+    name='Feature Extraction',
+    hovertemplate='Feature Extraction Layer<extra></extra>'
+))
+
+# Mesh Transformer blocks
+fig.add_trace(go.Scatter(
+    x=[2.5, 2.5, 2.5],
+    y=[1, 0, -1],
+    mode='markers',
+    marker=dict(size=40, color='#2ca02c', symbol='diamond'),
+    name='Mesh Transformer',
+    hovertemplate='Mesh Transformer Block<extra></extra>'
+))
+
+# Attention mechanism
+fig.add_trace(go.Scatter(
+    x=[4],
+    y=[0],
+    mode='markers',
+    marker=dict(size=50, color='#d62728', symbol='star'),
+    name='Multi-Head Attention',
+    hovertemplate='Multi-Head Attention Fusion<extra></extra>'
+))
+
+# Output heads
+output_heads = {
+    'Bent Fin': (5.5, 1.5),
+    'Blocked': (5.5, 0.5),
+    'Leak': (5.5, -0.5),
+    'Thermal': (5.5, -1.5)
+}
+
+for head, (x, y) in output_heads.items():
+    fig.add_trace(go.Scatter(
+        x=[x], y=[y],
+        mode='markers+text',
+        marker=dict(size=20, color='#9467bd'),
+        text=[head],
+        textposition='middle right',
+        name=head,
+        hovertemplate=f'<b>{head} Detection Head</b><extra></extra>'
+    ))
+
+# Add connections (arrows)
+for sensor, (x, y) in sensor_positions.items():
+    fig.add_annotation(
+        x=1, y=y,
+        ax=x, ay=y,
+        arrowhead=2,
+        arrowsize=1,
+        arrowwidth=2,
+        arrowcolor='gray'
+    )
+
+fig.update_layout(
+    title="AI Mesh Transformer Architecture",
+    xaxis=dict(showgrid=False, showticklabels=False, range=[-0.5, 7]),
+    yaxis=dict(showgrid=False, showticklabels=False, range=[-4, 3]),
+    height=600,
+    showlegend=False
+)
+
+st.plotly_chart(fig, use_container_width=True)
+
+# Architecture Components
+st.markdown("---")
+st.subheader("Key Components")
+
+components = {
+    'Component': [
+        'Input Layer',
+        'Feature Extraction',
+        'Mesh Transformer Blocks',
+        'Multi-Head Attention',
+        'Output Heads',
+        'Decision Fusion'
+    ],
+    'Description': [
+        '6 parallel sensor inputs with preprocessing',
+        'CNN-based feature extraction per modality',
+        '3 transformer blocks with cross-modal attention',
+        'Fuses features across all sensor modalities',
+        'Specialized heads for each defect type',
+        'Final decision layer with confidence scoring'
+    ],
+    'Parameters': [
+        'Variable (sensor-dependent)',
+        '~2M per sensor',
+        '~15M per block',
+        '~8M',
+        '~1M per head',
+        '~500K'
+    ]
+}
+
+df_components = pd.DataFrame(components)
+st.dataframe(df_components, use_container_width=True)
+
+# Technical Details
+st.markdown("---")
+st.subheader("Technical Specifications")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("""
+    **Model Architecture:**
+    - Total Parameters: ~60M
+    - Input Dimensions: Multi-modal (varies by sensor)
+    - Output: 8-class defect classification + confidence scores
+    - Training Data: 50,000+ labeled samples
+    - Validation Accuracy: 98.5%
+    """)
+
+with col2:
+    st.write("""
+    **Performance Metrics:**
+    - Inference Time: <250ms per unit
+    - Memory Usage: ~2GB GPU
+    - Throughput: 692 units/hour
+    - Power Consumption: ~150W
+    - Model Size: ~240MB
+    """)
+
+# CPU inference benchmark
+st.markdown("---")
+st.subheader("CPU Inference Benchmark")
+
+st.write("""
+A NumPy implementation of the fusion block (token projection, cross-modal multi-head attention and
+per-defect classification heads) runs on this machine's CPU. Throughput at each batch size shows how many
+units the feature-extraction and fusion stages can absorb per second.
+""")
+
+weights_path = st.text_input("Weights File (.npz, optional)", value="", help="Leave empty to use random weights")
+
+if st.button("⏱️ Run Benchmark"):
+    from mesh_transformer import MeshTransformer, benchmark
+    
+    model = MeshTransformer.load(weights_path) if weights_path else MeshTransformer.init_random()
+    with st.spinner("Benchmarking batch sizes 1-64..."):
+        bench = benchmark(model, min_seconds=0.3)
+    
+    bench_df = pd.DataFrame(bench, columns=['Batch Size', 'Units/s', 'ms per Batch'])
+    
+    fig_bench = px.line(
+        bench_df,
+        x='Batch Size',
+        y='Units/s',
+        markers=True,
+        log_x=True,
+        title="Fusion Throughput vs Batch Size (CPU)"
+    )
+    st.plotly_chart(fig_bench, use_container_width=True)
+    st.dataframe(bench_df.round(2), use_container_width=True, hide_index=True)
+
+st.markdown('<div class="info-box">', unsafe_allow_html=True)
+st.write("**Did you know?**")
+st.write("The Mesh Transformer architecture processes all 6 sensor modalities simultaneously, enabling real-time multimodal fusion that traditional sequential processing cannot achieve.")
+st.markdown('</div>', unsafe_allow_html=True)
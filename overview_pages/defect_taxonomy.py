@@ -0,0 +1,128 @@
+import streamlit as st
+import pandas as pd
+
+# ============================================================================
+# DEFECT TAXONOMY & SENSOR MODALITIES
+# ============================================================================
+st.title("Defect Taxonomy & Sensor Modalities")
+
+# Defect Taxonomy Data
+defects_data = {
+    'Defect Type': [
+        'Bent Fin',
+        'Blocked Section',
+        'UV Leak',
+        'Thermal Anomaly',
+        'Structural Deformity',
+        'Surface Contamination',
+        'Mounting Misalignment',
+        'Pressure Drop'
+    ],
+    'Severity': ['High', 'High', 'Critical', 'Medium', 'High', 'Low', 'High', 'Critical'],
+    'Primary Sensor': [
+        'RGB Camera',
+        'Structured Light',
+        'UV Camera',
+        'Thermal IR',
+        'RGB + Structured Light',
+        'RGB Camera',
+        'Structured Light',
+        'Pressure/Temp Sensor'
+    ],
+    'AI Head': [
+        'Vision Transformer',
+        '3D Mesh Analyzer',
+        'UV Anomaly Detector',
+        'Thermal Pattern Analyzer',
+        'Multi-Modal Fusion',
+        'Surface Classifier',
+        'Geometric Validator',
+        'Flow Dynamics Model'
+    ],
+    'Detection Time (ms)': [120, 180, 95, 150, 250, 100, 160, 80],
+    'Accuracy (%)': [99.2, 97.8, 98.5, 96.5, 98.9, 95.2, 99.1, 97.5]
+}
+
+df_defects = pd.DataFrame(defects_data)
+
+st.subheader("Defect Classification Table")
+
+# Interactive filters
+col1, col2 = st.columns(2)
+with col1:
+    severity_filter = st.multiselect(
+        "Filter by Severity",
+        options=df_defects['Severity'].unique(),
+        default=df_defects['Severity'].unique()
+    )
+with col2:
+    sensor_filter = st.multiselect(
+        "Filter by Primary Sensor",
+        options=df_defects['Primary Sensor'].unique(),
+        default=df_defects['Primary Sensor'].unique()
+    )
+
+# Filter dataframe
+filtered_df = df_defects[
+    (df_defects['Severity'].isin(severity_filter)) &
+    (df_defects['Primary Sensor'].isin(sensor_filter))
+]
+
+# Display table
+st.dataframe(
+    filtered_df.style.background_gradient(subset=['Accuracy (%)'], cmap='RdYlGn'),
+    use_container_width=True,
+    height=400
+)
+
+# Defect selection for detailed view
+st.markdown("---")
+st.subheader("Defect Details")
+
+selected_defect = st.selectbox(
+    "Select a defect to view detailed information:",
+    options=df_defects['Defect Type'].tolist()
+)
+
+if selected_defect:
+    defect_info = df_defects[df_defects['Defect Type'] == selected_defect].iloc[0]
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Detection Time", f"{defect_info['Detection Time (ms)']} ms")
+    with col2:
+        st.metric("Accuracy", f"{defect_info['Accuracy (%)']}%")
+    with col3:
+        st.metric("Severity", defect_info['Severity'])
+    
+    st.write(f"**Primary Sensor:** {defect_info['Primary Sensor']}")
+    st.write(f"**AI Processing Head:** {defect_info['AI Head']}")
+    
+    # Sensor Modalities Overview
+    st.markdown("---")
+    st.subheader("Sensor Modalities Overview")
+    
+    sensors_info = {
+        'Sensor Type': [
+            'RGB Camera',
+            'UV Camera',
+            'Thermal IR',
+            'Structured Light',
+            'Acoustic Sensor',
+            'Pressure/Temp Sensor'
+        ],
+        'Purpose': [
+            'Visual defect detection, surface inspection',
+            'Leak detection (UV-visible dyes)',
+            'Thermal anomaly detection',
+            '3D geometry and depth measurement',
+            'Structural integrity via acoustic signature',
+            'Flow dynamics and pressure monitoring'
+        ],
+        'Resolution': ['4K', '2K', '640x480', '1920x1080', 'N/A', '16-bit'],
+        'Frame Rate': ['30 fps', '15 fps', '25 fps', '60 fps', '44.1 kHz', '100 Hz']
+    }
+    
+    df_sensors = pd.DataFrame(sensors_info)
+    st.dataframe(df_sensors, use_container_width=True)
@@ -0,0 +1,257 @@
+import streamlit as st
+import plotly.graph_objects as go
+import plotly.express as px
+import pandas as pd
+import numpy as np
+
+# ============================================================================
+# DEFECT DETECTION FLOW
+# ============================================================================
+st.title("Defect Detection Flow")
+
+st.write("""
+Step-by-step process of how the AI system detects defects in real-time. Click through each stage to understand 
+the complete inspection pipeline.
+""")
+
+# Flowchart stages
+stages = [
+    {
+        'name': '1. Unit Arrival',
+        'description': 'Condenser unit arrives at inspection station via conveyor',
+        'time': '0.5 sec',
+        'output': 'Unit positioned and ready'
+    },
+    {
+        'name': '2. Sensor Activation',
+        'description': 'All 6 sensors simultaneously activate and begin data capture',
+        'time': '0.2 sec',
+        'output': 'Multi-modal data streams initiated'
+    },
+    {
+        'name': '3. Data Acquisition',
+        'description': 'Sensors capture images, thermal data, acoustic signals, and pressure readings',
+        'time': '1.0 sec',
+        'output': 'Raw sensor data collected'
+    },
+    {
+        'name': '4. Preprocessing',
+        'description': 'Data normalization, noise reduction, and format standardization',
+        'time': '0.3 sec',
+        'output': 'Preprocessed feature maps'
+    },
+    {
+        'name': '5. Feature Extraction',
+        'description': 'CNN-based feature extraction for each sensor modality',
+        'time': '0.8 sec',
+        'output': 'Extracted feature vectors'
+    },
+    {
+        'name': '6. Mesh Transformer Processing',
+        'description': 'Cross-modal attention and feature fusion through transformer blocks',
+        'time': '1.2 sec',
+        'output': 'Fused multimodal features'
+    },
+    {
+        'name': '7. Defect Classification',
+        'description': 'Specialized heads classify defects and generate confidence scores',
+        'time': '0.4 sec',
+        'output': 'Defect predictions with scores'
+    },
+    {
+        'name': '8. Decision Fusion',
+        'description': 'Final decision layer combines all predictions with confidence weighting',
+        'time': '0.1 sec',
+        'output': 'Final inspection result'
+    },
+    {
+        'name': '9. Result Output',
+        'description': 'Pass/Fail decision with detailed defect report',
+        'time': '0.5 sec',
+        'output': 'Inspection complete, unit proceeds'
+    }
+]
+
+# Interactive stage selection
+selected_stage_idx = st.selectbox(
+    "Select a stage to view details:",
+    options=range(len(stages)),
+    format_func=lambda x: stages[x]['name']
+)
+
+selected_stage = stages[selected_stage_idx]
+
+# Display selected stage details
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.subheader(selected_stage['name'])
+    st.write(f"**Description:** {selected_stage['description']}")
+    st.write(f"**Output:** {selected_stage['output']}")
+
+with col2:
+    st.metric("Processing Time", selected_stage['time'])
+    progress = (selected_stage_idx + 1) / len(stages)
+    st.progress(progress)
+    st.caption(f"Stage {selected_stage_idx + 1} of {len(stages)}")
+
+# Visual flowchart
+st.markdown("---")
+st.subheader("Process Flowchart")
+
+# Create a simple flowchart visualization
+flow_y_positions = np.linspace(0, len(stages) * 2, len(stages))
+
+fig = go.Figure()
+
+# Draw flow arrows
+for i in range(len(stages) - 1):
+    fig.add_annotation(
+        x=0, y=flow_y_positions[i],
+        ax=0, ay=flow_y_positions[i+1],
+        arrowhead=2,
+        arrowsize=1.5,
+        arrowwidth=3,
+        arrowcolor='#1f77b4'
+    )
+
+# Draw stage boxes
+for i, stage in enumerate(stages):
+    color = '#2ca02c' if i == selected_stage_idx else '#1f77b4'
+    fig.add_trace(go.Scatter(
+        x=[0], y=[flow_y_positions[i]],
+        mode='markers+text',
+        marker=dict(size=50, color=color, symbol='square'),
+        text=[f"{i+1}"],
+        textposition='middle center',
+        textfont=dict(size=14, color='white'),
+        name=stage['name'],
+        hovertemplate=f'<b>{stage["name"]}</b><br>{stage["description"]}<br>Time: {stage["time"]}<extra></extra>'
+    ))
+
+fig.update_layout(
+    title="Defect Detection Pipeline",
+    xaxis=dict(showgrid=False, showticklabels=False, range=[-0.5, 0.5]),
+    yaxis=dict(showgrid=False, showticklabels=False, range=[-1, len(stages) * 2 + 1]),
+    height=600,
+    showlegend=False
+)
+
+st.plotly_chart(fig, use_container_width=True)
+
+# Timing breakdown
+st.markdown("---")
+st.subheader("Timing Breakdown")
+
+timing_data = pd.DataFrame({
+    'Stage': [s['name'] for s in stages],
+    'Time (sec)': [float(s['time'].split()[0]) for s in stages]
+})
+
+fig_bar = px.bar(
+    timing_data,
+    x='Stage',
+    y='Time (sec)',
+    title="Processing Time per Stage",
+    color='Time (sec)',
+    color_continuous_scale='Blues'
+)
+fig_bar.update_xaxes(tickangle=-45)
+st.plotly_chart(fig_bar, use_container_width=True)
+
+total_time = sum([float(s['time'].split()[0]) for s in stages])
+st.metric("Total Processing Time", f"{total_time:.1f} seconds")
+
+# Line throughput simulation
+st.markdown("---")
+st.subheader("Line Throughput Simulation")
+
+st.write("""
+Discrete-event simulation of the pipeline above under a given conveyor arrival rate. Adjust the number of
+parallel stations per stage and the stage-time distribution to see where the line saturates.
+""")
+
+from line_simulator import DISTRIBUTIONS, simulate, stages_from_flow
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    arrival_rate = st.slider(
+        "Arrival Rate (units/hour)",
+        min_value=100,
+        max_value=5000,
+        value=1700,
+        step=50
+    )
+    arrival_process = st.selectbox("Arrival Process", options=['Poisson', 'Deterministic'])
+with col2:
+    stage_distribution = st.selectbox("Stage-Time Distribution", options=DISTRIBUTIONS, index=2)
+    stage_cv = st.slider("Coefficient of Variation", 0.0, 1.0, 0.2, 0.05)
+with col3:
+    shift_hours = st.slider("Shift Length (hours)", 1, 24, 24)
+    sim_seed = st.number_input("Random Seed", min_value=0, value=0, step=1)
+
+stations_df = st.data_editor(
+    pd.DataFrame({
+        'Stage': [s['name'] for s in stages],
+        'Stations': [1] * len(stages)
+    }),
+    use_container_width=True,
+    hide_index=True,
+    disabled=['Stage']
+)
+
+if st.button("▶️ Run Simulation", type="primary"):
+    # Cleared cells come back as NaN; simulate those stages with one station
+    station_counts = pd.to_numeric(stations_df['Stations'], errors='coerce')
+    blank = stations_df.loc[station_counts.isna(), 'Stage'].tolist()
+    if blank:
+        st.warning(f"No station count for {', '.join(blank)}; using 1.")
+    station_counts = station_counts.fillna(1).clip(lower=1).round().astype(int)
+    sim_stages = stages_from_flow(
+        stages,
+        stations=dict(zip(stations_df['Stage'], station_counts)),
+        distribution=stage_distribution,
+        cv=stage_cv
+    )
+    with st.spinner("Simulating shift..."):
+        result = simulate(
+            sim_stages,
+            arrival_rate,
+            horizon_hours=shift_hours,
+            arrival_process=arrival_process,
+            seed=int(sim_seed)
+        )
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Units Simulated", f"{result.units:,}")
+    with col2:
+        st.metric("Throughput", f"{result.throughput_per_hour:.0f} units/hr")
+    with col3:
+        st.metric("Latency P95", f"{result.latency_p95:.1f} sec")
+    with col4:
+        st.metric("Latency P99", f"{result.latency_p99:.1f} sec")
+
+    bottleneck = result.bottleneck
+    if bottleneck.offered_load >= 1:
+        st.error(f"🔴 Line saturated at **{bottleneck.name}**: {bottleneck.offered_load * 100:.0f}% offered load, "
+                 f"capacity {bottleneck.capacity_per_hour:.0f} units/hr")
+    else:
+        st.info(f"Bottleneck stage: **{bottleneck.name}** ({bottleneck.offered_load * 100:.1f}% offered load, "
+                f"capacity {bottleneck.capacity_per_hour:.0f} units/hr)")
+
+    sim_df = pd.DataFrame(result.to_records())
+
+    fig_util = px.bar(
+        sim_df,
+        x='Stage',
+        y='Utilization (%)',
+        title="Station Utilization per Stage",
+        color='Utilization (%)',
+        color_continuous_scale='Reds',
+        range_color=[0, 100]
+    )
+    fig_util.update_xaxes(tickangle=-45)
+    st.plotly_chart(fig_util, use_container_width=True)
+
+    st.dataframe(sim_df, use_container_width=True, hide_index=True)
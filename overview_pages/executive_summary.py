@@ -0,0 +1,101 @@
+import streamlit as st
+
+# ============================================================================
+# EXECUTIVE SUMMARY
+# ============================================================================
+st.markdown('<div class="main-header">AI Mesh Transformer for Condenser Firewall Inspection</div>', unsafe_allow_html=True)
+
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    st.subheader("Tata Motors - Harrier/Safari Line")
+    st.write("**Location:** Pimpri-Chinchwad Manufacturing Plant")
+    st.write("**Project Type:** Automated Multimodal Quality Inspection System")
+
+with col2:
+    st.image("https://via.placeholder.com/150x100/1f77b4/ffffff?text=Tata+Motors", caption="Tata Motors Logo")
+
+with col3:
+    st.image("https://via.placeholder.com/150x100/ff7f0e/ffffff?text=AI+Lab", caption="AI Research Lab")
+
+st.markdown("---")
+
+# Key Metrics
+st.subheader("📊 Key Performance Indicators")
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric(
+        label="Defect Detection Accuracy",
+        value="98.5%",
+        delta="+3.2% vs baseline",
+        delta_color="normal"
+    )
+
+with col2:
+    st.metric(
+        label="Cycle Time per Unit",
+        value="5.2 sec",
+        delta="-12 sec vs manual",
+        delta_color="inverse"
+    )
+
+with col3:
+    st.metric(
+        label="ROI Breakeven",
+        value="17 months",
+        delta="On track",
+        delta_color="normal"
+    )
+
+with col4:
+    st.metric(
+        label="False Positive Rate",
+        value="< 0.5%",
+        delta="-2.1% improvement",
+        delta_color="normal"
+    )
+
+st.markdown("---")
+
+# Executive Summary Content
+st.subheader("Executive Summary")
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.write("""
+    This project presents an **AI Mesh Transformer-based automated inspection system** for condenser firewall 
+    assemblies at Tata Motors' Harrier/Safari production line. The system integrates multiple sensor modalities 
+    (RGB, UV, Thermal IR, Structured Light, Acoustic, and Pressure/Temperature sensors) to detect critical 
+    defects including bent fins, blocked sections, leaks, and structural anomalies.
+    
+    **Key Innovations:**
+    - **Mesh Transformer Architecture**: Enables 10x parameter fusion compared to traditional CNNs
+    - **Multimodal Sensor Fusion**: 6 different sensor types working in harmony
+    - **Real-time Processing**: Sub-6 second inspection cycle time
+    - **High Accuracy**: 98.5% defect detection rate with <0.5% false positives
+    """)
+
+with col2:
+    st.markdown('<div class="info-box">', unsafe_allow_html=True)
+    st.write("**Did you know?**")
+    st.write("Mesh transformers enable 10x parameter fusion compared to traditional CNNs, allowing for more comprehensive defect analysis across multiple sensor modalities simultaneously.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Project Team
+st.markdown("---")
+st.subheader("👥 Project Team")
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.write("**Lead Researcher**")
+    st.write("Dr. Arvind Mathur")
+with col2:
+    st.write("**Technical Lead**")
+    st.write("AI Research Team")
+with col3:
+    st.write("**Industry Mentor**")
+    st.write("Tata Motors Engineering")
+with col4:
+    st.write("**Organization**")
+    st.write("Tata Motors Ltd.")
@@ -0,0 +1,94 @@
+import streamlit as st
+import plotly.graph_objects as go
+import pandas as pd
+
+# ============================================================================
+# CONTEXT & PROBLEM STATEMENT
+# ============================================================================
+st.title("Context & Problem Statement")
+
+st.subheader("Manufacturing Context")
+st.write("""
+The **Tata Motors Harrier Firewall Station** at Pimpri-Chinchwad is responsible for assembling and inspecting 
+condenser units that are critical components in vehicle HVAC systems. These condensers must meet stringent 
+quality standards to ensure vehicle performance and customer satisfaction.
+""")
+
+# Problem Statement
+st.markdown("---")
+st.subheader("🔴 Current Challenges")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("""
+    **1. Manual Inspection Limitations**
+    - Time-consuming: ~17 seconds per unit
+    - Human error: ~5% defect miss rate
+    - Inconsistent quality assessment
+    - High labor costs
+    
+    **2. Defect Complexity**
+    - Multiple defect types requiring different detection methods
+    - Some defects invisible to naked eye (UV leaks)
+    - Thermal anomalies require specialized sensors
+    """)
+
+with col2:
+    st.write("""
+    **3. Production Bottleneck**
+    - Inspection station limits production throughput
+    - Quality gates cause delays
+    - Rework costs impact profitability
+    
+    **4. Scalability Issues**
+    - Difficult to scale manual inspection
+    - Training new inspectors takes time
+    - Quality standards vary between shifts
+    """)
+
+# Solution Overview
+st.markdown("---")
+st.subheader("✅ Proposed Solution")
+
+st.write("""
+An **AI-powered multimodal inspection system** that:
+- Automates the entire inspection process
+- Integrates 6 different sensor types for comprehensive coverage
+- Uses advanced Mesh Transformer architecture for intelligent defect detection
+- Reduces cycle time from 17s to 5.2s (70% improvement)
+- Achieves 98.5% accuracy with minimal false positives
+- Provides real-time analytics and quality metrics
+""")
+
+# Impact Visualization
+st.markdown("---")
+st.subheader("Impact Comparison")
+
+comparison_data = pd.DataFrame({
+    'Metric': ['Cycle Time (sec)', 'Accuracy (%)', 'Cost per Unit (₹)', 'Throughput (units/hr)'],
+    'Manual': [17, 95, 150, 212],
+    'AI System': [5.2, 98.5, 45, 692]
+})
+
+fig = go.Figure()
+fig.add_trace(go.Bar(
+    name='Manual Inspection',
+    x=comparison_data['Metric'],
+    y=comparison_data['Manual'],
+    marker_color='#ff7f0e'
+))
+fig.add_trace(go.Bar(
+    name='AI System',
+    x=comparison_data['Metric'],
+    y=comparison_data['AI System'],
+    marker_color='#1f77b4'
+))
+fig.update_layout(
+    title="Manual vs AI System Performance",
+    xaxis_title="Metrics",
+    yaxis_title="Value",
+    barmode='group',
+    height=400
+)
+st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,91 @@
+import streamlit as st
+
+# ============================================================================
+# REFERENCES
+# ============================================================================
+st.title("References & Resources")
+
+st.subheader("Research Papers & Documentation")
+
+references = [
+    {
+        'Title': 'Mesh Transformer Architecture for Multimodal Sensor Fusion',
+        'Type': 'Research Paper',
+        'Link': 'https://example.com/mesh-transformer-paper',
+        'Description': 'Detailed technical paper on the Mesh Transformer architecture and its application to multimodal defect detection.'
+    },
+    {
+        'Title': 'AI Mesh Transformer - Full Presentation',
+        'Type': 'Presentation',
+        'Link': 'https://example.com/presentation',
+        'Description': 'Complete project presentation with all slides, diagrams, and technical details.'
+    },
+    {
+        'Title': 'Defect Detection Dataset',
+        'Type': 'Dataset',
+        'Link': 'https://example.com/dataset',
+        'Description': 'Labeled dataset of 50,000+ condenser images with defect annotations.'
+    },
+    {
+        'Title': 'System Architecture Documentation',
+        'Type': 'Technical Documentation',
+        'Link': 'https://example.com/architecture-docs',
+        'Description': 'Comprehensive documentation of system architecture, sensor specifications, and integration details.'
+    },
+    {
+        'Title': 'ROI Analysis Report',
+        'Type': 'Business Report',
+        'Link': 'https://example.com/roi-report',
+        'Description': 'Detailed financial analysis and ROI projections for the inspection system.'
+    }
+]
+
+for ref in references:
+    with st.expander(f"{ref['Type']}: {ref['Title']}"):
+        st.write(ref['Description'])
+        st.markdown(f"[📄 Download/View Resource]({ref['Link']})")
+
+st.markdown("---")
+st.subheader("Additional Resources")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("""
+    **Videos & Media:**
+    - [System Demonstration Video](https://example.com/demo-video)
+    - [Harrier Assembly Line Tour](https://example.com/assembly-tour)
+    - [Defect Detection in Action](https://example.com/detection-video)
+    """)
+
+with col2:
+    st.write("""
+    **Code & Repositories:**
+    - [GitHub Repository](https://github.com/example/mesh-transformer)
+    - [Model Weights](https://example.com/model-weights)
+    - [Inference Code](https://example.com/inference-code)
+    """)
+
+st.markdown("---")
+st.subheader("Contact Information")
+
+st.write("""
+**Project Lead:** Dr. Arvind Mathur  
+**Organization:** Tata Motors Ltd.  
+**Location:** Pimpri-Chinchwad Manufacturing Plant  
+**Email:** contact@example.com  
+**Project Website:** https://example.com/condenser-inspection
+""")
+
+st.markdown("---")
+st.subheader("Acknowledgments")
+
+st.write("""
+This project was developed in collaboration with:
+- Tata Motors Engineering Team
+- AI Research Laboratory
+- Manufacturing Quality Assurance Team
+- Production Line Operators
+
+Special thanks to all mentors, advisors, and team members who contributed to this project.
+""")
@@ -0,0 +1,207 @@
+import streamlit as st
+import plotly.graph_objects as go
+import pandas as pd
+
+# ============================================================================
+# ROI CALCULATOR
+# ============================================================================
+st.title("ROI Calculator")
+
+st.write("""
+Interactive calculator to estimate Return on Investment (ROI) for the AI Mesh Transformer inspection system.
+Adjust the parameters below to see how they impact the financial returns.
+""")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("Investment Parameters")
+    initial_investment = st.slider(
+        "Initial Investment (₹ Lakhs)",
+        min_value=10,
+        max_value=100,
+        value=25,
+        step=1
+    )
+    
+    monthly_savings = st.slider(
+        "Monthly Savings (₹ Lakhs)",
+        min_value=1,
+        max_value=10,
+        value=3,
+        step=0.5
+    )
+    
+    monthly_o_and_m = st.slider(
+        "Monthly O&M Cost (₹ Lakhs)",
+        min_value=0.5,
+        max_value=5,
+        value=1.5,
+        step=0.1
+    )
+
+with col2:
+    st.subheader("Operational Parameters")
+    units_per_month = st.slider(
+        "Units Inspected per Month",
+        min_value=1000,
+        max_value=50000,
+        value=15000,
+        step=500
+    )
+    
+    cost_per_unit_manual = st.slider(
+        "Manual Inspection Cost per Unit (₹)",
+        min_value=50,
+        max_value=500,
+        value=150,
+        step=10
+    )
+    
+    cost_per_unit_ai = st.slider(
+        "AI System Cost per Unit (₹)",
+        min_value=10,
+        max_value=100,
+        value=45,
+        step=5
+    )
+
+# Calculate ROI
+monthly_net_savings = monthly_savings - monthly_o_and_m
+monthly_cost_savings = (cost_per_unit_manual - cost_per_unit_ai) * units_per_month / 100000  # Convert to lakhs
+
+total_monthly_savings = monthly_net_savings + monthly_cost_savings
+
+# Calculate cumulative ROI over 36 months
+months = list(range(1, 37))
+cumulative_roi = []
+cumulative_savings = []
+breakeven_month = None
+
+for month in months:
+    cumulative_saving = total_monthly_savings * month - initial_investment
+    cumulative_savings.append(cumulative_saving)
+    roi_percent = (cumulative_saving / initial_investment) * 100 if initial_investment > 0 else 0
+    cumulative_roi.append(roi_percent)
+    
+    if breakeven_month is None and cumulative_saving >= 0:
+        breakeven_month = month
+
+# Display key metrics
+st.markdown("---")
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("Monthly Net Savings", f"₹ {total_monthly_savings:.2f} L")
+with col2:
+    st.metric("Breakeven Month", f"Month {breakeven_month}" if breakeven_month else ">36 months")
+with col3:
+    roi_36_month = cumulative_roi[-1]
+    st.metric("36-Month ROI", f"{roi_36_month:.1f}%")
+with col4:
+    total_36_savings = cumulative_savings[-1]
+    st.metric("36-Month Net Savings", f"₹ {total_36_savings:.2f} L")
+
+# ROI Chart
+st.markdown("---")
+st.subheader("ROI Over Time")
+
+roi_df = pd.DataFrame({
+    'Month': months,
+    'Cumulative Savings (₹ L)': cumulative_savings,
+    'ROI (%)': cumulative_roi
+})
+
+fig = go.Figure()
+
+# Add breakeven line
+fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Breakeven")
+
+# Add savings line
+fig.add_trace(go.Scatter(
+    x=roi_df['Month'],
+    y=roi_df['Cumulative Savings (₹ L)'],
+    mode='lines+markers',
+    name='Cumulative Savings',
+    line=dict(color='#2ca02c', width=3),
+    fill='tozeroy',
+    fillcolor='rgba(44, 160, 44, 0.2)'
+))
+
+if breakeven_month:
+    fig.add_vline(
+        x=breakeven_month,
+        line_dash="dot",
+        line_color="red",
+        annotation_text=f"Breakeven: Month {breakeven_month}",
+        annotation_position="top"
+    )
+
+fig.update_layout(
+    title="Cumulative ROI Over 36 Months",
+    xaxis_title="Month",
+    yaxis_title="Cumulative Savings (₹ Lakhs)",
+    height=500,
+    hovermode='x unified'
+)
+
+st.plotly_chart(fig, use_container_width=True)
+
+# ROI Percentage Chart
+st.subheader("ROI Percentage Over Time")
+
+fig2 = go.Figure()
+fig2.add_trace(go.Scatter(
+    x=roi_df['Month'],
+    y=roi_df['ROI (%)'],
+    mode='lines+markers',
+    name='ROI %',
+    line=dict(color='#1f77b4', width=3),
+    fill='tozeroy',
+    fillcolor='rgba(31, 119, 180, 0.2)'
+))
+
+fig2.add_hline(y=0, line_dash="dash", line_color="gray")
+
+if breakeven_month:
+    fig2.add_vline(
+        x=breakeven_month,
+        line_dash="dot",
+        line_color="red",
+        annotation_text=f"Breakeven: Month {breakeven_month}",
+        annotation_position="top"
+    )
+
+fig2.update_layout(
+    title="ROI Percentage Over 36 Months",
+    xaxis_title="Month",
+    yaxis_title="ROI (%)",
+    height=400
+)
+
+st.plotly_chart(fig2, use_container_width=True)
+
+# Cost breakdown
+st.markdown("---")
+st.subheader("Cost Breakdown Analysis")
+
+cost_breakdown = pd.DataFrame({
+    'Category': [
+        'Initial Investment',
+        'Monthly O&M',
+        'Cost per Unit (AI)',
+        'Cost per Unit (Manual)',
+        'Monthly Cost Savings',
+        'Net Monthly Benefit'
+    ],
+    'Amount (₹ L)': [
+        initial_investment,
+        monthly_o_and_m,
+        cost_per_unit_ai * units_per_month / 100000,
+        cost_per_unit_manual * units_per_month / 100000,
+        monthly_cost_savings,
+        total_monthly_savings
+    ]
+})
+
+st.dataframe(cost_breakdown, use_container_width=True)
@@ -0,0 +1,172 @@
+import streamlit as st
+import plotly.graph_objects as go
+import numpy as np
+
+# ============================================================================
+# SENSOR PLACEMENT (3D)
+# ============================================================================
+st.title("Sensor Placement - 3D Visualization")
+
+st.write("""
+Interactive 3D visualization of the condenser assembly with sensor positions and coverage areas.
+Click on sensor markers to view detailed information.
+""")
+
+# 3D Condenser Model with Sensors
+fig = go.Figure()
+
+# Create condenser base (rectangular box)
+condenser_length = 0.6
+condenser_width = 0.4
+condenser_height = 0.05
+
+# Condenser base
+x_base = [0, condenser_length, condenser_length, 0, 0]
+y_base = [0, 0, condenser_width, condenser_width, 0]
+z_base = [0, 0, 0, 0, 0]
+
+fig.add_trace(go.Scatter3d(
+    x=x_base, y=y_base, z=z_base,
+    mode='lines',
+    line=dict(color='gray', width=2),
+    name='Condenser Base',
+    showlegend=False
+))
+
+# Sensor positions (realistic placement on condenser)
+sensors_3d = {
+    'RGB Camera 1': {'pos': (0.1, 0.2, 0.3), 'color': 'blue', 'coverage': 0.15},
+    'RGB Camera 2': {'pos': (0.5, 0.2, 0.3), 'color': 'blue', 'coverage': 0.15},
+    'UV Camera': {'pos': (0.3, 0.1, 0.25), 'color': 'purple', 'coverage': 0.12},
+    'Thermal IR': {'pos': (0.2, 0.3, 0.28), 'color': 'red', 'coverage': 0.18},
+    'Structured Light': {'pos': (0.4, 0.3, 0.35), 'color': 'green', 'coverage': 0.20},
+    'Acoustic Sensor': {'pos': (0.5, 0.1, 0.2), 'color': 'orange', 'coverage': 0.10},
+    'Pressure/Temp': {'pos': (0.15, 0.15, 0.05), 'color': 'cyan', 'coverage': 0.08}
+}
+
+# Plot sensors
+sensor_names = []
+sensor_x = []
+sensor_y = []
+sensor_z = []
+sensor_colors = []
+
+for name, info in sensors_3d.items():
+    x, y, z = info['pos']
+    sensor_names.append(name)
+    sensor_x.append(x)
+    sensor_y.append(y)
+    sensor_z.append(z)
+    sensor_colors.append(info['color'])
+    
+    # Add coverage sphere (simplified as circle)
+    theta = np.linspace(0, 2*np.pi, 50)
+    phi = np.linspace(0, np.pi, 50)
+    coverage = info['coverage']
+    
+    # Draw coverage area (projection on condenser surface)
+    coverage_x = x + coverage * np.cos(theta)
+    coverage_y = y + coverage * np.sin(theta)
+    coverage_z = np.zeros_like(coverage_x)
+    
+    fig.add_trace(go.Scatter3d(
+        x=coverage_x, y=coverage_y, z=coverage_z,
+        mode='lines',
+        line=dict(color=info['color'], width=1, dash='dash'),
+        name=f'{name} Coverage',
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+# Add sensor markers
+fig.add_trace(go.Scatter3d(
+    x=sensor_x, y=sensor_y, z=sensor_z,
+    mode='markers+text',
+    marker=dict(
+        size=12,
+        color=sensor_colors,
+        symbol='circle',
+        line=dict(width=2, color='black')
+    ),
+    text=sensor_names,
+    textposition='top center',
+    name='Sensors',
+    hovertemplate='<b>%{text}</b><br>Position: (%{x:.2f}, %{y:.2f}, %{z:.2f})<extra></extra>'
+))
+
+# Add fins (simplified representation)
+for i in range(10):
+    fin_x = 0.05 + i * 0.055
+    fig.add_trace(go.Scatter3d(
+        x=[fin_x, fin_x], y=[0, condenser_width], z=[0.02, 0.02],
+        mode='lines',
+        line=dict(color='lightblue', width=1),
+        name='Fins' if i == 0 else '',
+        showlegend=(i == 0),
+        hoverinfo='skip'
+    ))
+
+fig.update_layout(
+    title="Condenser 3D Model with Sensor Array",
+    scene=dict(
+        xaxis_title='Length (m)',
+        yaxis_title='Width (m)',
+        zaxis_title='Height (m)',
+        aspectmode='manual',
+        aspectratio=dict(x=1, y=0.67, z=0.5),
+        camera=dict(
+            eye=dict(x=1.5, y=1.5, z=1.2)
+        )
+    ),
+    height=700
+)
+
+st.plotly_chart(fig, use_container_width=True)
+
+# Sensor selection for details
+st.markdown("---")
+st.subheader("Sensor Details")
+
+selected_sensor = st.selectbox(
+    "Select a sensor to view specifications:",
+    options=list(sensors_3d.keys())
+)
+
+if selected_sensor:
+    sensor_info = sensors_3d[selected_sensor]
+    x, y, z = sensor_info['pos']
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("X Position", f"{x:.2f} m")
+    with col2:
+        st.metric("Y Position", f"{y:.2f} m")
+    with col3:
+        st.metric("Z Position", f"{z:.2f} m")
+    
+    st.metric("Coverage Radius", f"{sensor_info['coverage']:.2f} m")
+    
+    # Sensor-specific information
+    sensor_details = {
+        'RGB Camera 1': 'Primary visual inspection, detects bent fins and surface defects. 4K resolution, 30 fps.',
+        'RGB Camera 2': 'Secondary visual inspection, complementary angle for full coverage. 4K resolution, 30 fps.',
+        'UV Camera': 'Detects UV-visible dye leaks. Specialized for refrigerant leak detection. 2K resolution, 15 fps.',
+        'Thermal IR': 'Monitors temperature distribution. Detects thermal anomalies and blocked sections. 640x480, 25 fps.',
+        'Structured Light': '3D geometry measurement. Detects structural deformities and mounting misalignment. 1920x1080, 60 fps.',
+        'Acoustic Sensor': 'Structural integrity via acoustic signature analysis. Detects internal defects. 44.1 kHz sampling.',
+        'Pressure/Temp': 'Flow dynamics monitoring. Detects pressure drops and temperature variations. 16-bit resolution, 100 Hz.'
+    }
+    
+    st.write(f"**Description:** {sensor_details.get(selected_sensor, 'Sensor information not available.')}")
+
+# Defect overlay toggle
+st.markdown("---")
+st.subheader("Defect Simulation")
+
+defect_type = st.selectbox(
+    "Simulate defect overlay:",
+    options=['None', 'Bent Fin', 'Blocked Section', 'UV Leak', 'Thermal Anomaly']
+)
+
+if defect_type != 'None':
+    st.info(f"💡 **{defect_type}** would be highlighted in the 3D model. In a full implementation, this would show the exact location and affected area on the condenser.")
@@ -0,0 +1,171 @@
+import streamlit as st
+import plotly.graph_objects as go
+import pandas as pd
+from datetime import datetime
+
+# ============================================================================
+# IMPLEMENTATION TIMELINE
+# ============================================================================
+st.title("Implementation Timeline & Milestones")
+
+st.write("""
+Project timeline showing key milestones, deliverables, and current status.
+""")
+
+# Timeline data
+timeline_data = [
+    {
+        'Phase': 'Phase 1: Planning & Design',
+        'Start': '2024-01-01',
+        'End': '2024-03-31',
+        'Status': 'Completed',
+        'Deliverables': ['System architecture design', 'Sensor selection', 'Requirements specification'],
+        'Progress': 100
+    },
+    {
+        'Phase': 'Phase 2: Hardware Setup',
+        'Start': '2024-02-15',
+        'End': '2024-05-15',
+        'Status': 'Completed',
+        'Deliverables': ['Sensor installation', 'Data acquisition system', 'Calibration'],
+        'Progress': 100
+    },
+    {
+        'Phase': 'Phase 3: Data Collection',
+        'Start': '2024-04-01',
+        'End': '2024-07-31',
+        'Status': 'Completed',
+        'Deliverables': ['50,000+ labeled samples', 'Defect database', 'Validation dataset'],
+        'Progress': 100
+    },
+    {
+        'Phase': 'Phase 4: Model Development',
+        'Start': '2024-06-01',
+        'End': '2024-09-30',
+        'Status': 'Completed',
+        'Deliverables': ['Mesh Transformer model', 'Training pipeline', 'Model optimization'],
+        'Progress': 100
+    },
+    {
+        'Phase': 'Phase 5: Integration & Testing',
+        'Start': '2024-08-15',
+        'End': '2024-11-30',
+        'Status': 'In Progress',
+        'Deliverables': ['System integration', 'End-to-end testing', 'Performance validation'],
+        'Progress': 75
+    },
+    {
+        'Phase': 'Phase 6: Deployment',
+        'Start': '2024-11-01',
+        'End': '2025-01-31',
+        'Status': 'Planned',
+        'Deliverables': ['Production deployment', 'Operator training', 'Documentation'],
+        'Progress': 0
+    },
+    {
+        'Phase': 'Phase 7: Monitoring & Optimization',
+        'Start': '2025-02-01',
+        'End': '2025-06-30',
+        'Status': 'Planned',
+        'Deliverables': ['Performance monitoring', 'Continuous improvement', 'ROI validation'],
+        'Progress': 0
+    }
+]
+
+# Display timeline
+for phase in timeline_data:
+    with st.expander(f"{phase['Phase']} - {phase['Status']}", expanded=(phase['Status'] == 'In Progress')):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.write(f"**Duration:** {phase['Start']} to {phase['End']}")
+            st.write(f"**Status:** {phase['Status']}")
+            st.progress(phase['Progress'] / 100)
+            
+            st.write("**Deliverables:**")
+            for deliverable in phase['Deliverables']:
+                st.write(f"- {deliverable}")
+        
+        with col2:
+            status_color = {
+                'Completed': '🟢',
+                'In Progress': '🟡',
+                'Planned': '⚪'
+            }
+            st.markdown(f"### {status_color.get(phase['Status'], '⚪')}")
+
+# Gantt-style visualization
+st.markdown("---")
+st.subheader("Timeline Visualization")
+
+# Create Gantt chart data
+gantt_data = []
+for phase in timeline_data:
+    start_date = datetime.strptime(phase['Start'], '%Y-%m-%d')
+    end_date = datetime.strptime(phase['End'], '%Y-%m-%d')
+    duration = (end_date - start_date).days
+    
+    gantt_data.append({
+        'Phase': phase['Phase'],
+        'Start': phase['Start'],
+        'End': phase['End'],
+        'Duration': duration,
+        'Status': phase['Status']
+    })
+
+gantt_df = pd.DataFrame(gantt_data)
+
+# Create Gantt chart using Plotly
+fig = go.Figure()
+
+colors = {'Completed': '#2ca02c', 'In Progress': '#ff7f0e', 'Planned': '#d3d3d3'}
+
+for i, phase in enumerate(timeline_data):
+    start_date = datetime.strptime(phase['Start'], '%Y-%m-%d')
+    end_date = datetime.strptime(phase['End'], '%Y-%m-%d')
+    
+    fig.add_trace(go.Scatter(
+        x=[start_date, end_date, end_date, start_date, start_date],
+        y=[i, i, i+0.8, i+0.8, i],
+        fill='toself',
+        fillcolor=colors.get(phase['Status'], 'gray'),
+        line=dict(color='black', width=1),
+        mode='lines',
+        name=phase['Phase'],
+        text=[phase['Phase']],
+        hovertemplate=f'<b>{phase["Phase"]}</b><br>Status: {phase["Status"]}<br>Duration: {phase["Start"]} to {phase["End"]}<extra></extra>'
+    ))
+
+fig.update_layout(
+    title="Project Timeline - Gantt Chart",
+    xaxis_title="Date",
+    yaxis=dict(
+        tickmode='array',
+        tickvals=list(range(len(timeline_data))),
+        ticktext=[p['Phase'] for p in timeline_data],
+        autorange='reversed'
+    ),
+    height=500,
+    showlegend=False
+)
+
+st.plotly_chart(fig, use_container_width=True)
+
+# Current status summary
+st.markdown("---")
+st.subheader("Current Project Status")
+
+completed = len([p for p in timeline_data if p['Status'] == 'Completed'])
+in_progress = len([p for p in timeline_data if p['Status'] == 'In Progress'])
+planned = len([p for p in timeline_data if p['Status'] == 'Planned'])
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Completed Phases", completed)
+with col2:
+    st.metric("In Progress", in_progress)
+with col3:
+    st.metric("Planned", planned)
+
+overall_progress = sum([p['Progress'] for p in timeline_data]) / len(timeline_data)
+st.metric("Overall Project Progress", f"{overall_progress:.1f}%")
@@ -0,0 +1,305 @@
+"""
+Parallel defect detection over tiles of a single large frame.
+
+The decoded frame is copied once into a ``multiprocessing.shared_memory``
+block. Worker processes attach to that block and reduce zero-copy views of
+overlapping tiles to per-cell statistics, so only tile coordinates and the
+small cell grids cross process boundaries. Tiles start on the detector's
+cell grid, so each cell is computed whole by one tile. The parent assembles
+the frame's grids and classifies every cell against the robust statistics of
+the whole frame, and caps the detections once
+(``detection.classify_cells``). The result is the single-process
+``detect_defects`` result, not a merge of per-tile verdicts.
+
+The contamination detector is split the same way. Each worker converts its
+tile to gray and builds the tile's summed-area tables, and returns the
+window grids the detector reads (``contamination.window_queries``). Tiles
+overlap by at least the largest window and start on the window grid, so
+every window is computed whole by some tile. The parent assembles the
+frame's grids (``window_stats.WindowGrids``) and scores them against the
+whole fin field, which takes a few tens of milliseconds on a 4K frame.
+
+``detect`` runs a session's detector backend this way:
+
+    classical   tiled cell and window statistics as above, scored in the
+                parent and combined as ``ClassicalCVBackend.detect`` does
+    numpy       the per-cell classifier on each tile in the workers (its
+                cells are independent); duplicates from the overlaps merged
+                (``boxes.merge_detections``)
+
+Other backends (``onnx`` classifies the whole frame at once) cannot be
+tiled; ``TILED_BACKENDS`` lists the ones that can.
+
+The worker pool and shared block are kept alive between frames; create one
+``ParallelTiler`` per process and reuse it. Calls from several threads
+(Streamlit sessions) take turns: the shared block is reused or replaced only
+once the previous frame's workers are done with it.
+
+Usage:
+    python parallel_tiling.py --workers 1 2 4 8
+"""
+
+import atexit
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from boxes import merge_detections
+from contamination import detect_contamination, window_queries
+from detection import CELL_SIZE, MAX_DEFECTS, Z_THRESHOLD, cell_stats, classify_cells, detect_defects, to_gray
+from detector_backends import get_backend
+from window_stats import WindowGrids, WindowStats
+
+TILED_BACKENDS = ('classical', 'numpy')
+
+DEFAULT_TILE = 1024
+DEFAULT_OVERLAP = 2 * CELL_SIZE
+
+# Shared blocks attached in this worker process, by name
+_attached = {}
+# Backends constructed in this worker process, by name
+_backends = {}
+
+
+def _attach(name):
+    shm = _attached.get(name)
+    if shm is None:
+        # Pool workers share the parent's resource tracker, which already
+        # tracks the block; the parent alone unlinks it.
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        for old in list(_attached):
+            _attached.pop(old).close()
+        _attached[name] = shm
+    return shm
+
+
+@contextmanager
+def _hidden_main():
+    # Spawned workers re-run the parent's __main__ module. Under Streamlit
+    # that is the page script being executed, which must not run in a worker.
+    main = sys.modules.get('__main__')
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+def _tile_stats(name, shape, dtype, bounds, cell, queries=()):
+    shm = _attach(name)
+    frame = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    y0, y1, x0, x1 = bounds
+    if not queries:
+        return cell_stats(to_gray(frame[y0:y1, x0:x1]), cell), {}
+    # One pixel past the tile where the frame goes on: texture energy is a
+    # forward difference
+    gray = to_gray(frame[y0:min(y1 + 1, shape[0]), x0:min(x1 + 1, shape[1])])
+    h, w = y1 - y0, x1 - x0
+    stats = WindowStats(gray, (h, w))
+    grids = {
+        (statistic, window, stride): getattr(stats, statistic)(window, stride)
+        for statistic, window, stride in queries
+        if window[0] <= h and window[1] <= w
+    }
+    # Only the tile's cell and window grids are pickled back to the parent
+    return cell_stats(gray[:h, :w], cell), grids
+
+
+def _detect_tile(name, shape, dtype, bounds, backend):
+    shm = _attach(name)
+    frame = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    y0, y1, x0, x1 = bounds
+    if backend not in _backends:
+        _backends[backend] = get_backend(backend)
+    # Only the compact structured array is pickled back to the parent
+    return _backends[backend].detect(frame[y0:y1, x0:x1]).shifted(x0, y0)
+
+
+def tile_grid(height, width, tile=DEFAULT_TILE, overlap=DEFAULT_OVERLAP, align=CELL_SIZE):
+    """
+    Overlapping ``(y0, y1, x0, x1)`` tiles covering the frame. Tile steps are
+    multiples of ``align`` so every tile shares the detector's cell grid; the
+    last tile of a row or column runs to the frame's edge.
+    """
+    step = max((tile - overlap) // align * align, align)
+
+    def spans(size):
+        if size <= tile:
+            return [(0, size)]
+        positions = list(range(0, size - tile, step))
+        last = (size - tile) // align * align
+        if positions[-1] != last:
+            positions.append(last)
+        return [(p, p + tile) for p in positions[:-1]] + [(last, size)]
+
+    return [(y0, y1, x0, x1) for y0, y1 in spans(height) for x0, x1 in spans(width)]
+
+
+class ParallelTiler:
+    """Detect defects in one frame using ``workers`` processes over shared memory."""
+
+    def __init__(self, workers=None, tile=DEFAULT_TILE, overlap=DEFAULT_OVERLAP):
+        self.workers = workers or os.cpu_count() or 1
+        self.tile = tile
+        self.overlap = overlap
+        # Spawned workers are safe to start from Streamlit's threaded server
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'))
+        with _hidden_main():
+            # Workers are spawned on demand; submitting one task per worker
+            # starts them all now, while __main__ is hidden
+            for future in [self._pool.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+        self._shm = None
+        self._classical = get_backend('classical')
+        # Held while the shared block is written and until its tiles are read
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _buffer(self, nbytes):
+        if self._shm is None or self._shm.size < nbytes:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return self._shm
+
+    def warm_up(self):
+        """Start every worker process ahead of the first frame."""
+        frame = np.zeros((self.tile, self.tile * self.workers), dtype=np.uint8)
+        self.detect(frame)
+
+    def _share(self, frame):
+        shm = self._buffer(frame.nbytes)
+        shared = np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)
+        shared[...] = frame
+        return shm
+
+    def _submit_stats(self, frame, cell, queries=()):
+        shm = self._share(frame)
+        # Whole cells and windows per tile, starting on both grids, and
+        # overlapping by the largest window so each window is in some tile
+        align = int(np.lcm.reduce([cell] + [stride for _, _, stride in queries]))
+        overlap = max([self.overlap] + [max(window) for _, window, _ in queries])
+        tile = max(self.tile // align, 1) * align
+        tiles = tile_grid(frame.shape[0], frame.shape[1], tile, overlap, align=align)
+        futures = [
+            self._pool.submit(_tile_stats, shm.name, frame.shape, frame.dtype.str, bounds, cell, queries)
+            for bounds in tiles
+        ]
+        return tiles, futures
+
+    def _collect_stats(self, frame, cell, tiles, futures, queries=()):
+        height, width = frame.shape[:2]
+        mean = np.empty((height // cell, width // cell), np.float32)
+        std = np.empty_like(mean)
+        grids = {
+            key: np.empty(((height - key[1][0]) // key[2] + 1, (width - key[1][1]) // key[2] + 1), np.float32)
+            for key in queries
+        }
+        for (y0, _, x0, _), future in zip(tiles, futures):
+            (tile_mean, tile_std), tile_grids = future.result()
+            rows, cols = tile_mean.shape
+            mean[y0 // cell:y0 // cell + rows, x0 // cell:x0 // cell + cols] = tile_mean
+            std[y0 // cell:y0 // cell + rows, x0 // cell:x0 // cell + cols] = tile_std
+            for key, grid in tile_grids.items():
+                r, c = y0 // key[2], x0 // key[2]
+                grids[key][r:r + grid.shape[0], c:c + grid.shape[1]] = grid
+        return mean, std, WindowGrids((height, width), grids)
+
+    def cell_stats(self, frame, cell=CELL_SIZE):
+        """``detection.cell_stats`` of the whole frame, computed tile by tile in the workers."""
+        frame = np.asarray(frame)
+        with self._lock:
+            mean, std, _ = self._collect_stats(frame, cell, *self._submit_stats(frame, cell))
+        return mean, std
+
+    def detect_cells(self, frame, cell=CELL_SIZE, z_threshold=Z_THRESHOLD, max_defects=MAX_DEFECTS):
+        """``detect_defects(frame)``, with the per-cell statistics computed in parallel."""
+        frame = np.asarray(frame)
+        if frame.shape[0] < cell or frame.shape[1] < cell:
+            return detect_defects(frame, cell, z_threshold, max_defects)
+        return classify_cells(*self.cell_stats(frame, cell), cell, z_threshold, max_defects)
+
+    def detect(self, frame, backend='classical'):
+        """What ``get_backend(backend).detect(frame)`` finds, computed over tiles in the workers."""
+        if backend not in TILED_BACKENDS:
+            raise ValueError(f"The {backend} backend cannot run on tiles (tiled: {', '.join(TILED_BACKENDS)})")
+        frame = np.asarray(frame)
+        if backend == 'classical':
+            classical = self._classical
+            if frame.shape[0] < CELL_SIZE or frame.shape[1] < CELL_SIZE:
+                return classical.detect(frame)
+            queries = window_queries(frame.shape[:2])
+            with self._lock:
+                tiles, futures = self._submit_stats(frame, CELL_SIZE, queries)
+                mean, std, windows = self._collect_stats(frame, CELL_SIZE, tiles, futures, queries)
+            regions = detect_contamination(None, stats=windows)
+            return classical.combine(classify_cells(mean, std), regions)
+
+        with self._lock:
+            shm = self._share(frame)
+            tiles = tile_grid(frame.shape[0], frame.shape[1], self.tile, self.overlap)
+            futures = [
+                self._pool.submit(_detect_tile, shm.name, frame.shape, frame.dtype.str, bounds, backend)
+                for bounds in tiles
+            ]
+            found = [f.result() for f in futures]
+        return merge_detections(found).sorted()
+
+    def close(self):
+        with self._lock:
+            self._pool.shutdown()
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark parallel tiled detection on a 4K frame')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(120, 140, (2160, 3840, 3), dtype=np.uint8)
+    frame[1000:1080, 2000:2080] = 20
+
+    backend = get_backend('classical')
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = backend.detect(frame)
+    serial = (time.perf_counter() - t0) / args.repeat
+    print(f"single process: {serial * 1000:7.1f} ms/frame")
+
+    # Workers resolve _detect_tile by module name, not from this __main__
+    import parallel_tiling
+
+    for workers in sorted(set(args.workers)):
+        with parallel_tiling.ParallelTiler(workers) as tiler:
+            tiler.warm_up()
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                found = tiler.detect(frame)
+            elapsed = (time.perf_counter() - t0) / args.repeat
+        print(f"{workers:2d} workers:     {elapsed * 1000:7.1f} ms/frame  "
+              f"speedup {serial / elapsed:4.1f}x  ({len(found)} detections, "
+              f"{'same as' if np.array_equal(found.array, expected.array) else 'DIFFERENT from'} serial)")
@@ -0,0 +1,237 @@
+"""
+Admin-only profiler for one script rerun of the current section.
+
+Both apps wrap ``page.run()`` in ``profile_section``. For an admin with the
+sidebar toggle on, the section's rerun runs under ``cProfile`` and
+``tracemalloc`` and a breakdown is shown below it:
+
+    by area       own time per area (DataFrames, Plotly figures, image
+                  encoding, NumPy, Streamlit, app code); time in C functions
+                  is charged to the area of the Python code that called them
+    functions     top functions by cumulative time
+    allocations   top source lines by memory still allocated at the end of
+                  the rerun, and the rerun's peak traced memory
+
+Admins are recognised by a token: set ``INSPECTION_ADMIN_TOKEN`` on the
+server and open the app once with ``?admin=<token>``; the session stays
+admin until it ends. Without the variable there is no toggle and
+``profile_section`` returns a null context, so normal reruns pay nothing;
+with the toggle off, an admin's rerun only renders the toggle.
+
+Only one session profiles at a time (tracemalloc is process-wide); its
+allocation figures include whatever other sessions allocate meanwhile.
+"""
+
+import cProfile
+import contextlib
+import hmac
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+import streamlit as st
+
+ADMIN_TOKEN = os.environ.get('INSPECTION_ADMIN_TOKEN', '')
+TOP = 20
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (area, path fragment) checked in order; the first match wins
+AREAS = [
+    ('DataFrames (pandas)', os.sep + 'pandas' + os.sep),
+    ('Plotly figures', os.sep + 'plotly' + os.sep),
+    ('Plotly figures', os.sep + '_plotly_utils' + os.sep),
+    ('Image encoding', os.sep + 'PIL' + os.sep),
+    ('Image encoding', os.path.join('streamlit', 'elements', 'lib', 'image_utils.py')),
+    ('Arrow serialization', os.sep + 'pyarrow' + os.sep),
+    ('Streamlit', os.sep + 'streamlit' + os.sep),
+    ('NumPy', os.sep + 'numpy' + os.sep),
+    ('Other libraries', os.sep + 'site-packages' + os.sep),
+    ('Python stdlib', os.sep + 'lib' + os.sep + 'python'),
+]
+
+_lock = threading.Lock()
+
+
+def is_admin():
+    """True for a session that has presented ``?admin=<INSPECTION_ADMIN_TOKEN>``."""
+    if not ADMIN_TOKEN:
+        return False
+    if st.session_state.get('profiler_admin'):
+        return True
+    token = st.query_params.get('admin', '')
+    if token and hmac.compare_digest(token, ADMIN_TOKEN):
+        st.session_state.profiler_admin = True
+        return True
+    return False
+
+
+def area(filename):
+    """Cost area of a source file."""
+    if filename.startswith(HERE) and os.sep + 'site-packages' + os.sep not in filename:
+        return 'App code'
+    if filename.startswith('<frozen importlib'):
+        return 'Imports'
+    for name, fragment in AREAS:
+        if fragment in filename:
+            return name
+    return 'Other'
+
+
+def _code_area(func):
+    filename = func[0]
+    return None if filename == '~' or filename.startswith('<built-in') else area(filename)
+
+
+def _short(filename):
+    """Path relative to the app or to ``site-packages``."""
+    if filename.startswith(HERE):
+        return os.path.relpath(filename, HERE)
+    return filename.rsplit(os.sep + 'site-packages' + os.sep, 1)[-1]
+
+
+def breakdown(stats):
+    """
+    ``({area: own seconds}, total seconds)`` from ``pstats.Stats``. A built-in
+    function's time goes to its callers' areas in proportion to the calls
+    each made, so ``PIL``'s C encoder counts as image encoding.
+    """
+    areas = {}
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        own = _code_area(func)
+        if own is None and callers:
+            calls = sum(c[1] if isinstance(c, tuple) else c for c in callers.values()) or 1
+            for caller, c in callers.items():
+                share = (c[1] if isinstance(c, tuple) else c) / calls
+                name = _code_area(caller) or 'Other'
+                areas[name] = areas.get(name, 0.0) + tt * share
+        else:
+            name = own or 'Other'
+            areas[name] = areas.get(name, 0.0) + tt
+    return areas, stats.total_tt
+
+
+def top_functions(stats, n=TOP):
+    """Rows for the ``n`` functions with the largest cumulative time."""
+    rows = []
+    for func, (cc, nc, tt, ct, callers) in sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:n]:
+        filename, line, name = func
+        where = name if filename == '~' else f"{_short(filename)}:{line}"
+        rows.append({
+            'function': name if filename == '~' else f"{name}()",
+            'location': where,
+            'area': _code_area(func) or 'Built-in',
+            'calls': nc,
+            'own ms': tt * 1000,
+            'cumulative ms': ct * 1000,
+        })
+    return rows
+
+
+def top_allocations(snapshot, n=TOP):
+    """Rows for the ``n`` source lines holding the most traced memory."""
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    rows = []
+    for stat in snapshot.statistics('lineno')[:n]:
+        frame = stat.traceback[0]
+        rows.append({
+            'location': f"{_short(frame.filename)}:{frame.lineno}",
+            'area': area(frame.filename),
+            'blocks': stat.count,
+            'KiB': stat.size / 1024,
+        })
+    return rows
+
+
+class RerunProfile:
+    """cProfile and tracemalloc results of one section rerun."""
+
+    def __init__(self, section):
+        self.section = section
+        self.profiler = cProfile.Profile()
+        self.stats = None
+        self.snapshot = None
+        self.peak = 0
+        self.wall = 0.0
+        self._started_tracing = False
+
+    def start(self):
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._t0 = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.wall = time.perf_counter() - self._t0
+        self.peak = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self.stats = pstats.Stats(self.profiler)
+
+    def render(self):
+        import pandas as pd
+
+        areas, total = breakdown(self.stats)
+        with st.expander(f"🧪 Rerun profile: {self.section}", expanded=True):
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Section Rerun", f"{self.wall * 1000:.0f} ms")
+            col2.metric("Profiled Time", f"{total * 1000:.0f} ms")
+            col3.metric("Peak Traced Memory", f"{self.peak / 2**20:.1f} MiB")
+
+            st.markdown("**Time by area**")
+            by_area = pd.DataFrame(
+                [{'area': name, 'ms': secs * 1000, 'share %': 100 * secs / total if total else 0.0}
+                 for name, secs in sorted(areas.items(), key=lambda kv: -kv[1])]
+            )
+            st.dataframe(by_area, hide_index=True, use_container_width=True,
+                         column_config={'ms': st.column_config.NumberColumn(format='%.1f'),
+                                        'share %': st.column_config.ProgressColumn(min_value=0, max_value=100, format='%.0f%%')})
+
+            st.markdown("**Top functions by cumulative time**")
+            st.dataframe(pd.DataFrame(top_functions(self.stats)), hide_index=True, use_container_width=True,
+                         column_config={'own ms': st.column_config.NumberColumn(format='%.1f'),
+                                        'cumulative ms': st.column_config.NumberColumn(format='%.1f')})
+
+            st.markdown("**Top allocations still held at the end of the rerun**")
+            st.dataframe(pd.DataFrame(top_allocations(self.snapshot)), hide_index=True, use_container_width=True,
+                         column_config={'KiB': st.column_config.NumberColumn(format='%.1f')})
+
+
+@contextlib.contextmanager
+def _profiled(section):
+    if not _lock.acquire(blocking=False):
+        st.sidebar.caption("Another session is profiling; this rerun is not profiled.")
+        yield None
+        return
+    profile = RerunProfile(section)
+    try:
+        profile.start()
+        try:
+            yield profile
+        finally:
+            profile.stop()
+    finally:
+        _lock.release()
+    # Not reached when the section stopped early (st.stop, st.rerun)
+    profile.render()
+
+
+def profile_section(section):
+    """
+    Context manager around a section's rerun: profiles it when an admin has
+    the sidebar toggle on, otherwise does nothing.
+    """
+    if not is_admin():
+        return contextlib.nullcontext()
+    if not st.sidebar.toggle("🧪 Profile this rerun", key='profile_rerun',
+                             help="Profile the current section with cProfile and tracemalloc"):
+        return contextlib.nullcontext()
+    return _profiled(section)
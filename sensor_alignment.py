@@ -0,0 +1,265 @@
+"""
+Time alignment of the six sensor streams around each unit.
+
+The sensors run at very different rates (RGB 30 fps, UV 15 fps, thermal
+25 fps, structured light 60 fps, pressure 100 Hz, audio 44.1 kHz). Each
+stream is written into its own preallocated ``StreamBuffer``: a ring of
+timestamps and items (frames, samples) that never allocates after start-up.
+
+Reading is zero-copy:
+
+- timestamps are written twice, ``capacity`` apart, so the live history is
+  always one contiguous, sorted view and a time range is two binary searches;
+- the first ``max_window`` item slots are also copied past the end of the
+  ring, so any window of up to ``max_window`` items is one contiguous slice
+  of the item array, even where the ring wraps.
+
+``SensorAligner.align_unit`` cuts every stream's window around a unit's
+arrival time and maps a common timeline onto it, either to the nearest
+item (an index into the window view, nothing copied) or by linear
+interpolation (weights between neighbouring items). All six streams align
+in well under a millisecond.
+
+A window view stays valid until the stream has advanced ``capacity -
+max_window`` items past it, so size ``seconds`` for the slowest reader.
+
+Buffers are sized from the item shapes the caller passes; there is no
+full-resolution default. ``SENSOR_STREAMS`` lists the native rates and
+shapes for reference: 10 s of 4K RGB alone is about 8.4 GiB. ``SensorAligner``
+refuses to preallocate more than ``max_bytes`` (``MAX_BUFFER_BYTES``) over
+all its streams.
+
+Usage:
+    python sensor_alignment.py    # per-unit alignment time for all six streams
+"""
+
+import threading
+
+import numpy as np
+
+MAX_BUFFER_BYTES = 2 * 2**30     # all of an aligner's stream buffers together
+
+# rate (Hz), item shape, dtype at full resolution (for reference: see the module docstring)
+SENSOR_STREAMS = {
+    'rgb': (30.0, (2160, 3840, 3), np.uint8),
+    'uv': (15.0, (1080, 1920), np.uint8),
+    'thermal': (25.0, (480, 640), np.uint16),
+    'structured_light': (60.0, (1080, 1920), np.float32),
+    'pressure_temp': (100.0, (2,), np.float32),
+    'acoustic': (44100.0, (), np.float32),
+}
+
+
+def _sizes(rate, seconds, max_window_seconds):
+    capacity = int(np.ceil(seconds * rate))
+    return capacity, min(int(np.ceil(max_window_seconds * rate)) + 1, capacity)
+
+
+def buffer_bytes(rate, item_shape=(), dtype=np.float32, seconds=10.0, max_window_seconds=2.0):
+    """Bytes a ``StreamBuffer`` with these settings preallocates."""
+    capacity, max_window = _sizes(rate, seconds, max_window_seconds)
+    item = int(np.prod(item_shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+    return 2 * capacity * 8 + (capacity + max_window) * item
+
+
+class StreamBuffer:
+    """Timestamped ring buffer of one sensor stream's items."""
+
+    def __init__(self, name, rate, item_shape=(), dtype=np.float32, seconds=10.0, max_window_seconds=2.0):
+        self.name = name
+        self.rate = rate
+        self.capacity, self.max_window = _sizes(rate, seconds, max_window_seconds)
+        self._ts = np.zeros(2 * self.capacity, np.float64)
+        self._items = np.zeros((self.capacity + self.max_window,) + tuple(item_shape), dtype)
+        self.total = 0              # items written since creation
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._ts.nbytes + self._items.nbytes
+
+    def write(self, items, timestamps=None, start=None):
+        """
+        Append items (first axis) with their timestamps, or with ``start``
+        for evenly spaced items at the stream's rate. Timestamps must not
+        go backwards.
+        """
+        items = np.asarray(items)
+        if timestamps is None:
+            timestamps = start + np.arange(len(items)) / self.rate
+        timestamps = np.asarray(timestamps, np.float64)
+        with self._lock:
+            # More than a ring's worth: only the newest items can be kept
+            skipped = max(len(items) - self.capacity, 0)
+            items, timestamps = items[skipped:], timestamps[skipped:]
+            self.total += skipped
+            pos = self.total % self.capacity
+            first = min(len(items), self.capacity - pos)
+            self._put(pos, items[:first], timestamps[:first])
+            if len(items) > first:
+                self._put(0, items[first:], timestamps[first:])
+            self.total += len(items)
+
+    def _put(self, slot, items, timestamps):
+        end = slot + len(items)
+        self._ts[slot:end] = timestamps
+        self._ts[self.capacity + slot:self.capacity + end] = timestamps
+        self._items[slot:end] = items
+        if slot < self.max_window:
+            n = min(end, self.max_window) - slot
+            self._items[self.capacity + slot:self.capacity + slot + n] = items[:n]
+
+    def timestamps(self):
+        """Sorted view of the timestamps of every item still held."""
+        held = min(self.total, self.capacity)
+        end = (self.total - 1) % self.capacity + 1 + self.capacity if self.total else self.capacity
+        return self._ts[end - held:end]
+
+    def window(self, t0, t1):
+        """
+        ``(timestamps, items)`` views of the items with ``t0 <= ts < t1``.
+        Raises ``ValueError`` if the range holds more than ``max_window``
+        items and ``LookupError`` if it has already left the ring.
+        """
+        with self._lock:
+            ts = self.timestamps()
+            lo, hi = np.searchsorted(ts, [t0, t1], side='left')
+            if hi - lo > self.max_window:
+                raise ValueError(f"{self.name}: {hi - lo} items in window, max_window is {self.max_window}")
+            if lo == 0 and len(ts) and ts[0] > t0 and self.total > self.capacity:
+                raise LookupError(f"{self.name}: window starts before the oldest item held")
+            first = self.total - len(ts) + lo          # absolute index
+            slot = first % self.capacity
+            return ts[lo:hi], self._items[slot:slot + hi - lo]
+
+
+class AlignedStream:
+    """
+    One stream mapped onto a common timeline. ``window`` is the zero-copy
+    view of the stream's items; ``nearest`` indexes it per timeline point;
+    for ``linear`` alignment each point lies ``weight`` of the way from item
+    ``lower`` to item ``lower + 1``.
+    """
+
+    __slots__ = ('name', 'timeline', 'timestamps', 'window', 'nearest', 'lower', 'weight')
+
+    def __init__(self, name, timeline, timestamps, window, nearest=None, lower=None, weight=None):
+        self.name = name
+        self.timeline = timeline
+        self.timestamps = timestamps
+        self.window = window
+        self.nearest = nearest
+        self.lower = lower
+        self.weight = weight
+
+    def values(self):
+        """Items at each timeline point (a new array)."""
+        if self.nearest is not None:
+            return self.window[self.nearest]
+        w = self.weight.reshape((-1,) + (1,) * (self.window.ndim - 1))
+        a = self.window[self.lower].astype(np.float32)
+        b = self.window[np.minimum(self.lower + 1, len(self.window) - 1)].astype(np.float32)
+        return a + (b - a) * w
+
+
+def align(name, timeline, timestamps, window, method='nearest'):
+    """Map ``timeline`` onto one stream's window by ``'nearest'`` item or ``'linear'`` interpolation."""
+    if len(timestamps) == 0:
+        raise LookupError(f"{name}: no items in the window")
+    right = np.searchsorted(timestamps, timeline, side='left')
+    if method == 'nearest':
+        right = np.minimum(right, len(timestamps) - 1)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(np.abs(timestamps[left] - timeline) <= np.abs(timestamps[right] - timeline), left, right)
+        return AlignedStream(name, timeline, timestamps, window, nearest=nearest)
+    if method == 'linear':
+        lower = np.clip(right - 1, 0, max(len(timestamps) - 2, 0))
+        upper = np.minimum(lower + 1, len(timestamps) - 1)
+        span = timestamps[upper] - timestamps[lower]
+        weight = np.clip((timeline - timestamps[lower]) / np.where(span > 0, span, 1.0), 0.0, 1.0)
+        return AlignedStream(name, timeline, timestamps, window, lower=lower, weight=weight.astype(np.float32))
+    raise ValueError(f"Unknown alignment method: {method}")
+
+
+class SensorAligner:
+    """
+    The sensor streams, aligned per unit on arrival time. ``streams`` maps
+    names to ``(rate, item shape, dtype)`` as stored (e.g. downscaled
+    frames); ``ValueError`` if their buffers would exceed ``max_bytes``.
+    """
+
+    def __init__(self, streams, seconds=10.0, max_window_seconds=2.0, max_bytes=MAX_BUFFER_BYTES):
+        sizes = {name: buffer_bytes(rate, shape, dtype, seconds, max_window_seconds)
+                 for name, (rate, shape, dtype) in streams.items()}
+        if sum(sizes.values()) > max_bytes:
+            detail = ', '.join(f"{name} {size / 2**20:.0f} MiB" for name, size in sizes.items())
+            raise ValueError(f"Stream buffers need {sum(sizes.values()) / 2**20:.0f} MiB ({detail}), "
+                             f"over max_bytes {max_bytes / 2**20:.0f} MiB: store smaller items or fewer seconds")
+        self.buffers = {
+            name: StreamBuffer(name, rate, shape, dtype, seconds, max_window_seconds)
+            for name, (rate, shape, dtype) in streams.items()
+        }
+
+    def __getitem__(self, name):
+        return self.buffers[name]
+
+    def write(self, name, items, timestamps=None, start=None):
+        self.buffers[name].write(items, timestamps, start)
+
+    def unit_windows(self, arrival, before=0.5, after=1.0):
+        """``{stream: (timestamps, items)}`` views around a unit's arrival time."""
+        return {name: buf.window(arrival - before, arrival + after) for name, buf in self.buffers.items()}
+
+    def align_unit(self, arrival, before=0.5, after=1.0, rate=100.0, methods=None):
+        """
+        ``{stream: AlignedStream}`` on a common timeline at ``rate`` Hz over
+        the unit's window. ``methods`` maps stream names to ``'linear'``;
+        the rest align to the nearest item.
+        """
+        methods = methods or {}
+        timeline = arrival - before + np.arange(int(round((before + after) * rate))) / rate
+        return {
+            name: align(name, timeline, ts, items, methods.get(name, 'nearest'))
+            for name, (ts, items) in self.unit_windows(arrival, before, after).items()
+        }
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Time per-unit alignment of the six sensor streams')
+    parser.add_argument('--scale', type=int, default=8, help='divide frame sizes by this for the demo buffers')
+    parser.add_argument('--units', type=int, default=200)
+    args = parser.parse_args()
+
+    streams = {
+        name: (rate, tuple(max(d // args.scale, 1) if len(shape) > 1 and i < 2 else d for i, d in enumerate(shape)), dtype)
+        for name, (rate, shape, dtype) in SENSOR_STREAMS.items()
+    }
+    aligner = SensorAligner(streams, seconds=6.0, max_window_seconds=2.0)
+    print("buffers:", ", ".join(f"{n} {b.capacity} x {b._items.shape[1:]} ({b.nbytes / 2**20:.0f} MiB)"
+                                 for n, b in aligner.buffers.items()))
+
+    # Feed 5 s of every stream with a little per-item jitter, in 50 ms chunks
+    rng = np.random.default_rng(0)
+    clock = 1000.0
+    written = dict.fromkeys(streams, 0)
+    for step in range(1, 101):
+        for name, (rate, shape, dtype) in streams.items():
+            index = np.arange(written[name], int(step * 0.05 * rate))
+            jitter = rng.uniform(0, 0.1 / rate, len(index))
+            aligner.write(name, np.zeros((len(index),) + shape, dtype), clock + index / rate + jitter)
+            written[name] += len(index)
+
+    arrival = clock + 3.0
+    aligned = aligner.align_unit(arrival, methods={'pressure_temp': 'linear'})
+    for name, a in aligned.items():
+        shares = np.shares_memory(a.window, aligner[name]._items)
+        print(f"  {name:<17} {len(a.window):>6} items in window, zero-copy={shares}")
+
+    t0 = time.perf_counter()
+    for i in range(args.units):
+        aligner.align_unit(arrival + (i % 10) * 0.1, methods={'pressure_temp': 'linear'})
+    per_unit = (time.perf_counter() - t0) / args.units
+    print(f"align one unit across {len(streams)} streams: {per_unit * 1e6:.0f} us")
@@ -0,0 +1,109 @@
+"""
+Cold-start and rerun benchmark for the Streamlit apps.
+
+Each sample runs in a fresh interpreter, as on a kiosk PC after a restart:
+
+    import      time to import streamlit itself (the same for every layout)
+    first paint time for the first complete script run of the default page
+    rerun       time for a second run of the same page (per-interaction cost)
+
+and lists which heavy modules were loaded by the first paint. Pass
+``--baseline REV`` to run the same measurement on another git revision
+(checked out into a temporary directory) for a before/after comparison.
+
+Usage:
+    python startup_benchmark.py --repeat 5 --baseline HEAD~1
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APPS = ['app.py', 'visual_inspection.py']
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly.express', 'PIL.Image', 'detection', 'frame_archive', 'sqlite3']
+
+_PROBE = """
+import json, logging, os, sys, time
+t0 = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter() - t0
+logging.disable(logging.CRITICAL)
+before = set(sys.modules)
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+first_paint = time.perf_counter() - t0
+t0 = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - t0
+print(json.dumps({
+    'import': imported, 'first_paint': first_paint, 'rerun': rerun,
+    'errors': [str(e.value) for e in at.exception],
+    'loaded': [m for m in json.loads(sys.argv[2]) if m in sys.modules and m not in before],
+}))
+"""
+
+
+def measure(app_path, repeat=3):
+    """Median import / first-paint / rerun seconds over ``repeat`` fresh interpreters."""
+    workdir = os.path.dirname(os.path.abspath(app_path))
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as scratch:
+        # Keep the apps' history database and frame archive out of the tree
+        env.setdefault('INSPECTION_DB', os.path.join(scratch, 'history.db'))
+        env.setdefault('INSPECTION_ARCHIVE_DIR', os.path.join(scratch, 'archive'))
+        samples = []
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, '-c', _PROBE, os.path.abspath(app_path), json.dumps(HEAVY_MODULES)],
+                cwd=workdir, env=env, capture_output=True, text=True, check=True,
+            )
+            samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    result = {
+        key: statistics.median(s[key] for s in samples)
+        for key in ('import', 'first_paint', 'rerun')
+    }
+    result['loaded'] = samples[-1]['loaded']
+    result['errors'] = samples[-1]['errors']
+    return result
+
+
+def checkout(rev, target):
+    """Export the files of git revision ``rev`` into ``target``."""
+    archive = subprocess.run(['git', 'archive', rev], capture_output=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    subprocess.run(['tar', '-x', '-C', target], input=archive, check=True)
+
+
+def report(label, root, repeat):
+    print(f"\n{label}")
+    print(f"{'app':<22}{'import':>10}{'first paint':>14}{'rerun':>10}  heavy modules loaded")
+    for app in APPS:
+        path = os.path.join(root, app)
+        if not os.path.exists(path):
+            continue
+        r = measure(path, repeat)
+        print(f"{app:<22}{r['import'] * 1000:>8.0f}ms{r['first_paint'] * 1000:>12.0f}ms"
+              f"{r['rerun'] * 1000:>8.0f}ms  {', '.join(r['loaded']) or '-'}")
+        if r['errors']:
+            print(f"{'':<22}errors: {r['errors'][0][:100]}")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure app cold start and rerun time')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreters per app')
+    parser.add_argument('--baseline', metavar='REV', help='also measure this git revision')
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkout(args.baseline, tmp)
+            report(f"baseline ({args.baseline})", tmp, args.repeat)
+    report("working tree", here, args.repeat)